@@ -0,0 +1,43 @@
+"""add_rating_summary_to_products
+
+Revision ID: 4b7e2d9c1a35
+Revises: 601d0af560f3
+Create Date: 2026-10-18 10:12:41.318207
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4b7e2d9c1a35"
+down_revision: str | None = "601d0af560f3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("products", sa.Column("rating_sum", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("products", sa.Column("rating_count", sa.Integer(), server_default="0", nullable=False))
+
+    # Заполняем сводку по уже существующим отзывам
+    op.execute(
+        """
+        UPDATE products AS p
+        SET rating_sum = r.rating_sum, rating_count = r.rating_count
+        FROM (
+            SELECT product_id, SUM(rating) AS rating_sum, COUNT(id) AS rating_count
+            FROM reviews
+            GROUP BY product_id
+        ) AS r
+        WHERE r.product_id = p.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("products", "rating_count")
+    op.drop_column("products", "rating_sum")
@@ -0,0 +1,52 @@
+"""add_price_columns_to_products
+
+Revision ID: 7c1f5a8e2b64
+Revises: 4b7e2d9c1a35
+Create Date: 2026-10-18 11:40:07.582913
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c1f5a8e2b64"
+down_revision: str | None = "4b7e2d9c1a35"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("products", sa.Column("min_price", sa.Numeric(12, 2), server_default="0", nullable=False))
+    op.add_column("products", sa.Column("max_price", sa.Numeric(12, 2), server_default="0", nullable=False))
+
+    # Заполняем цены из JSON price_range (camelCase или старый snake_case формат)
+    op.execute(
+        """
+        UPDATE products
+        SET min_price = COALESCE(
+                price_range -> 'minVariantPrice' ->> 'amount',
+                price_range -> 'min_variant_price' ->> 'amount',
+                '0'
+            )::numeric,
+            max_price = COALESCE(
+                price_range -> 'maxVariantPrice' ->> 'amount',
+                price_range -> 'max_variant_price' ->> 'amount',
+                '0'
+            )::numeric
+        WHERE price_range IS NOT NULL
+        """
+    )
+
+    op.create_index("ix_products_min_price_id", "products", ["min_price", "id"])
+    op.create_index(op.f("ix_products_max_price"), "products", ["max_price"])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_products_max_price"), table_name="products")
+    op.drop_index("ix_products_min_price_id", table_name="products")
+    op.drop_column("products", "max_price")
+    op.drop_column("products", "min_price")
@@ -0,0 +1,96 @@
+"""add_product_variants_table
+
+Revision ID: 9d3b6f1c4a27
+Revises: 7c1f5a8e2b64
+Create Date: 2026-10-18 19:05:41.218306
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9d3b6f1c4a27"
+down_revision: str | None = "7c1f5a8e2b64"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "product_variants",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("variant_id", sa.String(), nullable=False),
+        sa.Column("selected_options", sa.JSON(), nullable=True),
+        sa.Column("size", sa.String(), nullable=True),
+        sa.Column("color", sa.String(), nullable=True),
+        sa.Column("price", sa.Numeric(12, 2), server_default="0", nullable=False),
+        sa.Column("currency_code", sa.String(length=3), server_default="USD", nullable=False),
+        sa.Column("available_for_sale", sa.Boolean(), server_default="true", nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("product_id", "variant_id", name="uq_product_variants_product_id_variant_id"),
+    )
+    op.create_index(op.f("ix_product_variants_id"), "product_variants", ["id"], unique=False)
+    op.create_index("ix_product_variants_size_color", "product_variants", ["size", "color", "product_id"])
+    op.create_index("ix_product_variants_color", "product_variants", ["color", "product_id"])
+    op.create_index("ix_product_variants_price", "product_variants", ["price"])
+
+    # Переносим варианты из JSON products.variants; опции Size/Color раскладываем по колонкам
+    op.execute(
+        """
+        INSERT INTO product_variants (
+            product_id, variant_id, selected_options, size, color,
+            price, currency_code, available_for_sale, created_at, updated_at
+        )
+        SELECT
+            p.id,
+            v ->> 'id',
+            COALESCE(v -> 'selectedOptions', '[]'::json),
+            (
+                SELECT o ->> 'value'
+                FROM json_array_elements(COALESCE(v -> 'selectedOptions', '[]'::json)) AS o
+                WHERE lower(o ->> 'name') = 'size'
+                LIMIT 1
+            ),
+            (
+                SELECT o ->> 'value'
+                FROM json_array_elements(COALESCE(v -> 'selectedOptions', '[]'::json)) AS o
+                WHERE lower(o ->> 'name') = 'color'
+                LIMIT 1
+            ),
+            COALESCE(
+                NULLIF(
+                    CASE WHEN json_typeof(v -> 'price') = 'object' THEN v -> 'price' ->> 'amount' ELSE v ->> 'price' END,
+                    ''
+                ),
+                '0'
+            )::numeric,
+            COALESCE(
+                CASE WHEN json_typeof(v -> 'price') = 'object' THEN v -> 'price' ->> 'currencyCode' END, 'USD'
+            ),
+            COALESCE((v ->> 'availableForSale')::boolean, true),
+            now(),
+            now()
+        FROM products AS p
+        CROSS JOIN LATERAL json_array_elements(
+            CASE WHEN json_typeof(p.variants) = 'array' THEN p.variants ELSE '[]'::json END
+        ) AS v
+        WHERE v ->> 'id' IS NOT NULL
+        ON CONFLICT (product_id, variant_id) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_product_variants_price", table_name="product_variants")
+    op.drop_index("ix_product_variants_color", table_name="product_variants")
+    op.drop_index("ix_product_variants_size_color", table_name="product_variants")
+    op.drop_index(op.f("ix_product_variants_id"), table_name="product_variants")
+    op.drop_table("product_variants")
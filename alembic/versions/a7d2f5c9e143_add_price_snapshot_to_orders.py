@@ -0,0 +1,59 @@
+"""add_price_snapshot_to_orders
+
+Revision ID: a7d2f5c9e143
+Revises: f1a6d4c8b935
+Create Date: 2026-10-19 03:21:16.740385
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d2f5c9e143"
+down_revision: str | None = "f1a6d4c8b935"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("order_products", sa.Column("variant_id", sa.String(), nullable=True))
+    op.add_column("order_products", sa.Column("title", sa.String(), nullable=True))
+    op.add_column("order_products", sa.Column("unit_price", sa.Numeric(12, 2), server_default="0", nullable=False))
+    op.add_column("order_products", sa.Column("currency_code", sa.String(3), server_default="USD", nullable=False))
+    op.add_column("order_products", sa.Column("line_total", sa.Numeric(12, 2), server_default="0", nullable=False))
+    op.add_column("orders", sa.Column("total_amount", sa.Numeric(12, 2), server_default="0", nullable=False))
+    op.add_column("orders", sa.Column("currency_code", sa.String(3), server_default="USD", nullable=False))
+
+    # Существующие заказы: та же цена, что раньше вычислялась при чтении (минимальная цена продукта)
+    op.execute(
+        """
+        UPDATE order_products
+        SET title = products.title,
+            unit_price = products.min_price,
+            line_total = products.min_price * COALESCE(order_products.quantity, 1)
+        FROM products
+        WHERE products.id = order_products.product_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE orders
+        SET total_amount = COALESCE(
+            (SELECT SUM(line_total) FROM order_products WHERE order_products.order_id = orders.id), 0
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("orders", "currency_code")
+    op.drop_column("orders", "total_amount")
+    op.drop_column("order_products", "line_total")
+    op.drop_column("order_products", "currency_code")
+    op.drop_column("order_products", "unit_price")
+    op.drop_column("order_products", "title")
+    op.drop_column("order_products", "variant_id")
@@ -0,0 +1,27 @@
+"""add_order_history_indexes
+
+Revision ID: b3e9c6a1f258
+Revises: a7d2f5c9e143
+Create Date: 2026-10-19 04:02:37.915620
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3e9c6a1f258"
+down_revision: str | None = "a7d2f5c9e143"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_orders_user_id_id", "orders", ["user_id", "id"])
+    op.create_index(op.f("ix_order_products_order_id"), "order_products", ["order_id"])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_order_products_order_id"), table_name="order_products")
+    op.drop_index("ix_orders_user_id_id", table_name="orders")
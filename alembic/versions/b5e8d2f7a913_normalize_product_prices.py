@@ -0,0 +1,91 @@
+"""normalize_product_prices
+
+Revision ID: b5e8d2f7a913
+Revises: 9d3b6f1c4a27
+Create Date: 2026-10-18 22:14:03.517240
+
+"""
+
+from collections.abc import Sequence
+from decimal import Decimal
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b5e8d2f7a913"
+down_revision: str | None = "9d3b6f1c4a27"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BATCH_SIZE = 1000
+
+products = sa.table(
+    "products",
+    sa.column("id", sa.Integer),
+    sa.column("price_range", sa.JSON),
+    sa.column("variants", sa.JSON),
+)
+
+
+# Копия нормализации на момент миграции (src.models.product меняется, миграция — нет)
+def _money(price) -> dict:
+    if isinstance(price, dict):
+        if "amount" not in price:
+            return {"amount": "0.00", "currencyCode": "USD"}
+        currency_code = price.get("currencyCode", price.get("currency_code")) or "USD"
+        return {"amount": str(price["amount"]), "currencyCode": currency_code}
+    if isinstance(price, (int, float, str, Decimal)):
+        return {"amount": str(price), "currencyCode": "USD"}
+    return {"amount": "0.00", "currencyCode": "USD"}
+
+
+def _price_range(price_range: dict | None) -> dict:
+    price_range = price_range or {}
+    return {
+        key: _money(price_range.get(key) or price_range.get(snake_key) or "0.00")
+        for key, snake_key in (("minVariantPrice", "min_variant_price"), ("maxVariantPrice", "max_variant_price"))
+    }
+
+
+def _variant(variant: dict, position: int) -> dict:
+    # Остальные ключи варианта сохраняются: downgrade не восстанавливает данные
+    return {
+        **variant,
+        "id": variant.get("id", f"variant-{position}"),
+        "availableForSale": variant.get("availableForSale", True),
+        "selectedOptions": variant.get("selectedOptions", []),
+        "price": _money(variant.get("price", "0.00")),
+    }
+
+
+def upgrade() -> None:
+    # Приводим цены, сохраненные до нормализации при записи, к формату MoneySchema:
+    # ProductAdapter теперь отдает price_range и variants без преобразований. Продукты читаются пачками по id
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(products.c.id, products.c.price_range, products.c.variants)
+            .where(products.c.id > last_id)
+            .order_by(products.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for product_id, price_range, variants in rows:
+            normalized_price_range = _price_range(price_range)
+            normalized_variants = [_variant(variant, i) for i, variant in enumerate(variants or [])]
+            if normalized_price_range != price_range or normalized_variants != variants:
+                connection.execute(
+                    products.update()
+                    .where(products.c.id == product_id)
+                    .values(price_range=normalized_price_range, variants=normalized_variants)
+                )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    # Прежнее представление цен (snake_case, числа) после нормализации не восстановить
+    raise NotImplementedError("Миграция b5e8d2f7a913 (нормализация цен продуктов) необратима")
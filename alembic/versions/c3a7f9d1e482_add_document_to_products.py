@@ -0,0 +1,31 @@
+"""add_document_to_products
+
+Revision ID: c3a7f9d1e482
+Revises: b5e8d2f7a913
+Create Date: 2026-10-18 23:02:47.130915
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3a7f9d1e482"
+down_revision: str | None = "b5e8d2f7a913"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Документы заполняются командой python -m src.commands.rebuild_product_documents;
+    # до этого карточки продуктов без документа отрисовываются при чтении
+    op.add_column("products", sa.Column("document", sa.JSON(), nullable=True))
+    op.add_column("products", sa.Column("document_version", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("products", "document_version")
+    op.drop_column("products", "document")
@@ -0,0 +1,53 @@
+"""add_cart_line_unique_index
+
+Revision ID: c5f8a2d7e314
+Revises: b3e9c6a1f258
+Create Date: 2026-10-20 10:14:52.307481
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5f8a2d7e314"
+down_revision: str | None = "b3e9c6a1f258"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Дубли позиций (результат гонок при добавлении) сливаем в первую позицию, суммируя количество
+    op.execute(
+        """
+        UPDATE carts_products AS cp
+        SET quantity = d.quantity
+        FROM (
+            SELECT min(id) AS id, sum(quantity) AS quantity
+            FROM carts_products
+            GROUP BY cart_id, product_id, COALESCE(variant_id, '')
+            HAVING count(*) > 1
+        ) AS d
+        WHERE cp.id = d.id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM carts_products AS cp
+        USING carts_products AS first
+        WHERE first.cart_id = cp.cart_id
+          AND first.product_id = cp.product_id
+          AND COALESCE(first.variant_id, '') = COALESCE(cp.variant_id, '')
+          AND first.id < cp.id
+        """
+    )
+    # PostgreSQL 13 не поддерживает NULLS NOT DISTINCT, поэтому индекс по выражению
+    op.execute(
+        "CREATE UNIQUE INDEX uq_carts_products_cart_id_product_id_variant_id "
+        "ON carts_products (cart_id, product_id, COALESCE(variant_id, ''))"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_carts_products_cart_id_product_id_variant_id", table_name="carts_products")
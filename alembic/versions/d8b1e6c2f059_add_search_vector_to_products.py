@@ -0,0 +1,39 @@
+"""add_search_vector_to_products
+
+Revision ID: d8b1e6c2f059
+Revises: c3a7f9d1e482
+Create Date: 2026-10-19 00:21:36.904178
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d8b1e6c2f059"
+down_revision: str | None = "c3a7f9d1e482"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Колонка и индекс объявлены и в ProductModel (create_all на новой базе), поэтому IF NOT EXISTS.
+    # Конфигурация совпадает с SEARCH_CONFIG.
+    op.execute(
+        """
+        ALTER TABLE products ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+            || setweight(json_to_tsvector('simple', coalesce(tags, '[]'::json), '["string"]'), 'C')
+        ) STORED
+        """
+    )
+    op.create_index(
+        "ix_products_search_vector", "products", ["search_vector"], postgresql_using="gin", if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_products_search_vector", table_name="products")
+    op.drop_column("products", "search_vector")
@@ -0,0 +1,27 @@
+"""add_tags_gin_index_to_products
+
+Revision ID: e4c9a3b7d216
+Revises: d8b1e6c2f059
+Create Date: 2026-10-19 01:12:58.402117
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4c9a3b7d216"
+down_revision: str | None = "d8b1e6c2f059"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Фильтр по тегам (JsonContainsAll) сравнивает CAST(tags AS JSONB) @> ...: индекс по тому же выражению.
+    # Опции вариантов фильтруются по индексам таблицы product_variants
+    op.execute("CREATE INDEX IF NOT EXISTS ix_products_tags ON products USING gin ((CAST(tags AS JSONB)) jsonb_path_ops)")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_products_tags", table_name="products")
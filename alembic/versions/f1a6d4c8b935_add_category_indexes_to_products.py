@@ -0,0 +1,27 @@
+"""add_category_indexes_to_products
+
+Revision ID: f1a6d4c8b935
+Revises: e4c9a3b7d216
+Create Date: 2026-10-19 02:05:41.218694
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f1a6d4c8b935"
+down_revision: str | None = "e4c9a3b7d216"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_products_category_id_id", "products", ["category_id", "id"])
+    op.create_index("ix_products_category_id_min_price_id", "products", ["category_id", "min_price", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_products_category_id_min_price_id", table_name="products")
+    op.drop_index("ix_products_category_id_id", table_name="products")
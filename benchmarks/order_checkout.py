@@ -0,0 +1,114 @@
+"""Оформление заказа: прежний путь (commit на заказ и на каждую позицию) и одна транзакция с пакетной вставкой.
+
+Запуск: python -m benchmarks.order_checkout --lines 1 10 30 100
+По умолчанию используется временная база SQLite в файле; для PostgreSQL передать --url
+(таблицы создаются через Base.metadata.create_all, базу лучше взять пустую тестовую).
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.models import CategoryModel, OrderModel, OrderProductModel, ProductModel, UserModel
+from src.models.base import Base
+from src.repositories.order import OrderLine, OrderRepository
+from src.repositories.order_product import OrderProductRepository
+
+
+def seed(session, products: int) -> tuple[int, list[int]]:
+    category = CategoryModel(name="Benchmark")
+    user = UserModel(name="benchmark", email="benchmark@example.com", password="-")
+    session.add_all([category, user])
+    session.flush()
+    rows = [ProductModel(title=f"Product {i}", description="", category_id=category.id) for i in range(products)]
+    session.add_all(rows)
+    session.commit()
+    return user.id, [product.id for product in rows]
+
+
+def legacy_checkout(session, user_id: int, lines: list[OrderLine]) -> None:
+    """Прежний OrderService.create: create_order и add_product_to_order с commit и refresh на каждую позицию"""
+    order = OrderRepository(OrderModel, session).create_order(user_id=user_id)
+    order_products = OrderProductRepository(OrderProductModel, session)
+    for line in lines:
+        order_products.add_product_to_order(order_id=order.id, product_id=line.product_id, quantity=line.quantity)
+
+
+def batched_checkout(session, user_id: int, lines: list[OrderLine]) -> None:
+    OrderRepository(OrderModel, session).create_order_with_products(user_id=user_id, lines=lines)
+
+
+def measure(checkout, session_factory, user_id: int, lines: list[OrderLine], repeat: int) -> float:
+    """Медиана времени оформления заказа в мс"""
+    timings = []
+    for _ in range(repeat):
+        with session_factory() as session:
+            started = time.perf_counter()
+            checkout(session, user_id, lines)
+            timings.append(time.perf_counter() - started)
+    return sorted(timings)[len(timings) // 2] * 1000
+
+
+def count_statements(checkout, engine, session_factory, user_id: int, lines: list[OrderLine]) -> tuple[int, int]:
+    """Число SQL-запросов и транзакций за одно оформление"""
+    counts = {"statements": 0, "commits": 0}
+
+    def on_execute(*args) -> None:
+        counts["statements"] += 1
+
+    def on_commit(*args) -> None:
+        counts["commits"] += 1
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    event.listen(engine, "commit", on_commit)
+    try:
+        with session_factory() as session:
+            checkout(session, user_id, lines)
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+        event.remove(engine, "commit", on_commit)
+    return counts["statements"], counts["commits"]
+
+
+def run(url: str, sizes: list[int], repeat: int) -> None:
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    with session_factory() as session:
+        user_id, product_ids = seed(session, max(sizes))
+
+    for size in sizes:
+        lines = [OrderLine(product_id, 1 + i % 3) for i, product_id in enumerate(product_ids[:size])]
+        legacy_ms = measure(legacy_checkout, session_factory, user_id, lines, repeat)
+        batched_ms = measure(batched_checkout, session_factory, user_id, lines, repeat)
+        legacy_statements, legacy_commits = count_statements(legacy_checkout, engine, session_factory, user_id, lines)
+        batched_statements, batched_commits = count_statements(
+            batched_checkout, engine, session_factory, user_id, lines
+        )
+        print(
+            f"{size:>4} lines | legacy {legacy_ms:8.2f} ms, {legacy_statements:>3} queries, {legacy_commits:>3} commits | "
+            f"batched {batched_ms:7.2f} ms, {batched_statements:>3} queries, {batched_commits} commits | "
+            f"x{legacy_ms / batched_ms:.1f}"
+        )
+    engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", help="URL базы данных (по умолчанию временный файл SQLite)")
+    parser.add_argument("--lines", type=int, nargs="+", default=[1, 10, 30, 100])
+    parser.add_argument("--repeat", type=int, default=21)
+    args = parser.parse_args()
+    if args.url:
+        run(args.url, args.lines, args.repeat)
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        run(f"sqlite:///{Path(directory) / 'checkout.db'}", args.lines, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Сериализация карточек продуктов: прежний путь и текущий.
+
+Прежний: преобразование цен при чтении, валидация response_model и json.dumps.
+Текущий: цены нормализованы при записи, orjson без повторной валидации.
+
+Запуск: python -m benchmarks.product_serialization --products 1000 --variants 5 4
+Продукты создаются в памяти, база данных не нужна.
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime
+
+import orjson
+from pydantic import TypeAdapter
+
+from src.application.sсhemas import ProductResponseSchema
+from src.models import ProductModel
+from src.repositories.product import ProductAdapter
+
+SIZES = ["XS", "S", "M", "L", "XL", "XXL", "3XL", "4XL"]
+COLORS = ["Black", "White", "Red", "Blue", "Green", "Grey", "Navy", "Beige"]
+
+
+def generate_products(count: int, sizes: int, colors: int) -> list[ProductModel]:
+    adapter = ProductAdapter(None, None)
+    products = []
+    for product_id in range(1, count + 1):
+        price = {"amount": f"{10 + product_id % 90}.00", "currencyCode": "USD"}
+        title = f"Product {product_id}"
+        product = ProductModel(
+            title=title,
+            description=f"Description of product {product_id}",
+            handle=f"product-{product_id}",
+            price_range={"minVariantPrice": price, "maxVariantPrice": price},
+            variants=adapter.build_variants({"Size": SIZES[:sizes], "Color": COLORS[:colors]}, 10 + product_id % 90),
+            featured_image={"url": f"/images/{product_id}.jpg", "altText": title, "width": 800, "height": 800},
+            images=[{"url": f"/images/{product_id}-{i}.jpg", "altText": title} for i in range(3)],
+            seo={"title": title, "description": title},
+            tags=["cotton", "summer"],
+            available_for_sale=True,
+            category_id=1,
+        )
+        product.id = product_id
+        product.updated_at = datetime(2026, 1, 1)
+        products.append(product)
+    return products
+
+
+def legacy_money(price) -> dict:
+    """Прежний ProductAdapter._convert_price_to_money_schema"""
+    if isinstance(price, dict):
+        if "amount" in price and "currencyCode" in price:
+            return price
+        if "amount" in price and "currency_code" in price:
+            return {"amount": str(price["amount"]), "currencyCode": price["currency_code"]}
+        return {"amount": "0.00", "currencyCode": "USD"}
+    if isinstance(price, (int, float, str)):
+        return {"amount": str(price), "currencyCode": "USD"}
+    return {"amount": "0.00", "currencyCode": "USD"}
+
+
+def legacy_price_range(price_range) -> dict:
+    """Прежний ProductAdapter._convert_price_range"""
+    if not price_range:
+        return {
+            "maxVariantPrice": {"amount": "0.00", "currencyCode": "USD"},
+            "minVariantPrice": {"amount": "0.00", "currencyCode": "USD"},
+        }
+    converted = {}
+    if "min_variant_price" in price_range:
+        converted["minVariantPrice"] = legacy_money(price_range["min_variant_price"])
+    if "max_variant_price" in price_range:
+        converted["maxVariantPrice"] = legacy_money(price_range["max_variant_price"])
+    if "minVariantPrice" in price_range:
+        converted["minVariantPrice"] = legacy_money(price_range["minVariantPrice"])
+    if "maxVariantPrice" in price_range:
+        converted["maxVariantPrice"] = legacy_money(price_range["maxVariantPrice"])
+    converted.setdefault("minVariantPrice", {"amount": "0.00", "currencyCode": "USD"})
+    converted.setdefault("maxVariantPrice", {"amount": "0.00", "currencyCode": "USD"})
+    return converted
+
+
+def legacy_options(variants: list[dict]) -> dict[str, list[str]]:
+    """Прежний ProductAdapter._extract_options_from_variants (проверка вхождения по списку)"""
+    options = {}
+    for variant in variants or []:
+        for option in variant.get("selectedOptions", []):
+            options.setdefault(option["name"], [])
+            if option["value"] not in options[option["name"]]:
+                options[option["name"]].append(option["value"])
+    return options
+
+
+def legacy_format(product: ProductModel, rating: float = 0.0) -> dict:
+    """Прежний ProductAdapter._to_graphql_format"""
+    options = legacy_options(product.variants)
+    featured_image = product.featured_image
+    return {
+        "id": f"product-{product.id}",
+        "handle": product.handle,
+        "availableForSale": product.available_for_sale,
+        "title": product.title,
+        "description": product.description,
+        "descriptionHtml": product.description_html or f"<p>{product.description}</p>",
+        "options": [
+            {"id": f"option-{i + 1}", "name": name, "values": values} for i, (name, values) in enumerate(options.items())
+        ],
+        "priceRange": legacy_price_range(product.price_range),
+        "variants": {
+            "edges": [
+                {
+                    "node": {
+                        "id": variant.get("id", f"variant-{i}"),
+                        "availableForSale": variant.get("availableForSale", True),
+                        "selectedOptions": variant.get("selectedOptions", []),
+                        "price": legacy_money(variant.get("price", "0.00")),
+                    }
+                }
+                for i, variant in enumerate(product.variants or [])
+            ]
+        },
+        "featuredImage": {
+            "url": featured_image.get("url") if featured_image else "",
+            "altText": featured_image.get("altText", product.title) if featured_image else product.title,
+            "width": featured_image.get("width", 800) if featured_image else 800,
+            "height": featured_image.get("height", 800) if featured_image else 800,
+        },
+        "images": {
+            "edges": [
+                {
+                    "node": {
+                        "url": img.get("url", ""),
+                        "altText": img.get("altText", product.title),
+                        "width": img.get("width", 800),
+                        "height": img.get("height", 800),
+                    }
+                }
+                for img in product.images or []
+            ]
+        },
+        "seo": product.seo or {"title": product.title, "description": product.description},
+        "tags": product.tags or [],
+        "updatedAt": product.updated_at.isoformat(),
+        "rating": rating,
+    }
+
+
+def measure(serialize, products: list[ProductModel], repeat: int) -> tuple[float, int]:
+    """Лучшее из repeat время сериализации в мкс на продукт и размер ответа"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = serialize(products)
+        best = min(best, time.perf_counter() - started)
+    return best / len(products) * 1_000_000, len(body)
+
+
+def run(count: int, sizes: int, colors: int, repeat: int) -> None:
+    products = generate_products(count, sizes, colors)
+    adapter = ProductAdapter(None, None)
+    schema = TypeAdapter(list[ProductResponseSchema])
+
+    def legacy(items: list[ProductModel]) -> bytes:
+        # Как FastAPI с response_model: валидация, сериализация модели и json.dumps
+        payload = schema.dump_python(schema.validate_python([legacy_format(item) for item in items]), mode="json")
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def fast(items: list[ProductModel]) -> bytes:
+        return orjson.dumps(adapter.to_graphql_list(items))
+
+    assert orjson.loads(fast(products[:10])) == json.loads(legacy(products[:10])), "ответы различаются"
+    legacy_us, size = measure(legacy, products, repeat)
+    fast_us, _ = measure(fast, products, repeat)
+    print(
+        f"{count:>6} products x {sizes * colors:>2} variants | legacy {legacy_us:7.1f} us/product | "
+        f"fast {fast_us:6.1f} us/product | x{legacy_us / fast_us:.1f} | {size / 1024:.0f} KB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--variants", type=int, nargs=2, default=[5, 4], metavar=("SIZES", "COLORS"))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.products, *args.variants, args.repeat)
+    run(args.products, 8, 8, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Сравнение рекомендаций: старый цикл по описаниям на каждый запрос и заранее посчитанная матрица.
+
+Запуск: python -m benchmarks.recommendations --sizes 10000 100000
+Продукты генерируются синтетически, база данных не нужна.
+"""
+
+import argparse
+import random
+import time
+
+from src.services.recommendation_matrix import RelatedProducts
+
+VOCABULARY = [f"word{i}" for i in range(5000)]
+
+
+def generate_documents(size: int, words_per_document: int = 30) -> list[tuple[int, str]]:
+    rng = random.Random(size)
+    return [(product_id, " ".join(rng.choices(VOCABULARY, k=words_per_document))) for product_id in range(1, size + 1)]
+
+
+def legacy_recommendation(documents: list[tuple[int, str]], product_id: int, limit: int = 5) -> list[int]:
+    """Прежний алгоритм ProductService.get_products_recommendation, но по всему каталогу"""
+    current_words = set(documents[product_id - 1][1].lower().split())
+    scored = []
+    for other_id, text in documents:
+        if other_id == product_id:
+            continue
+        score = len(current_words & set(text.lower().split()))
+        if score > 0:
+            scored.append((other_id, score))
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return [other_id for other_id, _ in scored[:limit]]
+
+
+def run(size: int, requests: int) -> None:
+    documents = generate_documents(size)
+    rng = random.Random(0)
+    sample = [rng.randint(1, size) for _ in range(requests)]
+
+    started = time.perf_counter()
+    for product_id in sample:
+        legacy_recommendation(documents, product_id)
+    legacy_ms = (time.perf_counter() - started) / requests * 1000
+
+    started = time.perf_counter()
+    related = RelatedProducts.build(documents, top_n=10)
+    build_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for product_id in sample:
+        related.get(product_id)
+    lookup_ms = (time.perf_counter() - started) / requests * 1000
+
+    size_mb = (related.product_ids.nbytes + related.neighbours.nbytes + related.scores.nbytes) / 1024 / 1024
+    print(
+        f"{size:>7} products | legacy loop {legacy_ms:9.2f} ms/request | matrix build {build_s:7.1f} s, "
+        f"lookup {lookup_ms:.4f} ms/request, {size_mb:.1f} MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size, args.requests)
+
+
+if __name__ == "__main__":
+    main()
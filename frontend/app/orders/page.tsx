@@ -4,12 +4,12 @@ import { useOrders } from 'components/orders/order-context';
 import Link from 'next/link';
 import Price from 'components/price';
 import LoadingDots from 'components/loading-dots';
-import { OrderResponse } from 'lib/api/orders';
+import { OrderSummary } from 'lib/api/orders';
 
 export default function OrdersPage() {
-  const { orders, isLoading, error, refreshOrders } = useOrders();
+  const { orders, isLoading, error, hasMore, refreshOrders, loadMoreOrders } = useOrders();
 
-  if (isLoading) {
+  if (isLoading && orders.length === 0) {
     return (
       <div className="mx-auto max-w-4xl px-4 py-16 sm:px-6 lg:px-8">
         <div className="text-center">
@@ -67,6 +67,17 @@ export default function OrdersPage() {
           {orders.map((order) => (
             <OrderCard key={order.id} order={order} />
           ))}
+          {hasMore && (
+            <div className="text-center">
+              <button
+                onClick={loadMoreOrders}
+                disabled={isLoading}
+                className="inline-flex items-center rounded-md bg-gray-100 dark:bg-gray-700 px-4 py-2 text-sm font-medium text-gray-700 dark:text-gray-300 hover:bg-gray-200 dark:hover:bg-gray-600 focus:outline-none focus:ring-2 focus:ring-blue-500 focus:ring-offset-2 disabled:opacity-50"
+              >
+                {isLoading ? 'Loading...' : 'Load more orders'}
+              </button>
+            </div>
+          )}
         </div>
       )}
     </div>
@@ -75,7 +86,7 @@ export default function OrdersPage() {
 
 // Remove duplicate import
 
-function OrderCard({ order }: { order: OrderResponse }) {
+function OrderCard({ order }: { order: OrderSummary }) {
   const getStatusColor = (status: string) => {
     switch (status.toLowerCase()) {
       case 'pending':
@@ -131,67 +142,9 @@ function OrderCard({ order }: { order: OrderResponse }) {
       </div>
 
       <div className="border-t border-gray-200 dark:border-gray-600 pt-4">
-        <div className="grid grid-cols-1 md:grid-cols-2 gap-4">
-          <div>
-            <h4 className="text-sm font-medium text-gray-900 dark:text-white mb-2">
-              Shipping Address
-            </h4>
-            {order.shipping_address ? (
-              <p className="text-sm text-gray-600 dark:text-gray-400">
-                {(() => {
-                  const address = order.shipping_address as any;
-                  return (
-                    <>
-                      <span>{address.first_name} {address.last_name}</span><br />
-                      <span>{address.address}</span><br />
-                      <span>{address.city}, {address.state} {address.zip_code}</span><br />
-                      <span>{address.country}</span>
-                    </>
-                  );
-                })()}
-              </p>
-            ) : (
-              <p className="text-sm text-gray-500 dark:text-gray-400 italic">
-                No shipping address provided
-              </p>
-            )}
-          </div>
-          <div>
-            <h4 className="text-sm font-medium text-gray-900 dark:text-white mb-2">
-              Payment Method
-            </h4>
-            <p className="text-sm text-gray-600 dark:text-gray-400 capitalize">
-              {order.payment_method || 'Not specified'}
-            </p>
-          </div>
-        </div>
-
-        {order.items && order.items.length > 0 && (
-          <div className="mt-4">
-            <h4 className="text-sm font-medium text-gray-900 dark:text-white mb-2">
-              Items ({order.items.length})
-            </h4>
-            <div className="space-y-2">
-              {order.items.slice(0, 3).map((item: any) => (
-                <div key={`${order.id}-${item.id || item.product_id || item.merchandise?.id}`} className="flex items-center justify-between text-sm">
-                  <span className="text-gray-600 dark:text-gray-400">
-                    {item.quantity || 1}x {item.name || item.title || 'Unknown Item'}
-                  </span>
-                  <Price
-                    amount={((item.price || 0) * (item.quantity || 1)).toString()}
-                    currencyCode={order.currency_code || 'USD'}
-                    className="text-gray-900 dark:text-white"
-                  />
-                </div>
-              ))}
-              {order.items.length > 3 && (
-                <p className="text-sm text-gray-500 dark:text-gray-400">
-                  +{order.items.length - 3} more items
-                </p>
-              )}
-            </div>
-          </div>
-        )}
+        <p className="text-sm text-gray-600 dark:text-gray-400">
+          {order.item_count} {order.item_count === 1 ? 'item' : 'items'}
+        </p>
 
         <div className="flex justify-end mt-4 pt-4 border-t border-gray-200 dark:border-gray-600">
           <Link
@@ -1,29 +1,35 @@
 'use client';
 
 import { createContext, useContext, useState, useEffect, useCallback, ReactNode } from 'react';
-import { OrderResponse, getUserOrders } from 'lib/api/orders';
+import { OrderResponse, OrderSummary, getUserOrders, toOrderSummary } from 'lib/api/orders';
 
 interface OrderContextType {
-  orders: OrderResponse[];
+  orders: OrderSummary[];
   isLoading: boolean;
   error: string | null;
+  hasMore: boolean;
   refreshOrders: () => Promise<void>;
+  loadMoreOrders: () => Promise<void>;
   addOrder: (order: OrderResponse) => void;
 }
 
 const OrderContext = createContext<OrderContextType | undefined>(undefined);
 
 export function OrderProvider({ children }: { children: ReactNode }) {
-  const [orders, setOrders] = useState<OrderResponse[]>([]);
+  const [orders, setOrders] = useState<OrderSummary[]>([]);
+  const [endCursor, setEndCursor] = useState<string | null>(null);
+  const [hasMore, setHasMore] = useState(false);
   const [isLoading, setIsLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
-  const refreshOrders = useCallback(async () => {
+  const loadPage = useCallback(async (after: string | null) => {
     try {
       setIsLoading(true);
       setError(null);
-      const fetchedOrders = await getUserOrders();
-      setOrders(fetchedOrders);
+      const page = await getUserOrders(after);
+      setOrders(prevOrders => (after ? [...prevOrders, ...page.orders] : page.orders));
+      setEndCursor(page.pageInfo.endCursor || null);
+      setHasMore(page.pageInfo.hasNextPage);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to load orders');
     } finally {
@@ -31,8 +37,14 @@ export function OrderProvider({ children }: { children: ReactNode }) {
     }
   }, []);
 
+  const refreshOrders = useCallback(() => loadPage(null), [loadPage]);
+
+  const loadMoreOrders = useCallback(async () => {
+    if (hasMore && endCursor) await loadPage(endCursor);
+  }, [hasMore, endCursor, loadPage]);
+
   const addOrder = useCallback((order: OrderResponse) => {
-    setOrders(prevOrders => [order, ...prevOrders]);
+    setOrders(prevOrders => [toOrderSummary(order), ...prevOrders.filter(o => o.id !== order.id)]);
   }, []);
 
   useEffect(() => {
@@ -45,7 +57,9 @@ export function OrderProvider({ children }: { children: ReactNode }) {
       orders,
       isLoading,
       error,
+      hasMore,
       refreshOrders,
+      loadMoreOrders,
       addOrder
     }}>
       {children}
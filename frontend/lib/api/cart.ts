@@ -118,3 +118,32 @@ export async function removeCartItem(
     throw error;
   }
 }
+
+export type CartOperation = {
+  action: 'add' | 'update' | 'remove';
+  product_id: number;
+  variant_id?: string | null;
+  quantity?: number;
+};
+
+// Несколько изменений корзины одним запросом (восстановление сохраненной или перенос гостевой корзины).
+// Не через makeRequest: он объединяет запросы по методу и URL, а у пакетов разные тела
+export async function applyCartOperations(
+  token: string,
+  operations: CartOperation[]
+): Promise<components['schemas']['CartResponseSchema']> {
+  const res = await fetch(`${API_BASE_URL}/api/users/carts/items/batch/`, {
+    method: 'POST',
+    headers: {
+      Authorization: `Bearer ${token}`,
+      'Content-Type': 'application/json',
+      'Cache-Control': 'no-cache',
+    },
+    body: JSON.stringify({ operations }),
+  });
+  if (!res.ok) {
+    const errorData = await res.json().catch(() => null);
+    throw new Error(`Request failed: ${res.status}${errorData ? ` - ${JSON.stringify(errorData)}` : ''}`);
+  }
+  return res.json();
+}
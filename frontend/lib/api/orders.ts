@@ -28,6 +28,34 @@ export interface OrderRequest {
 // Use the generated OrderSchema from the API types instead of custom OrderResponse
 export type OrderResponse = components['schemas']['OrderSchema'];
 
+// Order history entry: order fields and line count, without the lines themselves
+export interface OrderSummary {
+  id: number;
+  order_id: string;
+  created_at?: string | null;
+  status: string;
+  total_amount: number;
+  currency_code: string;
+  item_count: number;
+}
+
+export interface OrderHistoryPage {
+  orders: OrderSummary[];
+  pageInfo: { hasNextPage: boolean; endCursor?: string | null };
+}
+
+export function toOrderSummary(order: OrderResponse): OrderSummary {
+  return {
+    id: order.id,
+    order_id: order.order_id || String(order.id),
+    created_at: order.created_at,
+    status: order.status,
+    total_amount: order.total_amount,
+    currency_code: order.currency_code,
+    item_count: order.items?.length || 0
+  };
+}
+
 export interface ApiError {
   detail?: string;
   message?: string;
@@ -113,16 +141,19 @@ export async function getOrder(orderId: string): Promise<components['schemas']['
 }
 
 /**
- * Get user's order history
+ * Get a page of user's order history, newest first (line items are loaded by getOrder)
  */
-export async function getUserOrders(): Promise<components['schemas']['OrderSchema'][]> {
+export async function getUserOrders(after?: string | null, count = 20): Promise<OrderHistoryPage> {
   const authToken = getAuthToken();
 
   if (!authToken) {
     throw new Error('Authentication required');
   }
 
-  const response = await fetch(`${API_BASE_URL}/api/users/orders/`, {
+  const params = new URLSearchParams({ count: String(count) });
+  if (after) params.append('after', after);
+
+  const response = await fetch(`${API_BASE_URL}/api/users/orders/?${params}`, {
     method: 'GET',
     headers: {
       'Authorization': `Bearer ${authToken}`,
@@ -3,7 +3,11 @@
  */
 import { getClientApiUrl } from 'lib/config';
 import { Product } from 'lib/shopify/types';
-import { mapSimpleBackendProductsToFrontend, mapBackendProductToFrontend } from 'lib/mappers/product';
+import {
+  mapSimpleBackendProductsToFrontend,
+  mapBackendProductToFrontend,
+  mapBackendProductsToFrontend
+} from 'lib/mappers/product';
 
 // Simple backend product type that matches actual API response
 interface SimpleBackendProduct {
@@ -32,6 +36,9 @@ export interface GetCollectionProductsParams {
 export async function fetchProducts(params: GetProductsParams = {}): Promise<Product[]> {
   const { query, reverse, sortKey } = params;
 
+  // Search is ranked by relevance on the server, so sort options do not apply
+  if (query) return searchProducts(query);
+
   const baseUrl = getClientApiUrl();
   const urlString = baseUrl ? `${baseUrl}/api/products` : '/api/products';
   const url = new URL(urlString, baseUrl || window.location.origin);
@@ -52,6 +59,26 @@ export async function fetchProducts(params: GetProductsParams = {}): Promise<Pro
   return mapSimpleBackendProductsToFrontend(products);
 }
 
+/**
+ * Full-text product search, ranked by relevance (client-side only)
+ */
+export async function searchProducts(query: string, count = 100): Promise<Product[]> {
+  const baseUrl = getClientApiUrl();
+  const urlString = baseUrl ? `${baseUrl}/api/products/search` : '/api/products/search';
+  const url = new URL(urlString, baseUrl || window.location.origin);
+  url.searchParams.append('q', query);
+  url.searchParams.append('count', String(count));
+
+  const response = await fetch(url.toString());
+
+  if (!response.ok) {
+    throw new Error(`Failed to search products: ${response.statusText}`);
+  }
+
+  const data: { edges?: { node: Parameters<typeof mapBackendProductToFrontend>[0] }[] } = await response.json();
+  return mapBackendProductsToFrontend((data.edges || []).map((edge) => edge.node));
+}
+
 /**
  * Fetch collection products from the API (client-side only)
  */
@@ -90,8 +117,8 @@ export async function fetchCollectionProducts(params: GetCollectionProductsParam
     const baseUrl = getClientApiUrl();
     const urlString = baseUrl ? `${baseUrl}/api/category/${categoryId}` : `/api/category/${categoryId}`;
     const url = new URL(urlString, baseUrl || window.location.origin);
-    if (sortKey) url.searchParams.append('sortKey', sortKey);
-    if (reverse !== undefined) url.searchParams.append('reverse', String(reverse));
+    // Category pages sort by id (default) or by price
+    if (sortKey === 'PRICE') url.searchParams.append('sort', reverse ? 'price_desc' : 'price_asc');
 
     const response = await fetch(url.toString());
 
@@ -102,11 +129,9 @@ export async function fetchCollectionProducts(params: GetCollectionProductsParam
       return allProducts.slice(0, 12);
     }
 
-    const data = await response.json();
-    const products: SimpleBackendProduct[] = data.products || [];
-
-    // Convert backend response to frontend format using simple mapper
-    return mapSimpleBackendProductsToFrontend(products);
+    // Category pages are returned as a connection: { edges: [{ node }], pageInfo }
+    const data: { edges?: { node: Parameters<typeof mapBackendProductToFrontend>[0] }[] } = await response.json();
+    return mapBackendProductsToFrontend((data.edges || []).map((edge) => edge.node));
   } catch (error) {
     console.error('Error fetching collection products:', error);
     // Fallback to all products
@@ -2,6 +2,11 @@ from .product import router as product_router
 from .user import router as user_router
 from .cart import router as cart_router
 from .order import router as order_router
+from .metrics import router as metrics_router
+from .async_product import router as async_product_router
+from .async_cart import router as async_cart_router
+from .async_order import router as async_order_router
 
 
-__all__ = ['product_router', 'user_router', 'cart_router', 'order_router']
+__all__ = ['product_router', 'user_router', 'cart_router', 'order_router', 'metrics_router',
+'async_product_router', 'async_cart_router', 'async_order_router']
@@ -0,0 +1,157 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from src.application.logger import logger
+from src.application.sсhemas import (
+    CartBatchRequestSchema,
+    CartLineResponseSchema,
+    CartProductRequestSchema,
+    CartResponseSchema,
+    CartUpdateResponseSchema,
+)
+from src.application.utils.token_services import TokenService
+from src.repositories.aio import AsyncCartProductRepository, AsyncCartRepository
+from src.services.cart_product import CartLineSummary, CartProductService, CartSummary
+
+from .cart import (
+    RESPONSE_MODE_QUERY,
+    ResponseMode,
+    build_cart_response,
+    build_line_response,
+    to_cart_operations,
+)
+from .depends import get_async_cart_product_repository, get_async_cart_repository, get_token_service, oauth2_scheme
+
+# Асинхронные версии эндпоинтов корзины; подключаются вместо синхронных при SETTINGS.db_async
+router = APIRouter(tags=["Корзина"], include_in_schema=False)
+
+# Сериализация и подсчет цены не обращаются к БД, поэтому репозитории сервису не нужны
+cart_serializer = CartProductService(cart_repository=None, cart_product_repository=None)
+
+
+async def load_cart_summary(cart_id: int, cart_repo: AsyncCartRepository) -> CartSummary:
+    cart = await cart_repo.get_cart_with_products(cart_id)
+    return cart_serializer.summarize(cart.cart_product_rel)
+
+
+async def load_line_summary(
+    cart_id: int, line_id: int, cart_product_repo: AsyncCartProductRepository
+) -> CartLineSummary:
+    line = await cart_product_repo.get_line(line_id)
+    return cart_serializer.line_summary(line_id, line, await cart_product_repo.get_totals(cart_id))
+
+
+@router.post(
+    "/users/carts/items/",
+    response_model=CartResponseSchema | CartLineResponseSchema,
+    status_code=status.HTTP_201_CREATED,
+)
+async def add_to_cart(
+    item: CartProductRequestSchema,
+    response_mode: ResponseMode = RESPONSE_MODE_QUERY,
+    token: str = Depends(oauth2_scheme),
+    token_service: TokenService = Depends(get_token_service),
+    cart_repo: AsyncCartRepository = Depends(get_async_cart_repository),
+    cart_product_repo: AsyncCartProductRepository = Depends(get_async_cart_product_repository),
+):
+    user_id = token_service.get_user(token)
+    cart = await cart_repo.get_by_user_id(user_id)
+
+    try:
+        line_id = await cart_product_repo.add_product(
+            cart_id=cart.id, product_id=item.product_id, variant_id=item.variant_id, quantity=item.quantity
+        )
+        logger.info(f"Added product {item.product_id} to cart")
+        if response_mode == "line":
+            return build_line_response(user_id, await load_line_summary(cart.id, line_id, cart_product_repo))
+        return build_cart_response(user_id, await load_cart_summary(cart.id, cart_repo))
+    except Exception as e:
+        logger.error(f"Failed to add product to cart: {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.put("/users/carts/items/{product_id}/", response_model=CartResponseSchema | CartLineResponseSchema)
+async def update_cart_item(
+    product_id: int,
+    quantity: int,
+    variant_id: str | None = None,
+    response_mode: ResponseMode = RESPONSE_MODE_QUERY,
+    token: str = Depends(oauth2_scheme),
+    token_service: TokenService = Depends(get_token_service),
+    cart_repo: AsyncCartRepository = Depends(get_async_cart_repository),
+    cart_product_repo: AsyncCartProductRepository = Depends(get_async_cart_product_repository),
+):
+    if quantity <= 0 or quantity > 100:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Quantity must be between 1 and 100"
+        )
+
+    user_id = token_service.get_user(token)
+    cart = await cart_repo.get_by_user_id(user_id)
+
+    try:
+        line_id = await cart_product_repo.change_quantity(
+            cart_id=cart.id, product_id=product_id, variant_id=variant_id, quantity=quantity
+        )
+        logger.info(f"Updated quantity for product {product_id}")
+        if response_mode == "line":
+            return build_line_response(user_id, await load_line_summary(cart.id, line_id, cart_product_repo))
+        return build_cart_response(user_id, await load_cart_summary(cart.id, cart_repo))
+    except Exception as e:
+        logger.error(f"Failed to update product in cart: {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.delete("/users/carts/items/{product_id}/", response_model=CartUpdateResponseSchema | CartLineResponseSchema)
+async def remove_from_cart(
+    product_id: int,
+    variant_id: str | None = None,
+    response_mode: ResponseMode = RESPONSE_MODE_QUERY,
+    token: str = Depends(oauth2_scheme),
+    token_service: TokenService = Depends(get_token_service),
+    cart_repo: AsyncCartRepository = Depends(get_async_cart_repository),
+    cart_product_repo: AsyncCartProductRepository = Depends(get_async_cart_product_repository),
+):
+    user_id = token_service.get_user(token)
+    cart = await cart_repo.get_by_user_id(user_id)
+
+    try:
+        line_id = await cart_product_repo.remove_product(cart_id=cart.id, product_id=product_id, variant_id=variant_id)
+        logger.info(f"Removed product {product_id} from cart")
+        if response_mode == "line":
+            return build_line_response(user_id, await load_line_summary(cart.id, line_id, cart_product_repo))
+        cart_data = build_cart_response(user_id, await load_cart_summary(cart.id, cart_repo))
+        return CartUpdateResponseSchema(success=True, message="Товар успешно удалён из корзины", cart=cart_data)
+    except Exception as e:
+        logger.error(f"Failed to remove product from cart: {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/users/carts/items/batch/", response_model=CartResponseSchema)
+async def apply_cart_operations(
+    request: CartBatchRequestSchema,
+    token: str = Depends(oauth2_scheme),
+    token_service: TokenService = Depends(get_token_service),
+    cart_repo: AsyncCartRepository = Depends(get_async_cart_repository),
+    cart_product_repo: AsyncCartProductRepository = Depends(get_async_cart_product_repository),
+):
+    user_id = token_service.get_user(token)
+    cart = await cart_repo.get_by_user_id(user_id)
+
+    try:
+        await cart_product_repo.apply_operations(cart.id, to_cart_operations(request))
+        logger.info(f"Applied {len(request.operations)} cart operations")
+        return build_cart_response(user_id, await load_cart_summary(cart.id, cart_repo))
+    except Exception as e:
+        logger.error(f"Failed to apply cart operations: {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/users/carts/", response_model=CartResponseSchema)
+async def get_cart(
+    token: str = Depends(oauth2_scheme),
+    token_service: TokenService = Depends(get_token_service),
+    cart_repo: AsyncCartRepository = Depends(get_async_cart_repository),
+):
+    user_id = token_service.get_user(token)
+    cart = await cart_repo.get_by_user_id_with_products(user_id)
+    return build_cart_response(user_id, cart_serializer.summarize(cart.cart_product_rel))
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from src.application.logger import logger
+from src.exceptions.order_exceptions import OrderNotFoundException
+from src.exceptions.pagination_exceptions import InvalidCursorException
+from src.repositories.aio import AsyncOrderRepository
+
+from ..sсhemas import OrderHistoryResponseSchema, OrderSchema
+from ..utils.pagination import decode_cursor
+from ..utils.token_services import TokenService
+from .depends import get_async_order_repository, get_token_service, oauth2_scheme
+from .order import _order_history_response
+
+# Асинхронные версии чтения заказов; подключаются вместо синхронных при SETTINGS.db_async
+router = APIRouter(tags=["Заказ"], include_in_schema=False)
+
+
+@router.get("/users/order/{order_id}/", response_model=OrderSchema)
+async def get_order(
+    order_id: int,
+    token: str = Depends(oauth2_scheme),
+    token_service: TokenService = Depends(get_token_service),
+    order_repo: AsyncOrderRepository = Depends(get_async_order_repository),
+):
+    user_id = token_service.get_user(token)
+    order = await order_repo.get_order(order_id)
+    if not order:
+        error = OrderNotFoundException(order_id)
+        logger.warning(str(error))
+        raise HTTPException(status_code=404, detail=str(error))
+
+    if order.user_id != user_id:
+        logger.warning(f"Доступ к заказу {order_id} запрещён для пользователя {user_id}")
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    return OrderSchema.from_orm(order)
+
+
+@router.get("/users/orders/", response_model=OrderHistoryResponseSchema)
+async def get_user_orders(
+    count: int = Query(20, gt=0, le=100),
+    after: str | None = Query(None),
+    token: str = Depends(oauth2_scheme),
+    token_service: TokenService = Depends(get_token_service),
+    order_repo: AsyncOrderRepository = Depends(get_async_order_repository),
+):
+    user_id = token_service.get_user(token)
+    try:
+        summaries, has_next_page = await order_repo.get_user_order_summaries(user_id, count, decode_cursor(after))
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _order_history_response(summaries, has_next_page)
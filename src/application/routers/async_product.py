@@ -0,0 +1,130 @@
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+
+from src.application.logger import logger
+from src.application.utils.cache import PRODUCT_CACHE
+from src.application.utils.http_cache import conditional_response, make_etag
+from src.application.utils.json_response import json_response
+from src.application.utils.pagination import decode_cursor, encode_cursor, page_info
+from src.exceptions.pagination_exceptions import InvalidCursorException
+from src.exceptions.product_exceptions import NotFoundProductException
+from src.repositories.aio import AsyncProductRepository
+from src.repositories.product import ProductAdapter
+
+from .depends import get_async_product_adapter, get_async_product_repository
+from .product import _page_validators
+
+# Асинхронные версии эндпоинтов каталога; подключаются вместо синхронных при SETTINGS.db_async
+router = APIRouter(tags=["Продукты"], include_in_schema=False)
+
+
+@router.get("/products/{product_id:int}")
+async def get_product(
+    product_id: int,
+    request: Request,
+    response: Response,
+    product_repo: AsyncProductRepository = Depends(get_async_product_repository),
+    product_adapter: ProductAdapter = Depends(get_async_product_adapter),
+):
+    try:
+        cached = PRODUCT_CACHE.get(product_id)
+        if cached is not None:
+            updated_at = datetime.fromisoformat(cached["updatedAt"])
+        else:
+            updated_at = await product_repo.get_updated_at(product_id)
+        etag = make_etag("product", product_id, updated_at.isoformat() if updated_at else "")
+        not_modified = conditional_response(request, response, etag, updated_at)
+        if not_modified is not None:
+            return not_modified
+        if cached is not None:
+            return json_response(cached, response)
+
+        payload = ProductAdapter.card_from_row(await product_repo.get_document_row(product_id))
+        if payload is None:
+            product = await product_repo.get(product_id)
+            payload = product_adapter.to_graphql_list([product])[0]
+        PRODUCT_CACHE.set(product_id, payload)
+        logger.info(f"Продукт {product_id} успешно получен")
+        return json_response(payload, response)
+    except NotFoundProductException as e:
+        logger.warning(f"Продукт с ID {product_id} не найден: {e}")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.get("/products")
+async def get_products(
+    request: Request,
+    response: Response,
+    page: int = Query(1, gt=0),
+    count: int = Query(10, gt=0, le=100),
+    after: str | None = Query(None),
+    sort: Literal["id", "price_asc", "price_desc"] = Query("id"),
+    min_price: float | None = Query(None, ge=0),
+    max_price: float | None = Query(None, ge=0),
+    size: str | None = Query(None, description="Только продукты с вариантом этого размера"),
+    color: str | None = Query(None, description="Только продукты с вариантом этого цвета"),
+    in_stock: bool = Query(False, description="Только продукты с доступным для продажи вариантом"),
+    product_repo: AsyncProductRepository = Depends(get_async_product_repository),
+):
+    try:
+        products, has_next_page = await product_repo.get_page(
+            count=count,
+            page=page,
+            after=decode_cursor(after),
+            sort=sort,
+            min_price=min_price,
+            max_price=max_price,
+            size=size,
+            color=color,
+            in_stock=in_stock,
+        )
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    not_modified = conditional_response(
+        request, response, *_page_validators(products, has_next_page, sort, min_price, max_price, size, color, in_stock)
+    )
+    if not_modified is not None:
+        return not_modified
+
+    simple_products = [
+        {
+            "id": product.id,
+            "name": product.title,
+            "price": float(product.min_price),
+            "description": product.description or "",
+            "image_url": product.featured_image.get("url") if product.featured_image else None,
+        }
+        for product in products
+    ]
+    end_cursor = encode_cursor(product_repo.cursor_values(products[-1], sort)) if products else None
+    return json_response({"products": simple_products, "pageInfo": page_info(has_next_page, end_cursor)}, response)
+
+
+@router.get("/category/{category_id}")
+async def get_products_by_category(
+    category_id: int,
+    request: Request,
+    response: Response,
+    page: int = Query(1, gt=0),
+    count: int = Query(10, gt=0, le=100),
+    after: str | None = Query(None),
+    sort: Literal["id", "price_asc", "price_desc"] = Query("id"),
+    product_repo: AsyncProductRepository = Depends(get_async_product_repository),
+    product_adapter: ProductAdapter = Depends(get_async_product_adapter),
+):
+    try:
+        products, has_next_page = await product_repo.get_by_category(
+            category_id, page, count, decode_cursor(after), sort
+        )
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    not_modified = conditional_response(request, response, *_page_validators(products, has_next_page, sort))
+    if not_modified is not None:
+        return not_modified
+
+    logger.info(f"Получены продукты по категории {category_id}")
+    return json_response(product_adapter.to_connection(products, has_next_page, sort), response)
@@ -1,12 +1,20 @@
 import logging
 from datetime import datetime
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
-from src.application.sсhemas import CartProductRequestSchema, CartResponseSchema, CartUpdateResponseSchema
+from src.application.sсhemas import (
+    CartBatchRequestSchema,
+    CartLineResponseSchema,
+    CartProductRequestSchema,
+    CartResponseSchema,
+    CartUpdateResponseSchema,
+)
 from src.application.utils.token_services import TokenService
 from src.repositories.cart import CartRepository
-from src.services.cart_product import CartProductService
+from src.repositories.cart_product import CartOperation
+from src.services.cart_product import CartLineSummary, CartProductService, CartSummary
 
 from .depends import (
     get_cart_product_service,
@@ -18,28 +26,49 @@ from .depends import (
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["Корзина"])
 
+ResponseMode = Literal["cart", "line"]
+RESPONSE_MODE_QUERY = Query(
+    "cart", description="cart — вся корзина; line — только измененная позиция и итоги корзины (быстрее)"
+)
+
 
-def build_cart_response(user_id: int, cart_id: int, cart_product_service: CartProductService) -> CartResponseSchema:
-    items_models = cart_product_service.cart_product_repo.get_products_in_cart(cart_id=cart_id)
-    items = [cart_product_service.serialize_cart_item(cp) for cp in items_models]
+def build_cart_response(user_id: int, summary: CartSummary) -> CartResponseSchema:
     return CartResponseSchema(
         user_id=user_id,
-        items=items,
-        total_items=cart_product_service.get_total_items(cart_id),
-        total_price=cart_product_service.get_total_price(cart_id),
+        items=summary.items,
+        total_items=summary.total_items,
+        total_price=summary.total_price,
         created_at=datetime.now(),
         updated_at=datetime.now(),
     )
 
 
+def to_cart_operations(request: CartBatchRequestSchema) -> list[CartOperation]:
+    return [
+        CartOperation(operation.action, operation.product_id, operation.variant_id, operation.quantity)
+        for operation in request.operations
+    ]
+
+
+def build_line_response(user_id: int, summary: CartLineSummary) -> CartLineResponseSchema:
+    return CartLineResponseSchema(
+        user_id=user_id,
+        line_id=f"line-{summary.line_id}",
+        item=summary.item,
+        total_items=summary.total_items,
+        total_price=summary.total_price,
+    )
+
+
 @router.post(
     "/users/carts/items/",
     summary="Добавить товар в корзину",
-    response_model=CartResponseSchema,
+    response_model=CartResponseSchema | CartLineResponseSchema,
     status_code=status.HTTP_201_CREATED,
 )
 def add_to_cart(
     item: CartProductRequestSchema,
+    response_mode: ResponseMode = RESPONSE_MODE_QUERY,
     token: str = Depends(oauth2_scheme),
     token_service: TokenService = Depends(get_token_service),
     cart_repo: CartRepository = Depends(get_cart_repository),
@@ -49,22 +78,29 @@ def add_to_cart(
     cart = cart_repo.get_by_user_id(user_id)
 
     try:
-        cart_product_service.cart_product_repo.add_product(
+        line_id = cart_product_service.cart_product_repo.add_product(
             cart_id=cart.id, product_id=item.product_id, variant_id=item.variant_id, quantity=item.quantity
         )
         logger.info(f"Added product {item.product_id} to cart")
-        return build_cart_response(user_id, cart.id, cart_product_service)
+        if response_mode == "line":
+            return build_line_response(user_id, cart_product_service.get_line_summary(cart.id, line_id))
+        return build_cart_response(user_id, cart_product_service.get_cart_summary(cart.id))
 
     except Exception as e:
         logger.error(f"Failed to add product to cart: {e}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@router.put("/users/carts/items/{product_id}/", summary="Обновить количество товара", response_model=CartResponseSchema)
+@router.put(
+    "/users/carts/items/{product_id}/",
+    summary="Обновить количество товара",
+    response_model=CartResponseSchema | CartLineResponseSchema,
+)
 def update_cart_item(
     product_id: int,
     quantity: int,
     variant_id: str | None = None,
+    response_mode: ResponseMode = RESPONSE_MODE_QUERY,
     token: str = Depends(oauth2_scheme),
     token_service: TokenService = Depends(get_token_service),
     cart_repo: CartRepository = Depends(get_cart_repository),
@@ -79,11 +115,13 @@ def update_cart_item(
     cart = cart_repo.get_by_user_id(user_id)
 
     try:
-        cart_product_service.cart_product_repo.change_quantity(
+        line_id = cart_product_service.cart_product_repo.change_quantity(
             cart_id=cart.id, product_id=product_id, variant_id=variant_id, quantity=quantity
         )
         logger.info(f"Updated quantity for product {product_id}")
-        return build_cart_response(user_id, cart.id, cart_product_service)
+        if response_mode == "line":
+            return build_line_response(user_id, cart_product_service.get_line_summary(cart.id, line_id))
+        return build_cart_response(user_id, cart_product_service.get_cart_summary(cart.id))
 
     except Exception as e:
         logger.error(f"Failed to update product in cart: {e}")
@@ -91,11 +129,14 @@ def update_cart_item(
 
 
 @router.delete(
-    "/users/carts/items/{product_id}/", summary="Удалить товар из корзины", response_model=CartUpdateResponseSchema
+    "/users/carts/items/{product_id}/",
+    summary="Удалить товар из корзины",
+    response_model=CartUpdateResponseSchema | CartLineResponseSchema,
 )
 def remove_from_cart(
     product_id: int,
     variant_id: str | None = None,
+    response_mode: ResponseMode = RESPONSE_MODE_QUERY,
     token: str = Depends(oauth2_scheme),
     token_service: TokenService = Depends(get_token_service),
     cart_repo: CartRepository = Depends(get_cart_repository),
@@ -105,11 +146,13 @@ def remove_from_cart(
     cart = cart_repo.get_by_user_id(user_id)
 
     try:
-        cart_product_service.cart_product_repo.remove_product(
+        line_id = cart_product_service.cart_product_repo.remove_product(
             cart_id=cart.id, product_id=product_id, variant_id=variant_id
         )
         logger.info(f"Removed product {product_id} from cart")
-        cart_data = build_cart_response(user_id, cart.id, cart_product_service)
+        if response_mode == "line":
+            return build_line_response(user_id, cart_product_service.get_line_summary(cart.id, line_id))
+        cart_data = build_cart_response(user_id, cart_product_service.get_cart_summary(cart.id))
         return CartUpdateResponseSchema(success=True, message="Товар успешно удалён из корзины", cart=cart_data)
 
     except Exception as e:
@@ -117,6 +160,32 @@ def remove_from_cart(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@router.post(
+    "/users/carts/items/batch/",
+    summary="Применить несколько изменений корзины",
+    response_model=CartResponseSchema,
+)
+def apply_cart_operations(
+    request: CartBatchRequestSchema,
+    token: str = Depends(oauth2_scheme),
+    token_service: TokenService = Depends(get_token_service),
+    cart_repo: CartRepository = Depends(get_cart_repository),
+    cart_product_service: CartProductService = Depends(get_cart_product_service),
+):
+    """Операции add/update/remove применяются по порядку в одной транзакции: при ошибке в любой из них
+    корзина не меняется. Подряд идущие add выполняются одним запросом (например, перенос гостевой корзины)."""
+    user_id = token_service.get_user(token)
+    cart = cart_repo.get_by_user_id(user_id)
+
+    try:
+        cart_product_service.cart_product_repo.apply_operations(cart.id, to_cart_operations(request))
+        logger.info(f"Applied {len(request.operations)} cart operations")
+        return build_cart_response(user_id, cart_product_service.get_cart_summary(cart.id))
+    except Exception as e:
+        logger.error(f"Failed to apply cart operations: {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.get("/users/carts/", summary="Получить содержимое корзины", response_model=CartResponseSchema)
 def get_cart(
     token: str = Depends(oauth2_scheme),
@@ -125,5 +194,5 @@ def get_cart(
     cart_product_service: CartProductService = Depends(get_cart_product_service),
 ):
     user_id = token_service.get_user(token)
-    cart = cart_repo.get_by_user_id(user_id)
-    return build_cart_response(user_id, cart.id, cart_product_service)
+    cart = cart_repo.get_by_user_id_with_products(user_id)
+    return build_cart_response(user_id, cart_product_service.summarize(cart.cart_product_rel))
@@ -1,10 +1,12 @@
-from fastapi import Depends
+from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
 
 from src.application.utils.token_services import TokenService
 from src.config import SETTINGS
-from src.database import get_db  # Импортируем get_db из database.py
+from src.database import SessionLocal, get_async_db, get_db  # Импортируем get_db из database.py
+from src.exceptions.user_exceptions import NotFoundUserException
 from src.models import CartModel, OrderModel, OrderProductModel, ReviewModel, UserModel
 from src.repositories import (
     CartProductRepository,
@@ -15,13 +17,27 @@ from src.repositories import (
     ProductRepository,
     ReviewRepository,
 )
+from src.repositories.aio import (
+    AsyncCartProductRepository,
+    AsyncCartRepository,
+    AsyncOrderRepository,
+    AsyncProductRepository,
+    AsyncReviewRepository,
+)
 from src.repositories.user import UserRepository
 from src.services.cart_product import CartProductService
 from src.services.order import OrderService
 from src.services.product import ProductService
+from src.services.product_export import ProductExporter
+from src.services.product_import import ProductImporter
 from src.services.user import UserService
 
 
+def get_session_factory() -> sessionmaker:
+    """Фабрика сессий для кода, который живет дольше запроса (например, генераторы StreamingResponse)"""
+    return SessionLocal
+
+
 def get_user_repository(db: Session = Depends(get_db)):
     return UserRepository(user_model=UserModel, session=db)
 
@@ -81,6 +97,33 @@ def get_cart_product_service(
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 
+def get_admin_user_id(
+    token: str = Depends(oauth2_scheme),
+    token_service: TokenService = Depends(get_token_service),
+    user_repository: UserRepository = Depends(get_user_repository),
+) -> int:
+    """ID пользователя из токена; пропускает только администратора (SETTINGS.admin_email)"""
+    user_id = token_service.get_user(token)
+    try:
+        user = user_repository.get(user_id)
+    except NotFoundUserException:
+        user = None
+    if user is None or user.email != SETTINGS.admin_email:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return user_id
+
+
+def get_product_exporter(session_factory: sessionmaker = Depends(get_session_factory)) -> ProductExporter:
+    return ProductExporter(session_factory=session_factory)
+
+
+def get_product_importer(
+    db: Session = Depends(get_db),
+    product_adapter: ProductAdapter = Depends(get_product_adapter),
+) -> ProductImporter:
+    return ProductImporter(session=db, adapter=product_adapter)
+
+
 def get_user_services(
     user_repository: UserRepository = Depends(get_user_repository),
     cart_repository: CartRepository = Depends(get_cart_repository),
@@ -99,3 +142,31 @@ def get_order_services(
         order_product_repository=order_product_repository,
         cart_repository=cart_repository,
     )
+
+
+# Зависимости асинхронного стека (используются только при SETTINGS.db_async)
+def get_async_product_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncProductRepository:
+    return AsyncProductRepository(session=db)
+
+
+def get_async_cart_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncCartRepository:
+    return AsyncCartRepository(session=db)
+
+
+def get_async_cart_product_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncCartProductRepository:
+    return AsyncCartProductRepository(session=db)
+
+
+def get_async_order_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncOrderRepository:
+    return AsyncOrderRepository(session=db)
+
+
+def get_async_review_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncReviewRepository:
+    return AsyncReviewRepository(session=db)
+
+
+def get_async_product_adapter(
+    product_repository: AsyncProductRepository = Depends(get_async_product_repository),
+    review_repository: AsyncReviewRepository = Depends(get_async_review_repository),
+) -> ProductAdapter:
+    return ProductAdapter(product_repository=product_repository, review_repo=review_repository)
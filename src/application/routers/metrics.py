@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+
+from src.application.utils.cache import PRODUCT_CACHE
+from src.database import POOL_METRICS
+
+router = APIRouter(tags=["Метрики"])
+
+
+@router.get("/metrics/cache", summary="Статистика кэша карточек продуктов текущего воркера")
+def get_cache_metrics():
+    return {"products": PRODUCT_CACHE.stats()}
+
+
+@router.get("/metrics/pool", summary="Статистика пулов соединений с БД текущего воркера")
+def get_pool_metrics():
+    return {name: metrics.stats() for name, metrics in POOL_METRICS.items()}
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from src.application.logger import logger
-from src.exceptions.order_exceptions import CartIsEmpty, OrderNotFoundException
+from src.exceptions.order_exceptions import CartIsEmpty, MixedCurrencyOrderException, OrderNotFoundException
+from src.exceptions.pagination_exceptions import InvalidCursorException
+from src.repositories.order import OrderRepository
 from src.services.order import OrderService
 
-from ..sсhemas import OrderSchema
+from ..sсhemas import OrderHistoryResponseSchema, OrderSchema, OrderSummarySchema
+from ..utils.pagination import decode_cursor, encode_cursor, page_info
 from ..utils.token_services import TokenService
 from .depends import get_order_services, get_token_service, oauth2_scheme
 
@@ -37,7 +40,7 @@ def create_order(
             user_id=user_id, email=email, shipping_address=shipping_address, payment_method=payment_method
         )
         return OrderSchema.from_orm(created_order)
-    except CartIsEmpty as e:
+    except (CartIsEmpty, MixedCurrencyOrderException) as e:
         logger.warning(f"Ошибка создания заказа для пользователя {user_id}: {e}")
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -66,9 +69,14 @@ def get_order(
 
 
 @router.get(
-    "/users/orders/", tags=["Заказ"], summary="Получение всех заказов пользователя", response_model=list[OrderSchema]
+    "/users/orders/",
+    tags=["Заказ"],
+    summary="История заказов пользователя (без позиций, позиции — в /users/order/{order_id}/)",
+    response_model=OrderHistoryResponseSchema,
 )
 def get_user_orders(
+    count: int = Query(20, gt=0, le=100),
+    after: str | None = Query(None, description="Курсор endCursor предыдущей страницы"),
     token: str = Depends(oauth2_scheme),
     token_service: TokenService = Depends(get_token_service),
     order_service: OrderService = Depends(get_order_services),
@@ -76,5 +84,16 @@ def get_user_orders(
     user_id = token_service.get_user(token)
     logger.info(f"Получение всех заказов пользователя {user_id}")
 
-    orders = order_service.get_user_orders(user_id)
-    return [OrderSchema.from_orm(order) for order in orders]
+    try:
+        summaries, has_next_page = order_service.get_order_history(user_id, count, decode_cursor(after))
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _order_history_response(summaries, has_next_page)
+
+
+def _order_history_response(summaries: list, has_next_page: bool) -> OrderHistoryResponseSchema:
+    end_cursor = encode_cursor(OrderRepository.cursor_values(summaries[-1])) if summaries else None
+    return OrderHistoryResponseSchema(
+        orders=[OrderSummarySchema.from_summary(summary) for summary in summaries],
+        pageInfo=page_info(has_next_page, end_cursor),
+    )
@@ -1,27 +1,63 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import io
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 
 from src.application.logger import logger
-from src.application.sсhemas import ProductListResponseSchema, ProductResponseSchema
+from src.application.sсhemas import (
+    FacetedProductListResponseSchema,
+    ProductListResponseSchema,
+    ProductResponseSchema,
+    ProductSearchResponseSchema,
+)
+from src.application.utils.http_cache import collection_etag, conditional_response, last_modified_of, make_etag
+from src.application.utils.json_response import json_response
+from src.application.utils.pagination import decode_cursor, encode_cursor, page_info
+from src.exceptions.pagination_exceptions import InvalidCursorException
 from src.exceptions.product_exceptions import (
     NotFoundProductException,
+    ProductImportException,
     ProductListException,
     RecommendationException,
 )
-from src.repositories import ReviewRepository
+from src.models import ProductModel
 from src.repositories.product import ProductAdapter, ProductRepository
 from src.services.product import ProductService
+from src.services.product_export import EXPORT_FORMATS, EXPORT_MEDIA_TYPES, ProductExporter
+from src.services.product_import import IMPORT_FORMATS, ProductImporter, detect_format, read_records
 
-from .depends import get_product_adapter, get_product_repository, get_product_service, get_review_repository
+from .depends import (
+    get_admin_user_id,
+    get_product_adapter,
+    get_product_exporter,
+    get_product_importer,
+    get_product_repository,
+    get_product_service,
+)
 
 router = APIRouter(tags=["Продукты"])
 
 
-@router.get("/products/{product_id}", summary="Получить конкретный продукт", response_model=ProductResponseSchema)
-def get_product(product_id: int, product_adpater: ProductAdapter = Depends(get_product_adapter)):
+@router.get("/products/{product_id:int}", summary="Получить конкретный продукт", response_model=ProductResponseSchema)
+def get_product(
+    product_id: int,
+    request: Request,
+    response: Response,
+    product_adpater: ProductAdapter = Depends(get_product_adapter),
+):
     try:
+        # Версию берем из кэша карточек или легким запросом, чтобы ответить 304 без сериализации
+        updated_at = product_adpater.get_product_updated_at(product_id)
+        etag = make_etag("product", product_id, updated_at.isoformat() if updated_at else "")
+        not_modified = conditional_response(request, response, etag, updated_at)
+        if not_modified is not None:
+            return not_modified
+
         product = product_adpater.get_one_product(product_id)
         logger.info(f"Продукт {product_id} успешно получен")
-        return product
+        return json_response(product, response)
     except NotFoundProductException as e:
         logger.warning(f"Продукт с ID {product_id} не найден: {e}")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -29,39 +65,58 @@ def get_product(product_id: int, product_adpater: ProductAdapter = Depends(get_p
 
 @router.get("/products", summary="Получить список продуктов")
 def get_products(
+    request: Request,
+    response: Response,
     page: int = Query(1, gt=0),
     count: int = Query(10, gt=0, le=100),
+    after: str | None = Query(None, description="Курсор endCursor предыдущей страницы (вместо page)"),
+    sort: Literal["id", "price_asc", "price_desc"] = Query("id"),
+    min_price: float | None = Query(None, ge=0),
+    max_price: float | None = Query(None, ge=0),
+    size: str | None = Query(None, description="Только продукты с вариантом этого размера"),
+    color: str | None = Query(None, description="Только продукты с вариантом этого цвета"),
+    in_stock: bool = Query(False, description="Только продукты с доступным для продажи вариантом"),
     product_repo: ProductRepository = Depends(get_product_repository),
 ):
     try:
         # Return simple format that frontend expects
-        products = product_repo.get_all(page=page, count=count)
+        products, has_next_page = product_repo.get_page(
+            count=count,
+            page=page,
+            after=decode_cursor(after),
+            sort=sort,
+            min_price=min_price,
+            max_price=max_price,
+            size=size,
+            color=color,
+            in_stock=in_stock,
+        )
+        not_modified = conditional_response(
+            request,
+            response,
+            *_page_validators(products, has_next_page, sort, min_price, max_price, size, color, in_stock),
+        )
+        if not_modified is not None:
+            return not_modified
+
         simple_products = []
 
         for product in products:
-            # Extract price from price_range JSON field
-            price = 0.0
-            if hasattr(product, "price_range") and product.price_range:
-                if isinstance(product.price_range, dict):
-                    min_price = product.price_range.get("minVariantPrice", {})
-                    if isinstance(min_price, dict) and "amount" in min_price:
-                        try:
-                            price = float(min_price["amount"])
-                        except (ValueError, TypeError):
-                            price = 0.0
-
             simple_products.append(
                 {
                     "id": product.id,
                     "name": product.title,
-                    "price": price,
+                    "price": float(product.min_price),
                     "description": product.description or "",
                     "image_url": product.featured_image.get("url") if product.featured_image else None,
                 }
             )
 
         logger.info(f"Список продуктов успешно получен: страница {page}, количество {count}")
-        return {"products": simple_products}
+        end_cursor = encode_cursor(product_repo.cursor_values(products[-1], sort)) if products else None
+        return json_response({"products": simple_products, "pageInfo": page_info(has_next_page, end_cursor)}, response)
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except ProductListException as e:
         logger.warning(f"Ошибка получения списка продуктов: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -72,17 +127,27 @@ def get_products(
 )
 def get_products_by_category(
     category_id: int,
+    request: Request,
+    response: Response,
     page: int = Query(1, gt=0),
     count: int = Query(10, gt=0, le=100),
-    product_repo: ProductRepository = Depends(get_product_repository),
-    review_repo: ReviewRepository = Depends(get_review_repository),
+    after: str | None = Query(None, description="Курсор endCursor предыдущей страницы (вместо page)"),
+    sort: Literal["id", "price_asc", "price_desc"] = Query("id"),
+    product_adapter: ProductAdapter = Depends(get_product_adapter),
 ):
-    products = product_repo.get_by_category(category_id, page, count)
-    products_with_rating = [
-        {**product.__dict__, "rating": review_repo.calculate_rating(product.id)} for product in products
-    ]
+    try:
+        products, has_next_page = product_adapter.product_repository.get_by_category(
+            category_id, page, count, after=decode_cursor(after), sort=sort
+        )
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    not_modified = conditional_response(request, response, *_page_validators(products, has_next_page, sort))
+    if not_modified is not None:
+        return not_modified
+
     logger.info(f"Получены продукты по категории {category_id}")
-    return {"products": products_with_rating}
+    return json_response(product_adapter.to_connection(products, has_next_page, sort), response)
 
 
 @router.get(
@@ -90,11 +155,136 @@ def get_products_by_category(
     summary="Получить рекомендованные продукты",
     response_model=ProductListResponseSchema,
 )
-def get_recommendations(product_id: int, product_service: ProductService = Depends(get_product_service)):
+def get_recommendations(
+    product_id: int,
+    request: Request,
+    response: Response,
+    product_service: ProductService = Depends(get_product_service),
+):
     try:
-        recommended_products = product_service.get_products_recommendation(product_id)
+        recommended_products = product_service.get_recommended_products(product_id)
+        not_modified = conditional_response(request, response, *_page_validators(recommended_products))
+        if not_modified is not None:
+            return not_modified
+
         logger.info(f"Рекомендации успешно получены для продукта {product_id}")
-        return {"edges": recommended_products}
+        nodes = product_service.get_products_recommendation(product_id, recommended=recommended_products)
+        return json_response({"edges": [{"node": product} for product in nodes]}, response)
+    except NotFoundProductException as e:
+        logger.warning(f"Продукт с ID {product_id} не найден: {e}")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except RecommendationException as e:
         logger.warning(f"Ошибка рекомендаций для продукта {product_id}: {e}")
         raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get(
+    "/products/filter",
+    summary="Список продуктов с фильтрами и количеством по фасетам",
+    response_model=FacetedProductListResponseSchema,
+)
+def filter_products(
+    page: int = Query(1, gt=0),
+    count: int = Query(10, gt=0, le=100),
+    after: str | None = Query(None, description="Курсор endCursor предыдущей страницы (вместо page)"),
+    sort: Literal["id", "price_asc", "price_desc"] = Query("id"),
+    category_id: int | None = Query(None),
+    tags: list[str] | None = Query(None, alias="tag", description="Только продукты со всеми указанными тегами"),
+    size: str | None = Query(None),
+    color: str | None = Query(None),
+    min_price: float | None = Query(None, ge=0),
+    max_price: float | None = Query(None, ge=0),
+    in_stock: bool = Query(False),
+    product_adapter: ProductAdapter = Depends(get_product_adapter),
+):
+    # Фасеты зависят от всего каталога, а не только от продуктов страницы, поэтому ETag здесь не выдается
+    filters = {
+        "category_id": category_id,
+        "tags": tags,
+        "size": size,
+        "color": color,
+        "min_price": min_price,
+        "max_price": max_price,
+        "in_stock": in_stock,
+    }
+    product_repo = product_adapter.product_repository
+    try:
+        products, has_next_page = product_repo.get_page(
+            count=count, page=page, after=decode_cursor(after), sort=sort, **filters
+        )
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    connection = product_adapter.to_connection(products, has_next_page, sort)
+    connection["facets"] = {
+        facet: [value._asdict() for value in values] for facet, values in product_repo.get_facets(**filters).items()
+    }
+    return json_response(connection)
+
+
+@router.get("/products/search", summary="Полнотекстовый поиск продуктов", response_model=ProductSearchResponseSchema)
+def search_products(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Слова для поиска в названии, описании и тегах"),
+    count: int = Query(10, gt=0, le=100),
+    after: str | None = Query(None, description="Курсор endCursor предыдущей страницы"),
+    product_adapter: ProductAdapter = Depends(get_product_adapter),
+):
+    try:
+        hits, has_next_page = product_adapter.product_repository.search(q, count, after=decode_cursor(after))
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    not_modified = conditional_response(
+        request, response, *_page_validators([hit.product for hit in hits], q, has_next_page)
+    )
+    if not_modified is not None:
+        return not_modified
+
+    logger.info(f"Поиск продуктов {q!r}: найдено {len(hits)} на странице")
+    return json_response(product_adapter.to_search_connection(hits, has_next_page), response)
+
+
+@router.get("/products/export", summary="Выгрузить весь каталог (NDJSON или CSV) потоком")
+def export_products(
+    file_format: Literal[EXPORT_FORMATS] = Query("ndjson", alias="format"),
+    batch_size: int = Query(500, gt=0, le=5000),
+    exporter: ProductExporter = Depends(get_product_exporter),
+):
+    exporter.batch_size = batch_size
+    return StreamingResponse(
+        exporter.stream(file_format),
+        media_type=EXPORT_MEDIA_TYPES[file_format],
+        headers={"Content-Disposition": f'attachment; filename="catalog.{file_format}"'},
+    )
+
+
+@router.post("/products/import", summary="Импорт продуктов из CSV или JSONL (только администратор)")
+def import_products(
+    file: UploadFile,
+    file_format: Literal[IMPORT_FORMATS] | None = Query(None, alias="format"),
+    batch_size: int = Query(1000, gt=0, le=10000),
+    admin_id: int = Depends(get_admin_user_id),
+    importer: ProductImporter = Depends(get_product_importer),
+):
+    try:
+        file_format = file_format or detect_format(file.filename or "")
+    except ProductImportException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # Файл читается построчно из временного файла загрузки, а не целиком в память
+    stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    importer.batch_size = batch_size
+    try:
+        report = importer.run(read_records(stream, file_format))
+    except UnicodeDecodeError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Файл должен быть в UTF-8: {e}")
+    logger.info(f"Администратор {admin_id} импортировал продукты из {file.filename}")
+    return report.as_dict()
+
+
+def _page_validators(products: list[ProductModel], *parts) -> tuple[str, datetime | None]:
+    """ETag и Last-Modified страницы по ID и времени изменения входящих в нее продуктов"""
+    etag = collection_etag(((product.id, product.updated_at) for product in products), *parts)
+    return etag, last_modified_of(product.updated_at for product in products)
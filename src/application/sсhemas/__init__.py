@@ -1,14 +1,19 @@
-from .product import ProductOptionSchema, ProductResponseSchema, ProductListResponseSchema, ProductCreateSchema
+from .product import (ProductOptionSchema, ProductResponseSchema, ProductListResponseSchema, ProductCreateSchema,
+                      ProductSearchResponseSchema, FacetedProductListResponseSchema)
 from .user import UserSchema, UserAuth, UserInit
 from .review import ReviewSchema, ReviewResponce
-from .cart_product import CartProductRequestSchema, CartResponseSchema, CartUpdateResponseSchema
-from .order import OrderSchema
+from .cart_product import (CartProductRequestSchema, CartResponseSchema, CartUpdateResponseSchema,
+                           CartLineResponseSchema, CartOperationSchema, CartBatchRequestSchema)
+from .order import OrderSchema, OrderSummarySchema, OrderHistoryResponseSchema
 
 
 __all__ = ['ProductOptionSchema', 'ProductResponseSchema',
-           'ProductListResponseSchema', 'ProductCreateSchema', 'UserSchema',
+           'ProductListResponseSchema', 'ProductCreateSchema', 'ProductSearchResponseSchema',
+           'FacetedProductListResponseSchema', 'UserSchema',
            'UserAuth', 'UserInit', 'ReviewSchema',
-           'ReviewResponce', 'OrderSchema','CartProductRequestSchema',
-            'CartResponseSchema', 'CartUpdateResponseSchema']
+           'ReviewResponce', 'OrderSchema', 'OrderSummarySchema', 'OrderHistoryResponseSchema',
+           'CartProductRequestSchema',
+            'CartResponseSchema', 'CartUpdateResponseSchema', 'CartLineResponseSchema',
+           'CartOperationSchema', 'CartBatchRequestSchema']
 
 
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
@@ -45,10 +46,21 @@ class CartProductItemSchema(BaseModel):
 
 class CartProductRequestSchema(BaseModel):
     product_id: int
-    variant_id: str | None = None
+    variant_id: str | None = None  # без варианта — отдельная позиция, позиции с вариантами не меняются
     quantity: int = Field(..., gt=0, le=100)
 
 
+class CartOperationSchema(BaseModel):
+    action: Literal["add", "update", "remove"]
+    product_id: int
+    variant_id: str | None = None
+    quantity: int = Field(1, gt=0, le=100)  # для add — сколько добавить, для update — новое количество
+
+
+class CartBatchRequestSchema(BaseModel):
+    operations: list[CartOperationSchema] = Field(..., min_length=1, max_length=100)
+
+
 class CartResponseSchema(BaseModel):
     user_id: int
     items: list[CartProductItemSchema]
@@ -58,6 +70,16 @@ class CartResponseSchema(BaseModel):
     updated_at: datetime
 
 
+class CartLineResponseSchema(BaseModel):
+    """Облегченный ответ на изменение корзины: только измененная позиция и итоги корзины"""
+
+    user_id: int
+    line_id: str
+    item: CartProductItemSchema | None = None  # None, если позиция удалена
+    total_items: int
+    total_price: float
+
+
 class CartUpdateResponseSchema(BaseModel):
     success: bool
     message: str
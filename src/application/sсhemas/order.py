@@ -2,6 +2,8 @@ from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict
 
+from .product import PageInfoSchema
+
 
 class OrderSchema(BaseModel):
     id: int
@@ -22,71 +24,26 @@ class OrderSchema(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
-    @staticmethod
-    def _calculate_total_amount(order_model) -> float:
-        """Calculate total amount from order products."""
-        total_amount = 0.0
-
-        if hasattr(order_model, "order_products") and order_model.order_products:
-            for order_product in order_model.order_products:
-                if order_product.product and order_product.product.price_range:
-                    try:
-                        # Get the minimum price from price_range
-                        price_range = order_product.product.price_range
-                        if isinstance(price_range, dict):
-                            min_price = price_range.get("minVariantPrice", {})
-                            if isinstance(min_price, dict):
-                                price_str = min_price.get("amount", "0.0")
-                                price = float(price_str) if isinstance(price_str, (str, int, float)) else 0.0
-                            else:
-                                price = 0.0
-                        else:
-                            price = 0.0
-
-                        total_amount += price * order_product.quantity
-                    except (ValueError, TypeError, KeyError):
-                        # If we can't parse the price, skip this item
-                        continue
-
-        return total_amount
-
     @staticmethod
     def _build_order_items(order_model) -> list:
-        """Build order items list for frontend compatibility."""
-        items = []
-
-        if hasattr(order_model, "order_products") and order_model.order_products:
-            for order_product in order_model.order_products:
-                if order_product.product:
-                    try:
-                        # Get product price
-                        price = 0.0
-                        if order_product.product.price_range:
-                            price_range = order_product.product.price_range
-                            if isinstance(price_range, dict):
-                                min_price = price_range.get("minVariantPrice", {})
-                                if isinstance(min_price, dict):
-                                    price_str = min_price.get("amount", "0.0")
-                                    price = float(price_str) if isinstance(price_str, (str, int, float)) else 0.0
-
-                        item = {
-                            "id": order_product.id,
-                            "product_id": order_product.product_id,
-                            "name": order_product.product.title or "Unknown Product",
-                            "title": order_product.product.title or "Unknown Product",
-                            "quantity": order_product.quantity,
-                            "price": price,
-                        }
-                        items.append(item)
-                    except (ValueError, TypeError, AttributeError):
-                        continue
-
-        return items
+        """Build order items list from prices stored on order lines at checkout."""
+        return [
+            {
+                "id": order_product.id,
+                "product_id": order_product.product_id,
+                "variant_id": order_product.variant_id,
+                "name": order_product.title or f"Product {order_product.product_id}",
+                "title": order_product.title or f"Product {order_product.product_id}",
+                "quantity": order_product.quantity,
+                "price": float(order_product.unit_price),
+                "total": float(order_product.line_total),
+            }
+            for order_product in order_model.order_products or []
+        ]
 
     @classmethod
     def from_orm(cls, order_model):
         """Convert OrderModel to OrderSchema with frontend compatibility"""
-        total_amount = cls._calculate_total_amount(order_model)
         items = cls._build_order_items(order_model)
 
         # Get email from order-specific field or fallback to user email
@@ -107,10 +64,39 @@ class OrderSchema(BaseModel):
             updated_at=getattr(order_model, "updated_at", None),
             order_id=str(order_model.id),
             status="completed" if order_model.payment else "pending",
-            total_amount=total_amount,
-            currency_code="USD",
+            total_amount=float(order_model.total_amount or 0),
+            currency_code=order_model.currency_code or "USD",
             email=email,
             shipping_address=order_model.shipping_address,
             payment_method=payment_method,
             items=items,
         )
+
+
+class OrderSummarySchema(BaseModel):
+    """Заказ в истории: без позиций, только их количество"""
+
+    id: int
+    order_id: str
+    created_at: datetime | None = None
+    status: str = "pending"
+    total_amount: float = 0.0
+    currency_code: str = "USD"
+    item_count: int = 0
+
+    @classmethod
+    def from_summary(cls, summary) -> "OrderSummarySchema":
+        return cls(
+            id=summary.id,
+            order_id=str(summary.id),
+            created_at=summary.created_at,
+            status="completed" if summary.payment else "pending",
+            total_amount=float(summary.total_amount or 0),
+            currency_code=summary.currency_code or "USD",
+            item_count=summary.item_count,
+        )
+
+
+class OrderHistoryResponseSchema(BaseModel):
+    orders: list[OrderSummarySchema]
+    pageInfo: PageInfoSchema
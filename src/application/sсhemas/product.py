@@ -81,12 +81,49 @@ class ProductResponseSchema(ProductBaseSchema):
     model_config = ConfigDict(from_attributes=True)  # Для Pydantic v2
 
 
+class ProductEdgeSchema(BaseModel):
+    node: ProductResponseSchema
+    cursor: str | None = None
+
+
+class PageInfoSchema(BaseModel):
+    hasNextPage: bool
+    endCursor: str | None = None
+
+
 class ProductListResponseSchema(BaseModel):
-    edges: list[dict[str, ProductResponseSchema]]  # GraphQL-style
+    edges: list[ProductEdgeSchema]  # GraphQL-style
+    pageInfo: PageInfoSchema | None = None
     # Или для REST-style:
     # products: List[ProductResponseSchema]
 
 
+class FacetValueSchema(BaseModel):
+    value: str
+    label: str | None = None  # название категории
+    count: int
+
+
+class FacetedProductListResponseSchema(ProductListResponseSchema):
+    # category, tag, size, color, price (корзины вида "25-50" и "500+")
+    facets: dict[str, list[FacetValueSchema]]
+
+
+class SearchHighlightsSchema(BaseModel):
+    title: str
+    description: str
+
+
+class ProductSearchEdgeSchema(ProductEdgeSchema):
+    rank: float
+    highlights: SearchHighlightsSchema  # найденные слова обернуты в <mark>
+
+
+class ProductSearchResponseSchema(BaseModel):
+    edges: list[ProductSearchEdgeSchema]
+    pageInfo: PageInfoSchema
+
+
 # from pydantic import BaseModel, Field
 # from typing import List, Optional
 # from datetime import datetime
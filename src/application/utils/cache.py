@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Protocol
+
+from src.config import SETTINGS
+
+
+class CacheBackend(Protocol):
+    """Интерфейс хранилища кэша: локальный LRU или общий кэш (например, Redis) с теми же методами."""
+
+    def get(self, key: str) -> Any | None: ...
+
+    def set(self, key: str, value: Any) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> dict[str, int]: ...
+
+
+class LocalLRUCache:
+    """Ограниченный по размеру LRU-кэш с TTL в памяти процесса."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._items[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._items),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class ProductCache:
+    """Кэш сериализованных карточек продуктов по ID.
+
+    Инвалидируется ProductRepository (update/delete) и ReviewRepository (запись отзывов).
+    Хранилище можно заменить через set_backend, например на общий кэш для всех воркеров.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+
+    def set_backend(self, backend: CacheBackend) -> None:
+        self.backend = backend
+
+    def get(self, product_id: int) -> Any | None:
+        return self.backend.get(self._key(product_id))
+
+    def set(self, product_id: int, payload: Any) -> None:
+        self.backend.set(self._key(product_id), payload)
+
+    def invalidate(self, product_id: int) -> None:
+        self.backend.delete(self._key(product_id))
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> dict[str, int]:
+        return self.backend.stats()
+
+    @staticmethod
+    def _key(product_id: int) -> str:
+        return f"product:{product_id}"
+
+
+# Кэш карточек продуктов текущего процесса
+PRODUCT_CACHE = ProductCache(LocalLRUCache(SETTINGS.product_cache_size, SETTINGS.product_cache_ttl))
@@ -0,0 +1,71 @@
+import hashlib
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+
+# Меняется при изменении формата ответа, чтобы старые ETag перестали совпадать
+ETAG_VERSION = "1"
+
+
+def make_etag(*parts) -> str:
+    """Строгий ETag из частей, однозначно определяющих тело ответа."""
+    digest = hashlib.sha1("|".join(str(part) for part in (ETAG_VERSION, *parts)).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def collection_etag(versions: Iterable[tuple[int, datetime | None]], *parts) -> str:
+    """ETag списка по парам (id, updated_at) входящих в него продуктов."""
+    return make_etag(*parts, *(f"{item_id}:{_isoformat(updated_at)}" for item_id, updated_at in versions))
+
+
+def last_modified_of(updated_at: Iterable[datetime | None]) -> datetime | None:
+    return max((value for value in updated_at if value is not None), default=None)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None = None) -> bool:
+    """Проверяет If-None-Match (приоритетно) и If-Modified-Since."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return _as_utc(last_modified).replace(microsecond=0) <= since
+    return False
+
+
+def cache_headers(etag: str, last_modified: datetime | None = None) -> dict[str, str]:
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def not_modified_response(etag: str, last_modified: datetime | None = None) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag, last_modified))
+
+
+def conditional_response(
+    request: Request, response: Response, etag: str, last_modified: datetime | None = None
+) -> Response | None:
+    """Возвращает 304, если у клиента актуальная версия, иначе добавляет заголовки валидации к ответу."""
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    response.headers.update(cache_headers(etag, last_modified))
+    return None
+
+
+def _as_utc(value: datetime) -> datetime:
+    # updated_at хранится как naive UTC (datetime.utcnow)
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _isoformat(value: datetime | None) -> str:
+    return value.isoformat() if value is not None else ""
@@ -0,0 +1,18 @@
+from typing import Any
+
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+
+
+def json_response(content: Any, response: Response | None = None) -> ORJSONResponse:
+    """Ответ с JSON, сериализованным orjson сразу в байты.
+
+    Возвращенный из эндпоинта Response FastAPI отдает как есть: response_model не валидирует
+    и не перекодирует содержимое, поэтому использовать только для данных, уже приведенных к схеме
+    (например, ProductAdapter._to_graphql_format). Заголовки, выставленные на response эндпоинта
+    (ETag, Last-Modified), переносятся в ответ.
+    """
+    json = ORJSONResponse(content)
+    if response is not None:
+        json.headers.raw.extend(response.headers.raw)
+    return json
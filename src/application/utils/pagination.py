@@ -0,0 +1,28 @@
+import base64
+import binascii
+import json
+
+from src.exceptions.pagination_exceptions import InvalidCursorException
+
+
+def encode_cursor(values: dict) -> str:
+    """Кодирует значения ключа сортировки последней записи в непрозрачный курсор."""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> dict | None:
+    """Декодирует курсор, созданный encode_cursor, или возвращает None, если курсор не передан."""
+    if cursor is None:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorException(cursor) from e
+    if not isinstance(values, dict):
+        raise InvalidCursorException(cursor)
+    return values
+
+
+def page_info(has_next_page: bool, end_cursor: str | None) -> dict:
+    return {"hasNextPage": has_next_page, "endCursor": end_cursor}
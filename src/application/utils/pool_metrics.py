@@ -0,0 +1,102 @@
+import bisect
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool
+
+# Верхние границы корзин гистограммы ожидания соединения, мс (последняя корзина — все, что дольше)
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolMetrics:
+    """Метрики пула соединений одного движка: занятые соединения, overflow и время ожидания checkout.
+
+    Счетчики обновляются слушателями событий движка (instrument), а время ожидания
+    измеряет класс пула, полученный через pool_class.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._engine: Engine | None = None
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.wait_count = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+
+    def pool_class(self, base: type[Pool]) -> type[Pool]:
+        """Подкласс пула, замеряющий ожидание свободного соединения (сохраняется при engine.dispose())."""
+        metrics = self
+
+        class InstrumentedPool(base):
+            def _do_get(self):
+                started = time.perf_counter()
+                try:
+                    return super()._do_get()
+                except PoolTimeoutError:
+                    metrics.record_timeout()
+                    raise
+                finally:
+                    metrics.observe_wait((time.perf_counter() - started) * 1000)
+
+        InstrumentedPool.__name__ = InstrumentedPool.__qualname__ = f"Instrumented{base.__name__}"
+        return InstrumentedPool
+
+    def instrument(self, engine: Engine) -> None:
+        """Подписывается на события пула движка (для AsyncEngine передается engine.sync_engine)."""
+        self._engine = engine
+        event.listen(engine, "connect", lambda *_: self._increment("connects"))
+        event.listen(engine, "checkout", lambda *_: self._increment("checkouts"))
+        event.listen(engine, "checkin", lambda *_: self._increment("checkins"))
+        event.listen(engine, "invalidate", lambda *_: self._increment("invalidations"))
+
+    def observe_wait(self, wait_ms: float) -> None:
+        with self._lock:
+            self.wait_buckets[bisect.bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+            self.wait_count += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+
+    def record_timeout(self) -> None:
+        self._increment("timeouts")
+
+    def stats(self) -> dict:
+        pool = self._engine.pool if self._engine is not None else None
+        buckets = {f"le_{bound}ms": count for bound, count in zip(WAIT_BUCKETS_MS, self.wait_buckets, strict=False)}
+        buckets["inf"] = self.wait_buckets[-1]
+        return {
+            "pool": pool.status() if pool is not None else None,
+            # size/checkedout/overflow есть только у QueuePool и его наследников
+            "size": _pool_value(pool, "size"),
+            "checked_out": _pool_value(pool, "checkedout"),
+            # QueuePool.overflow() отрицателен, пока пул не заполнен
+            "overflow": max(_pool_value(pool, "overflow") or 0, 0),
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "wait_ms": {
+                "count": self.wait_count,
+                "avg": self.wait_total_ms / self.wait_count if self.wait_count else 0.0,
+                "max": self.wait_max_ms,
+                "buckets": buckets,
+            },
+        }
+
+    def _increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+def _pool_value(pool: Pool | None, name: str) -> int | None:
+    method = getattr(pool, name, None)
+    return method() if callable(method) else None
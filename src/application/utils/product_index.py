@@ -0,0 +1,167 @@
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from collections.abc import Iterable
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Разбивает текст на токены в нижнем регистре."""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def highlight(text: str | None, terms: Iterable[str], start: str = "<mark>", stop: str = "</mark>") -> str:
+    """Выделяет в тексте токены из terms (как ts_headline с HighlightAll)."""
+    terms = set(terms)
+    if not text or not terms:
+        return text or ""
+    return TOKEN_PATTERN.sub(lambda match: f"{start}{match[0]}{stop}" if match[0].lower() in terms else match[0], text)
+
+
+def product_text(title: str | None, description: str | None, tags: list[str] | None) -> str:
+    """Собирает индексируемый текст продукта из названия, описания и тегов."""
+    return " ".join([title or "", description or "", *(tags or [])])
+
+
+class ProductIndex:
+    """Инвертированный индекс токен -> продукты с BM25-ранжированием.
+
+    Индекс хранится в памяти процесса: каждый воркер uvicorn строит свой экземпляр при старте
+    и обновляет его при записи продуктов через ProductRepository.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, max_query_terms: int = 32):
+        self.k1 = k1
+        self.b = b
+        self.max_query_terms = max_query_terms
+        self.is_built = False
+        self._lock = threading.RLock()
+        self._postings: dict[str, dict[int, int]] = {}
+        self._doc_terms: dict[int, Counter] = {}
+        self._doc_lengths: dict[int, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, product_id: int) -> bool:
+        return product_id in self._doc_terms
+
+    def build(self, documents: Iterable[tuple[int, str]]) -> None:
+        """Полностью перестраивает индекс по парам (product_id, текст)."""
+        with self._lock:
+            self._postings = {}
+            self._doc_terms = {}
+            self._doc_lengths = {}
+            self._total_length = 0
+            for product_id, text in documents:
+                self._add(product_id, text)
+            self.is_built = True
+
+    def add(self, product_id: int, text: str) -> None:
+        """Добавляет продукт в индекс или заменяет его текущую версию."""
+        with self._lock:
+            self._remove(product_id)
+            self._add(product_id, text)
+
+    def remove(self, product_id: int) -> None:
+        with self._lock:
+            self._remove(product_id)
+
+    def search(self, text: str, limit: int = 10, exclude_id: int | None = None) -> list[tuple[int, float]]:
+        """Возвращает до limit пар (product_id, score) по убыванию релевантности тексту."""
+        return self._score(Counter(tokenize(text)), limit, exclude_id)
+
+    def match(self, text: str) -> list[tuple[int, float]]:
+        """Все продукты, содержащие каждый токен запроса, по убыванию BM25 (при равенстве — по ID).
+
+        Семантика совпадает с websearch_to_tsquery('simple', ...) без операторов: используется как замена
+        полнотекстового поиска PostgreSQL на других СУБД.
+        """
+        query_terms = set(tokenize(text))
+        with self._lock:
+            if not query_terms or any(term not in self._postings for term in query_terms):
+                return []
+            candidates = set.intersection(*(set(self._postings[term]) for term in query_terms))
+            scores = self._bm25(query_terms, candidates)
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def similar(self, product_id: int, text: str = "", limit: int = 5) -> list[tuple[int, float]]:
+        """Ищет продукты, похожие на указанный, по уже проиндексированным токенам продукта.
+
+        Если продукта еще нет в индексе, используется переданный текст.
+        """
+        terms = self._doc_terms.get(product_id) or Counter(tokenize(text))
+        return self._score(terms, limit, product_id)
+
+    def _score(self, query_terms: Counter, limit: int, exclude_id: int | None) -> list[tuple[int, float]]:
+        with self._lock:
+            if not self._doc_terms or not query_terms:
+                return []
+
+            total_docs = len(self._doc_terms)
+            avg_length = self._total_length / total_docs
+            weighted_terms = [
+                (term, self._idf(len(self._postings[term]), total_docs))
+                for term in query_terms
+                if term in self._postings
+            ]
+            # Для длинных описаний оставляем только самые редкие (информативные) токены
+            weighted_terms = heapq.nlargest(self.max_query_terms, weighted_terms, key=lambda item: item[1])
+
+            scores: dict[int, float] = {}
+            for term, idf in weighted_terms:
+                for product_id, frequency in self._postings[term].items():
+                    if product_id == exclude_id:
+                        continue
+                    scores[product_id] = scores.get(product_id, 0.0) + self._term_score(
+                        idf, frequency, product_id, avg_length
+                    )
+
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    def _bm25(self, terms: Iterable[str], product_ids: set[int]) -> dict[int, float]:
+        total_docs = len(self._doc_terms)
+        avg_length = self._total_length / total_docs
+        scores = dict.fromkeys(product_ids, 0.0)
+        for term in terms:
+            postings = self._postings[term]
+            idf = self._idf(len(postings), total_docs)
+            for product_id in product_ids:
+                scores[product_id] += self._term_score(idf, postings[product_id], product_id, avg_length)
+        return scores
+
+    def _term_score(self, idf: float, frequency: int, product_id: int, avg_length: float) -> float:
+        norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[product_id] / avg_length)
+        return idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+    @staticmethod
+    def _idf(document_frequency: int, total_docs: int) -> float:
+        return math.log((total_docs - document_frequency + 0.5) / (document_frequency + 0.5) + 1)
+
+    def _add(self, product_id: int, text: str) -> None:
+        terms = Counter(tokenize(text))
+        self._doc_terms[product_id] = terms
+        length = sum(terms.values())
+        self._doc_lengths[product_id] = length
+        self._total_length += length
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[product_id] = frequency
+
+    def _remove(self, product_id: int) -> None:
+        terms = self._doc_terms.pop(product_id, None)
+        if terms is None:
+            return
+        self._total_length -= self._doc_lengths.pop(product_id)
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(product_id, None)
+            if not postings:
+                del self._postings[term]
+
+
+# Индекс рекомендаций (и поиска вне PostgreSQL) текущего процесса
+PRODUCT_INDEX = ProductIndex()
@@ -0,0 +1,37 @@
+"""Считает похожие продукты для всего каталога и сохраняет их для эндпоинта рекомендаций.
+
+Запуск (например, по расписанию): python -m src.commands.build_recommendations --top-n 10
+Воркеры загружают файл при старте (SETTINGS.recommendations_path).
+"""
+
+import argparse
+
+from src.application.logger import logger
+from src.config import SETTINGS
+from src.database import SessionLocal
+from src.models import ReviewModel
+from src.repositories import ProductRepository, ReviewRepository
+from src.services.product import ProductService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--top-n", type=int, default=SETTINGS.recommendations_top_n)
+    parser.add_argument("--block-size", type=int, default=128)
+    parser.add_argument("--output", default=SETTINGS.recommendations_path)
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        review_repository = ReviewRepository(session=session, review_model=ReviewModel)
+        service = ProductService(ProductRepository(session), review_repository)
+        related = service.build_related_products(top_n=args.top_n, block_size=args.block_size)
+    finally:
+        session.close()
+
+    related.save(args.output)
+    logger.info(f"Похожие продукты сохранены в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
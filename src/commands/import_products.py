@@ -0,0 +1,41 @@
+"""Импортирует продукты из CSV или JSONL пачками с upsert по handle.
+
+Запуск: python -m src.commands.import_products feed.csv --batch-size 1000
+CSV: заголовок handle,title,description,price,category_id,sizes,colors,tags,image_url,images,available_for_sale
+(списки — через "|"); JSONL: объекты с теми же ключами, options может быть объектом {"Size": [...], "Color": [...]}.
+"""
+
+import argparse
+import json
+
+from src.application.logger import logger
+from src.database import SessionLocal
+from src.models import ReviewModel
+from src.repositories import ProductAdapter, ProductRepository, ReviewRepository
+from src.services.product_import import IMPORT_FORMATS, ProductImporter, detect_format, read_records
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="по умолчанию определяется по расширению файла")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        review_repository = ReviewRepository(session=session, review_model=ReviewModel)
+        adapter = ProductAdapter(ProductRepository(session), review_repository)
+        with open(args.path, encoding="utf-8", newline="") as stream:
+            records = read_records(stream, args.format or detect_format(args.path))
+            report = ProductImporter(session, adapter, batch_size=args.batch_size).run(records)
+    finally:
+        session.close()
+
+    for error in report.errors:
+        logger.warning(f"Строка {error['line']}: {error['error']}")
+    logger.info(f"Отчет импорта: {json.dumps(report.as_dict(max_errors=0), ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
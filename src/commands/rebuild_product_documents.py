@@ -0,0 +1,34 @@
+"""Пересобирает сохраненные карточки продуктов (ProductModel.document).
+
+Запуск после изменения формата карточки (DOCUMENT_VERSION) или миграции:
+python -m src.commands.rebuild_product_documents [--all] [--batch-size 500]
+Без --all пересобираются только отсутствующие и устаревшие документы.
+"""
+
+import argparse
+
+from src.application.logger import logger
+from src.database import SessionLocal
+from src.models import ReviewModel
+from src.repositories import ProductRepository, ReviewRepository
+from src.services.product import ProductService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--all", action="store_true", help="пересобрать документы всех продуктов")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        review_repository = ReviewRepository(session=session, review_model=ReviewModel)
+        service = ProductService(ProductRepository(session), review_repository)
+        rebuilt = service.rebuild_documents(batch_size=args.batch_size, force=args.all)
+        logger.info(f"Карточки продуктов пересобраны: {rebuilt}")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""Пересчитывает сохраненную сводку оценок (rating_sum, rating_count) всех продуктов.
+
+Запуск: python -m src.commands.rebuild_ratings
+"""
+
+from src.application.logger import logger
+from src.database import SessionLocal
+from src.models import ReviewModel
+from src.repositories import ReviewRepository
+
+
+def main() -> None:
+    session = SessionLocal()
+    try:
+        updated = ReviewRepository(session=session, review_model=ReviewModel).rebuild_rating_summary()
+        logger.info(f"Сводка оценок пересчитана для {updated} продуктов")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -15,10 +15,28 @@ class Settings(BaseSettings):
     db_name: str
     db_user: str
     db_password: str
+    # Асинхронный стек (asyncpg + AsyncSession) для части эндпоинтов; выключен по умолчанию
+    db_async: bool = False
+
+    # Пул соединений (на каждый воркер uvicorn и отдельно для синхронного и асинхронного движков)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0  # секунд ожидания свободного соединения
+    db_pool_recycle: int = 1800  # секунд жизни соединения, -1 — без ограничения
+    db_pool_pre_ping: bool = True
+    db_statement_timeout: int = 0  # мс, 0 — без ограничения
 
     # Секретный ключ сайта
     secret_key: str
 
+    # Заранее посчитанные похожие продукты (python -m src.commands.build_recommendations)
+    recommendations_path: str = "data/recommendations.npz"
+    recommendations_top_n: int = 10
+
+    # Кэш карточек продуктов в памяти воркера
+    product_cache_size: int = 1024
+    product_cache_ttl: float = 300.0
+
     model_config = SettingsConfigDict(
         env_file=".env.production" if "production" in str(__file__) else ".env",
         env_file_encoding="utf-8",
@@ -28,6 +46,9 @@ class Settings(BaseSettings):
     def postgres_url(self) -> str:
         return f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
 
+    def async_postgres_url(self) -> str:
+        return f"postgresql+asyncpg://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
+
     @property
     def is_production(self) -> bool:
         return self.environment.lower() == "production"
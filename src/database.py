@@ -1,10 +1,23 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
 
+from src.application.utils.pool_metrics import PoolMetrics
 from src.config import Settings
 
 # Import all models to ensure they are registered with Base
-from src.models import cart, cart_product, category, order, order_product, product, review, user  # noqa: F401
+from src.models import (  # noqa: F401
+    cart,
+    cart_product,
+    category,
+    order,
+    order_product,
+    product,
+    product_variant,
+    review,
+    user,
+)
 from src.models.base import Base
 
 # Загружаем настройки
@@ -13,12 +26,53 @@ settings = Settings()
 # Создаем URL для подключения к базе данных
 DATABASE_URL = settings.postgres_url()
 
+# Метрики пулов соединений текущего воркера (GET /api/metrics/pool)
+POOL_METRICS = {"sync": PoolMetrics("sync")}
+
+
+def pool_options(pool_class: type[Pool], metrics: PoolMetrics) -> dict:
+    """Параметры пула соединений из настроек."""
+    return {
+        "poolclass": metrics.pool_class(pool_class),
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def statement_timeout_args(is_async: bool = False) -> dict:
+    """Передает statement_timeout серверу при подключении (psycopg2 и asyncpg задают его по-разному)."""
+    if settings.db_statement_timeout <= 0:
+        return {}
+    if is_async:
+        return {"server_settings": {"statement_timeout": str(settings.db_statement_timeout)}}
+    return {"options": f"-c statement_timeout={settings.db_statement_timeout}"}
+
+
 # Создаем движок (engine)
-engine = create_engine(DATABASE_URL)
+engine = create_engine(
+    DATABASE_URL, connect_args=statement_timeout_args(), **pool_options(QueuePool, POOL_METRICS["sync"])
+)
+POOL_METRICS["sync"].instrument(engine)
 
 # Создаем фабрику сессий
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Асинхронный движок создается только при включенном db_async, чтобы не требовать asyncpg без необходимости
+async_engine = None
+AsyncSessionLocal = None
+if settings.db_async:
+    POOL_METRICS["async"] = PoolMetrics("async")
+    async_engine = create_async_engine(
+        settings.async_postgres_url(),
+        connect_args=statement_timeout_args(is_async=True),
+        **pool_options(AsyncAdaptedQueuePool, POOL_METRICS["async"]),
+    )
+    POOL_METRICS["async"].instrument(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 
 def create_tables():
     """Create all database tables."""
@@ -32,3 +86,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Асинхронная сессия для эндпоинтов на async def
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
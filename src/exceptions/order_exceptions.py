@@ -13,3 +13,9 @@ class OrderNotFoundException(OrderException):
     """Заказ не найден"""
     def __init__(self, order_id: int):
         super().__init__(f"Заказ с ID {order_id} не найден")
+
+
+class MixedCurrencyOrderException(OrderException):
+    """Позиции заказа в разных валютах"""
+    def __init__(self, currency_codes: set[str]):
+        super().__init__(f"Невозможно создать заказ: позиции в разных валютах ({', '.join(sorted(currency_codes))})")
@@ -0,0 +1,4 @@
+class InvalidCursorException(ValueError):
+    """Некорректный курсор пагинации"""
+    def __init__(self, cursor: str):
+        super().__init__(f"Некорректный курсор пагинации: {cursor}")
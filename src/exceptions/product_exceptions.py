@@ -25,3 +25,13 @@ class RecommendationException(ProductException):
     """Ошибка при генерации рекомендаций."""
     def __init__(self, product_id: int):
         super().__init__(f"Не удалось получить рекомендации для продукта с ID {product_id}")
+
+
+class ProductImportException(ProductException):
+    """Импорт продуктов невозможен (например, неподдерживаемый формат файла)."""
+    pass
+
+
+class ProductImportRowException(ProductException):
+    """Некорректная запись в файле импорта; пропускается с сообщением в отчете."""
+    pass
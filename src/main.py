@@ -10,9 +10,22 @@ from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from src.application.logger import logger
-from src.application.routers import cart_router, order_router, product_router, user_router
+from src.application.routers import (
+    async_cart_router,
+    async_order_router,
+    async_product_router,
+    cart_router,
+    metrics_router,
+    order_router,
+    product_router,
+    user_router,
+)
 from src.config import SETTINGS
-from src.database import create_tables
+from src.database import SessionLocal, create_tables
+from src.models import ReviewModel
+from src.repositories import ProductRepository, ReviewRepository
+from src.services.product import ProductService
+from src.services.recommendation_matrix import load_related_products
 
 
 @asynccontextmanager
@@ -21,11 +34,24 @@ async def lifespan(_: FastAPI):
     # Startup
     create_tables()
     logger.info("Database tables created successfully")
+    build_product_index()
+    if load_related_products(SETTINGS.recommendations_path):
+        logger.info(f"Loaded precomputed recommendations from {SETTINGS.recommendations_path}")
     logger.info(f"Application starting in {SETTINGS.environment} mode")
     yield
     # Shutdown (if needed)
 
 
+def build_product_index() -> None:
+    """Build the in-memory recommendation index for this worker."""
+    session = SessionLocal()
+    try:
+        review_repository = ReviewRepository(session=session, review_model=ReviewModel)
+        ProductService(ProductRepository(session), review_repository).build_recommendation_index()
+    finally:
+        session.close()
+
+
 app = FastAPI(
     title="Web Site API",
     description="API for the web site application",
@@ -73,10 +99,16 @@ PUBLIC_DIR = BASE_DIR / "public"  # <--- src/public
 app.mount("/products", StaticFiles(directory=PUBLIC_DIR / "products"), name="products")
 
 # Подключение роутеров
+# Асинхронные маршруты регистрируются первыми и перекрывают синхронные с теми же путями
+if SETTINGS.db_async:
+    app.include_router(async_product_router, prefix="/api")
+    app.include_router(async_cart_router, prefix="/api")
+    app.include_router(async_order_router, prefix="/api")
 app.include_router(product_router, prefix="/api")
 app.include_router(user_router, prefix="/api")
 app.include_router(cart_router, prefix="/api")
 app.include_router(order_router, prefix="/api")
+app.include_router(metrics_router, prefix="/api")
 
 
 @app.exception_handler(Exception)
@@ -3,6 +3,7 @@ from .cart import CartModel
 from .order import OrderModel
 from .order_product import OrderProductModel
 from .product import ProductModel
+from .product_variant import ProductVariantModel
 from .category import CategoryModel
 from .user import UserModel
 from .review import ReviewModel
@@ -11,4 +12,4 @@ from .review import ReviewModel
 
 
 __all__ = ['CartProductModel', 'OrderModel', 'OrderProductModel', 'CartModel',
-'ProductModel', 'CategoryModel', 'UserModel', 'ReviewModel']
+'ProductModel', 'ProductVariantModel', 'CategoryModel', 'UserModel', 'ReviewModel']
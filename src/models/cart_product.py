@@ -1,4 +1,4 @@
-from sqlalchemy import JSON, Column, ForeignKey, Integer, String
+from sqlalchemy import JSON, Column, ForeignKey, Index, Integer, String, func, literal_column
 from sqlalchemy.orm import relationship
 
 from .base import AbstractBase
@@ -19,6 +19,19 @@ class CartProductModel(AbstractBase):
     cart_rel = relationship("CartModel", back_populates="cart_product_rel")
     product_rel = relationship("ProductModel")  # Добавляем связь с продуктом для удобства
 
+    # Одна позиция на товар и вариант: цель ON CONFLICT в CartProductRepository.add_statement.
+    # COALESCE, так как NULL в уникальном индексе не совпадают (NULLS NOT DISTINCT есть только с PostgreSQL 15).
+    # Выражение должно совпадать с целью ON CONFLICT буквально, поэтому '' — литерал, а не параметр
+    __table_args__ = (
+        Index(
+            "uq_carts_products_cart_id_product_id_variant_id",
+            cart_id,
+            product_id,
+            func.coalesce(variant_id, literal_column("''")),
+            unique=True,
+        ),
+    )
+
     def __str__(self):
         options = ", ".join(f"{k}:{v}" for k, v in (self.selected_options or {}).items())
         return f"Cart {self.cart_id}, Product {self.product_id}" + (f" ({options})" if options else "")
@@ -1,4 +1,4 @@
-from sqlalchemy import JSON, Boolean, Column, ForeignKey, Integer, String
+from sqlalchemy import JSON, Boolean, Column, ForeignKey, Index, Integer, Numeric, String
 from sqlalchemy.orm import relationship
 
 from .base import AbstractBase
@@ -14,10 +14,17 @@ class OrderModel(AbstractBase):
     shipping_address = Column(JSON, nullable=True)  # Shipping address as JSON
     payment_method = Column(String, nullable=True)  # Payment method (card, paypal, etc.)
 
+    # Сумма позиций (OrderProductModel.line_total), фиксируется при оформлении
+    total_amount = Column(Numeric(12, 2), nullable=False, default=0, server_default="0")
+    currency_code = Column(String(3), nullable=False, default="USD", server_default="USD")
+
     # Связи
     order_products = relationship("OrderProductModel", backref="order", cascade="all, delete-orphan")
     user = relationship("UserModel")  # Relationship to access user data
 
+    # История заказов пользователя: фильтр по user_id и keyset по id
+    __table_args__ = (Index("ix_orders_user_id_id", "user_id", "id"),)
+
     def __repr__(self):
         return f"OrderModel(id={self.id}, user_id={self.user_id}, payment={self.payment})"
 
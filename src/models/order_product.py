@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer
+from sqlalchemy import Column, ForeignKey, Integer, Numeric, String
 from sqlalchemy.orm import relationship
 
 from .base import AbstractBase
@@ -6,10 +6,17 @@ from .base import AbstractBase
 
 class OrderProductModel(AbstractBase):
     __tablename__ = "order_products"
-    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, index=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     quantity = Column(Integer, default=1)  # Добавим количество товаров
 
+    # Снимок позиции на момент оформления: заказ не зависит от последующих изменений продукта и цен
+    variant_id = Column(String)
+    title = Column(String)
+    unit_price = Column(Numeric(12, 2), nullable=False, default=0, server_default="0")
+    currency_code = Column(String(3), nullable=False, default="USD", server_default="USD")
+    line_total = Column(Numeric(12, 2), nullable=False, default=0, server_default="0")
+
     # Добавляем связь с продуктом
     product = relationship("ProductModel")
 
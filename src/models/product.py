@@ -1,7 +1,82 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Float, Boolean, JSON, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from decimal import Decimal
+from sqlalchemy import Column, Computed, String, Integer, Float, Boolean, JSON, DateTime, ForeignKey, Index, Numeric
+from sqlalchemy import Text, TypeDecorator, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import deferred, relationship, validates
+from sqlalchemy.schema import CreateColumn
 from .base import AbstractBase
+from .product_variant import ProductVariantModel, to_decimal
+
+# Выражение products.search_vector; конфигурация 'simple' совпадает с SEARCH_CONFIG в ProductRepository
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') "
+    "|| setweight(to_tsvector('simple', coalesce(description, '')), 'B') "
+    "|| setweight(json_to_tsvector('simple', coalesce(tags, '[]'::json), '[\"string\"]'), 'C')"
+)
+
+
+class SearchVector(TypeDecorator):
+    """tsvector на PostgreSQL; на остальных СУБД (тесты на SQLite) — обычная текстовая колонка"""
+
+    impl = Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(TSVECTOR())
+        return dialect.type_descriptor(Text())
+
+
+@compiles(CreateColumn)
+def _create_search_vector_column(element, compiler, **kw):
+    """Вне PostgreSQL search_vector создается без GENERATED: выражение использует функции полнотекстового поиска"""
+    column = element.element
+    if isinstance(column.type, SearchVector) and compiler.dialect.name != "postgresql":
+        return f"{compiler.preparer.format_column(column)} TEXT"
+    return compiler.visit_create_column(element, **kw)
+
+
+def _price_amount(price_range: dict | None, key: str) -> Decimal:
+    """Достает сумму из price_range (camelCase или старый snake_case формат)"""
+    price_range = price_range or {}
+    snake_key = "min_variant_price" if key == "minVariantPrice" else "max_variant_price"
+    price = price_range.get(key) or price_range.get(snake_key) or {}
+    return to_decimal(price.get("amount") if isinstance(price, dict) else price)
+
+
+def normalize_money(price) -> dict:
+    """Цена в формате MoneySchema ({"amount": str, "currencyCode": str}) из любого из сохранявшихся форматов"""
+    if isinstance(price, dict):
+        if "amount" not in price:
+            return {"amount": "0.00", "currencyCode": "USD"}
+        # Цена без валюты сохраняется с USD, сумма не теряется
+        currency_code = price.get("currencyCode", price.get("currency_code")) or "USD"
+        return {"amount": str(price["amount"]), "currencyCode": currency_code}
+    if isinstance(price, (int, float, str, Decimal)):
+        return {"amount": str(price), "currencyCode": "USD"}
+    return {"amount": "0.00", "currencyCode": "USD"}
+
+
+def normalize_price_range(price_range: dict | None) -> dict:
+    """price_range в camelCase с обеими границами (старый snake_case формат тоже поддерживается)"""
+    price_range = price_range or {}
+    return {
+        key: normalize_money(price_range.get(key) or price_range.get(snake_key) or "0.00")
+        for key, snake_key in (("minVariantPrice", "min_variant_price"), ("maxVariantPrice", "max_variant_price"))
+    }
+
+
+def normalize_variant(variant: dict, position: int = 0) -> dict:
+    """Вариант ровно с полями ProductVariantNodeSchema, цена — в формате MoneySchema"""
+    return {
+        "id": variant.get("id", f"variant-{position}"),
+        "availableForSale": variant.get("availableForSale", True),
+        "selectedOptions": variant.get("selectedOptions", []),
+        "price": normalize_money(variant.get("price", "0.00")),
+    }
+
 
 class ProductModel(AbstractBase):
     __tablename__ = 'products'
@@ -16,6 +91,9 @@ class ProductModel(AbstractBase):
     variants = Column(JSON, default=[])  # заменили size/color/delivery
     options = Column(JSON, default=[])  # новый параметр
     price_range = Column(JSON)  # заменили price
+    # Денормализованные цены из price_range для сортировки и фильтрации по индексу
+    min_price = Column(Numeric(12, 2), nullable=False, default=0, server_default="0")
+    max_price = Column(Numeric(12, 2), nullable=False, default=0, server_default="0", index=True)
     
     # Изображения
     featured_image = Column(JSON)  # заменили image
@@ -25,16 +103,80 @@ class ProductModel(AbstractBase):
     available_for_sale = Column(Boolean, default=True)  # новый параметр
     seo = Column(JSON)  # новый параметр
     tags = Column(JSON, default=[])  # новый параметр
+    # Полнотекстовый поиск (ProductRepository.search); вычисляется PostgreSQL, в ORM не загружается
+    search_vector = deferred(Column(SearchVector, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True)))
     
     # Связи (оставляем как было)
     category_id = Column(Integer, ForeignKey('categories.id'), nullable=False)
     rating = relationship("ReviewModel", backref="product", cascade="all, delete-orphan")
+    # Нормализованные варианты (строки product_variants), синхронизируются из variants
+    variants_rel = relationship(
+        "ProductVariantModel",
+        back_populates="product_rel",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="ProductVariantModel.id",
+    )
+
+    # Сводка оценок, поддерживается ReviewRepository при записи отзывов
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Готовая карточка продукта (ProductAdapter.render_document), пересобирается при каждой записи
+    document = Column(JSON)
+    document_version = Column(Integer)
     
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # новый параметр
 
+    __table_args__ = (
+        Index("ix_products_min_price_id", "min_price", "id"),
+        # Страницы категории: фильтр по category_id и keyset по ключу сортировки без сортировки в памяти
+        Index("ix_products_category_id_id", "category_id", "id"),
+        Index("ix_products_category_id_min_price_id", "category_id", "min_price", "id"),
+        # Индексы только для PostgreSQL: поиск по search_vector и фильтр по тегам (JsonContainsAll)
+        Index("ix_products_search_vector", "search_vector", postgresql_using="gin").ddl_if(dialect="postgresql"),
+        Index(
+            "ix_products_tags", text("(CAST(tags AS JSONB)) jsonb_path_ops"), postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+    )
+    # Не дочитывать вычисляемый search_vector через RETURNING после каждого INSERT
+    __mapper_args__ = {"eager_defaults": False}
+
     def __str__(self):
         return f"{self.title} ({self.id})"
     
     def __repr__(self):
         return f"ProductModel(id={self.id}, title='{self.title}', handle='{self.handle}')"
+
+    # Цены нормализуются при записи, поэтому ProductAdapter отдает price_range и variants без преобразований
+    @validates("price_range")
+    def _sync_price_columns(self, key, price_range):
+        price_range = normalize_price_range(price_range)
+        self.min_price = _price_amount(price_range, "minVariantPrice")
+        self.max_price = _price_amount(price_range, "maxVariantPrice")
+        return price_range
+
+    @validates("variants")
+    def _sync_variant_rows(self, key, variants):
+        variants = [normalize_variant(variant, i) for i, variant in enumerate(variants or [])]
+        rows = {row.variant_id: row for row in self.variants_rel}
+        self.variants_rel = [rows.get(variant["id"], ProductVariantModel()).apply(variant) for variant in variants]
+        return variants
+
+    @property
+    def average_rating(self) -> float:
+        """Средняя оценка по сохраненной сводке, без обращения к таблице reviews"""
+        if not self.rating_count:
+            return 0.0
+        return self.rating_sum / self.rating_count
+
+    @property
+    def variants_by_id(self) -> dict[str, ProductVariantModel]:
+        """Строки вариантов по variant_id; строится один раз на загруженную коллекцию variants_rel"""
+        rows = self.variants_rel
+        cached = getattr(self, "_variants_by_id", None)
+        if cached is None or cached[0] is not rows or len(cached[1]) != len(rows):
+            cached = (rows, {row.variant_id: row for row in rows})
+            self._variants_by_id = cached
+        return cached[1]
     
\ No newline at end of file
@@ -0,0 +1,76 @@
+from decimal import Decimal, InvalidOperation
+
+from sqlalchemy import JSON, Boolean, Column, ForeignKey, Index, Integer, Numeric, String, UniqueConstraint
+from sqlalchemy.orm import relationship
+
+from .base import AbstractBase
+
+
+class ProductVariantModel(AbstractBase):
+    """Вариант продукта. Строки синхронизируются с JSON ProductModel.variants при его изменении."""
+
+    __tablename__ = "product_variants"
+
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    variant_id = Column(String, nullable=False)  # ID варианта из JSON, например "variant-M-Blue"
+    selected_options = Column(JSON, default=[])  # [{"name": "Size", "value": "M"}, ...]
+    # Опции, по которым фильтруется каталог, вынесены в отдельные колонки
+    size = Column(String)
+    color = Column(String)
+    price = Column(Numeric(12, 2), nullable=False, default=0, server_default="0")
+    currency_code = Column(String(3), nullable=False, default="USD", server_default="USD")
+    available_for_sale = Column(Boolean, nullable=False, default=True, server_default="true")
+
+    product_rel = relationship("ProductModel", back_populates="variants_rel")
+
+    __table_args__ = (
+        UniqueConstraint("product_id", "variant_id", name="uq_product_variants_product_id_variant_id"),
+        Index("ix_product_variants_size_color", "size", "color", "product_id"),
+        Index("ix_product_variants_color", "color", "product_id"),
+        Index("ix_product_variants_price", "price"),
+    )
+
+    def __repr__(self):
+        return f"ProductVariantModel(product_id={self.product_id}, variant_id='{self.variant_id}', price={self.price})"
+
+    @property
+    def title(self) -> str:
+        return " / ".join(option["value"] for option in self.selected_options or [])
+
+    def apply(self, variant: dict) -> "ProductVariantModel":
+        """Заполняет колонки из варианта в формате JSON ProductModel.variants"""
+        for column, value in self.columns_from_variant(variant).items():
+            setattr(self, column, value)
+        return self
+
+    @staticmethod
+    def columns_from_variant(variant: dict) -> dict:
+        """Значения колонок строки из варианта в формате JSON ProductModel.variants"""
+        selected_options = variant.get("selectedOptions") or []
+        options = {option["name"].lower(): option["value"] for option in selected_options}
+        price = variant.get("price") or {}
+        return {
+            "variant_id": variant["id"],
+            "selected_options": selected_options,
+            "size": options.get("size"),
+            "color": options.get("color"),
+            "price": to_decimal(price.get("amount") if isinstance(price, dict) else price),
+            "currency_code": price.get("currencyCode", "USD") if isinstance(price, dict) else "USD",
+            "available_for_sale": variant.get("availableForSale", True),
+        }
+
+    def to_dict(self) -> dict:
+        """Вариант в формате JSON ProductModel.variants"""
+        return {
+            "id": self.variant_id,
+            "availableForSale": self.available_for_sale,
+            "selectedOptions": self.selected_options or [],
+            "price": {"amount": f"{self.price:.2f}", "currencyCode": self.currency_code},
+        }
+
+
+def to_decimal(value) -> Decimal:
+    try:
+        return Decimal(str(value)) if value is not None else Decimal(0)
+    except InvalidOperation:
+        return Decimal(0)
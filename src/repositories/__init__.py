@@ -1,12 +1,13 @@
-from .cart_product import CartProductRepository
+from .cart_product import CartOperation, CartProductRepository
 from .cart import CartRepository
 from .category import CategoryRepository
-from .order import OrderRepository
+from .order import OrderLine, OrderRepository, OrderSummary
 from .order_product import OrderProductRepository
 from .product import ProductRepository, ProductAdapter
-from .review import ReviewRepository
+from .review import ProductRating, ReviewRepository
 from .user import UserRepository
 
 
-__all__ = ['CartProductRepository', 'CartRepository', 'CategoryRepository', 'OrderProductRepository',
-'OrderRepository', 'ProductRepository', 'ReviewRepository', 'UserRepository', 'ProductAdapter']
+__all__ = ['CartOperation', 'CartProductRepository', 'CartRepository', 'CategoryRepository', 'OrderProductRepository',
+'OrderLine', 'OrderRepository', 'OrderSummary', 'ProductRepository', 'ReviewRepository', 'UserRepository',
+'ProductAdapter', 'ProductRating']
@@ -0,0 +1,9 @@
+from .cart_product import AsyncCartProductRepository
+from .cart import AsyncCartRepository
+from .order import AsyncOrderRepository
+from .product import AsyncProductRepository
+from .review import AsyncReviewRepository
+
+
+__all__ = ['AsyncCartProductRepository', 'AsyncCartRepository', 'AsyncOrderRepository',
+'AsyncProductRepository', 'AsyncReviewRepository']
@@ -0,0 +1,38 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.application.logger import logger
+from src.exceptions.carts import CartNotFoundException
+from src.models import CartModel
+from src.repositories.cart import CartRepository
+
+
+class AsyncCartRepository:
+    """Асинхронный вариант CartRepository. Позиции и продукты загружаются заранее (selectinload),
+    так как ленивая загрузка связей в AsyncSession недоступна."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_by_user_id(self, user_id: int) -> CartModel:
+        cart = await self.session.scalar(select(CartModel).where(CartModel.user_id == user_id))
+        if not cart:
+            logger.warning(f"Cart not found for user {user_id}")
+            raise CartNotFoundException(f"Cart not found for user {user_id}")
+        return cart
+
+    async def get_by_user_id_with_products(self, user_id: int) -> CartModel:
+        cart = await self.session.scalar(
+            CartRepository.with_products(select(CartModel).where(CartModel.user_id == user_id))
+        )
+        if not cart:
+            logger.warning(f"Cart not found for user {user_id}")
+            raise CartNotFoundException(f"Cart not found for user {user_id}")
+        return cart
+
+    async def get_cart_with_products(self, cart_id: int) -> CartModel:
+        cart = await self.session.scalar(CartRepository.with_products(select(CartModel).where(CartModel.id == cart_id)))
+        if not cart:
+            logger.warning(f"Cart not found with id {cart_id}")
+            raise CartNotFoundException(f"Cart not found with id {cart_id}")
+        return cart
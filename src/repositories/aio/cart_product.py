@@ -0,0 +1,85 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.application.logger import logger
+from src.exceptions.carts import (
+    CartProductAddException,
+    CartProductNotFoundException,
+    CartProductRemoveException,
+    CartProductUpdateException,
+)
+from src.models import CartProductModel
+from src.repositories.cart_product import CartOperation, CartProductRepository, CartTotals
+
+
+class AsyncCartProductRepository:
+    """Асинхронный вариант CartProductRepository (те же запросы без чтения позиции перед записью)"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add_product(self, cart_id: int, product_id: int, quantity: int, variant_id: str | None = None) -> int:
+        statement = CartProductRepository.add_statement(
+            self.session.bind.dialect.name, cart_id, product_id, quantity, variant_id
+        )
+        try:
+            line_id = await self.session.scalar(statement)
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Failed to add product {product_id} to cart: {str(e)}")
+            raise CartProductAddException(f"Failed to add product {product_id} to cart: {str(e)}")
+        logger.info(f"Added product {product_id} (x{quantity}) to cart {cart_id}")
+        return line_id
+
+    async def remove_product(self, cart_id: int, product_id: int, variant_id: str | None = None) -> int:
+        try:
+            line_id = await self.session.scalar(CartProductRepository.remove_statement(cart_id, product_id, variant_id))
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Failed to remove product {product_id} from cart: {str(e)}")
+            raise CartProductRemoveException(f"Failed to remove product {product_id} from cart: {str(e)}")
+
+        if line_id is None:
+            logger.warning(f"Product {product_id} not found in cart {cart_id}")
+            raise CartProductNotFoundException(f"Product {product_id} not found in cart")
+        logger.info(f"Removed product {product_id} from cart {cart_id}")
+        return line_id
+
+    async def change_quantity(self, cart_id: int, product_id: int, quantity: int, variant_id: str | None = None) -> int:
+        statement = CartProductRepository.change_quantity_statement(cart_id, product_id, quantity, variant_id)
+        try:
+            line_id = await self.session.scalar(statement)
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Failed to update quantity for product {product_id} in cart: {str(e)}")
+            raise CartProductUpdateException(f"Failed to update quantity for product {product_id} in cart: {str(e)}")
+
+        if line_id is None:
+            logger.warning(f"Product {product_id} not found in cart {cart_id}")
+            raise CartProductNotFoundException(f"Product {product_id} not found in cart")
+        logger.info(f"Updated quantity for product {product_id} in cart {cart_id}")
+        return line_id
+
+    async def apply_operations(self, cart_id: int, operations: list[CartOperation]) -> None:
+        statements = CartProductRepository.operations_statements(self.session.bind.dialect.name, cart_id, operations)
+        try:
+            for statement, operation in statements:
+                if not (await self.session.scalars(statement)).all() and operation is not None:
+                    raise CartProductNotFoundException(f"Product {operation.product_id} not found in cart")
+            await self.session.commit()
+        except CartProductNotFoundException:
+            await self.session.rollback()
+            raise
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Failed to apply cart operations to cart {cart_id}: {str(e)}")
+            raise CartProductUpdateException(f"Failed to apply cart operations: {str(e)}")
+        logger.info(f"Applied {len(operations)} cart operations to cart {cart_id}")
+
+    async def get_line(self, line_id: int) -> CartProductModel | None:
+        return await self.session.scalar(CartProductRepository.line_statement(line_id))
+
+    async def get_totals(self, cart_id: int) -> CartTotals:
+        return CartTotals(*(await self.session.execute(CartProductRepository.totals_statement(cart_id))).one())
@@ -0,0 +1,31 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from src.models import OrderModel
+from src.repositories.order import OrderRepository, OrderSummary
+
+
+class AsyncOrderRepository:
+    """Асинхронный вариант OrderRepository"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_order(self, order_id: int) -> OrderModel | None:
+        return await self.session.scalar(
+            self._with_products(select(OrderModel).where(OrderModel.id == order_id))
+        )
+
+    async def get_user_order_summaries(
+        self, user_id: int, count: int = 20, after: dict | None = None
+    ) -> tuple[list[OrderSummary], bool]:
+        rows = (await self.session.execute(OrderRepository.summaries_statement(user_id, count, after))).all()
+        return [OrderSummary(*row) for row in rows[:count]], len(rows) > count
+
+    @staticmethod
+    def _with_products(statement):
+        return statement.options(
+            selectinload(OrderModel.order_products),
+            selectinload(OrderModel.user),
+        )
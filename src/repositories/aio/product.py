@@ -0,0 +1,77 @@
+from datetime import datetime
+
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.exceptions.product_exceptions import NotFoundProductException
+from src.models import ProductModel
+from src.repositories.product import ProductRepository
+
+
+class AsyncProductRepository:
+    """Асинхронный вариант ProductRepository для чтения каталога (те же запросы, AsyncSession)"""
+
+    cursor_values = staticmethod(ProductRepository.cursor_values)
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self, product_id: int) -> ProductModel:
+        product = await self.session.get(ProductModel, product_id)
+        if not product:
+            raise NotFoundProductException(f"Product with ID={product_id} not found")
+        return product
+
+    async def get_updated_at(self, product_id: int) -> datetime | None:
+        row = (await self.session.execute(select(ProductModel.updated_at).where(ProductModel.id == product_id))).first()
+        if row is None:
+            raise NotFoundProductException(f"Product with ID={product_id} not found")
+        return row.updated_at
+
+    async def get_document_row(self, product_id: int) -> Row:
+        row = (await self.session.execute(ProductRepository.document_statement(product_id))).first()
+        if row is None:
+            raise NotFoundProductException(f"Product with ID={product_id} not found")
+        return row
+
+    async def get_page(
+        self,
+        count: int = 10,
+        page: int = 1,
+        after: dict | None = None,
+        category_id: int | None = None,
+        sort: str = "id",
+        min_price: float | None = None,
+        max_price: float | None = None,
+        size: str | None = None,
+        color: str | None = None,
+        in_stock: bool = False,
+        tags: list[str] | None = None,
+    ) -> tuple[list[ProductModel], bool]:
+        statement = ProductRepository.page_statement(
+            count,
+            page,
+            after,
+            category_id,
+            sort,
+            min_price,
+            max_price,
+            size=size,
+            color=color,
+            in_stock=in_stock,
+            tags=tags,
+        )
+        products = (await self.session.scalars(statement)).all()
+        return list(products[:count]), len(products) > count
+
+    async def get_by_category(
+        self, category_id: int, page: int = 1, count: int = 10, after: dict | None = None, sort: str = "id"
+    ) -> tuple[list[ProductModel], bool]:
+        return await self.get_page(count=count, page=page, after=after, category_id=category_id, sort=sort)
+
+    async def get_many(self, product_ids: list[int]) -> list[ProductModel]:
+        if not product_ids:
+            return []
+        rows = await self.session.scalars(select(ProductModel).where(ProductModel.id.in_(product_ids)))
+        products = {product.id: product for product in rows}
+        return [products[product_id] for product_id in product_ids if product_id in products]
@@ -0,0 +1,56 @@
+from collections.abc import Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.application.utils.cache import PRODUCT_CACHE
+from src.models import ReviewModel
+from src.repositories.review import ProductRating, ReviewRepository
+
+
+class AsyncReviewRepository:
+    """Асинхронный вариант ReviewRepository; сводка оценок продукта обновляется в той же транзакции"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_review_by_id(self, review_id: int) -> ReviewModel | None:
+        return await self.session.get(ReviewModel, review_id)
+
+    async def create_review(self, user_id: int, product_id: int, rating: int) -> ReviewModel:
+        review = ReviewModel(user_id=user_id, product_id=product_id, rating=rating)
+        self.session.add(review)
+        await self.session.execute(ReviewRepository.rating_delta_statement(product_id, rating, 1))
+        await self.session.commit()
+        PRODUCT_CACHE.invalidate(product_id)
+        await self.session.refresh(review)
+        return review
+
+    async def update_review(self, review_id: int, rating: int) -> ReviewModel | None:
+        review = await self.get_review_by_id(review_id)
+        if not review:
+            return None
+        product_id = review.product_id
+        await self.session.execute(ReviewRepository.rating_delta_statement(product_id, rating - review.rating, 0))
+        review.rating = rating
+        await self.session.commit()
+        PRODUCT_CACHE.invalidate(product_id)
+        await self.session.refresh(review)
+        return review
+
+    async def delete_review(self, review_id: int) -> bool:
+        review = await self.get_review_by_id(review_id)
+        if not review:
+            return False
+        product_id = review.product_id
+        await self.session.execute(ReviewRepository.rating_delta_statement(product_id, -review.rating, -1))
+        await self.session.delete(review)
+        await self.session.commit()
+        PRODUCT_CACHE.invalidate(product_id)
+        return True
+
+    async def get_ratings(self, product_ids: Iterable[int]) -> dict[int, ProductRating]:
+        ids = set(product_ids)
+        if not ids:
+            return {}
+        rows = await self.session.execute(ReviewRepository.ratings_statement(ids))
+        return ReviewRepository.ratings_from_rows(ids, rows)
@@ -1,8 +1,9 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session, selectinload
 
 from src.application.logger import logger
 from src.exceptions.carts import CartNotFoundException
-from src.models import CartModel
+from src.models import CartModel, CartProductModel, ProductModel
 
 
 class CartRepository:
@@ -35,3 +36,27 @@ class CartRepository:
             logger.warning(f"Cart not found with id {cart_id}")
             raise CartNotFoundException(f"Cart not found with id {cart_id}")
         return cart
+
+    def get_cart_with_products(self, cart_id: int) -> CartModel:
+        """Корзина с позициями, продуктами и их вариантами: четыре запроса независимо от числа позиций"""
+        cart = self.session.scalar(self.with_products(select(CartModel).where(CartModel.id == cart_id)))
+        if not cart:
+            logger.warning(f"Cart not found with id {cart_id}")
+            raise CartNotFoundException(f"Cart not found with id {cart_id}")
+        return cart
+
+    def get_by_user_id_with_products(self, user_id: int) -> CartModel:
+        cart = self.session.scalar(self.with_products(select(CartModel).where(CartModel.user_id == user_id)))
+        if not cart:
+            logger.warning(f"Cart not found for user {user_id}")
+            raise CartNotFoundException(f"Cart not found for user {user_id}")
+        return cart
+
+    @staticmethod
+    def with_products(statement: Select) -> Select:
+        # populate_existing перечитывает позиции, даже если корзина уже есть в identity map сессии
+        return statement.options(
+            selectinload(CartModel.cart_product_rel)
+            .selectinload(CartProductModel.product_rel)
+            .selectinload(ProductModel.variants_rel)
+        ).execution_options(populate_existing=True)
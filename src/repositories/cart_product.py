@@ -1,4 +1,12 @@
-from sqlalchemy.orm import Session
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from decimal import Decimal
+from itertools import groupby
+from typing import Literal, NamedTuple
+
+from sqlalchemy import Delete, Executable, Insert, Select, Update, delete, func, literal_column, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, joinedload
 
 from src.application.logger import logger
 
@@ -8,68 +16,72 @@ from ..exceptions.carts import (
     CartProductRemoveException,
     CartProductUpdateException,
 )
-from ..models import CartProductModel
+from ..models import CartProductModel, ProductModel, ProductVariantModel
 
 
-class CartProductRepository:
-    def __init__(self, session: Session):
-        self.session = session
+# Наибольшее количество в позиции (как le=100 в схемах корзины): добавления сверх него обрезаются
+MAX_LINE_QUANTITY = 100
 
-    def add_product(
-        self, cart_id: int, product_id: int, quantity: int, variant_id: str | None = None
-    ) -> CartProductModel:
-        try:
-            # Ищем такой же товар с таким же вариантом в корзине
-            query = self.session.query(CartProductModel).filter(
-                CartProductModel.cart_id == cart_id, CartProductModel.product_id == product_id
-            )
 
-            if variant_id:
-                query = query.filter(CartProductModel.variant_id == variant_id)
+class CartTotals(NamedTuple):
+    total_items: int
+    total_price: Decimal
 
-            cart_product = query.first()
 
-            if cart_product:
-                cart_product.quantity += quantity
-                logger.info(f"Updated quantity for product {product_id} in cart {cart_id}")
-            else:
-                cart_product = CartProductModel(
-                    cart_id=cart_id, product_id=product_id, quantity=quantity, variant_id=variant_id
-                )
-                self.session.add(cart_product)
-                logger.info(f"Added product {product_id} to cart {cart_id}")
+class CartOperation(NamedTuple):
+    """Операция пакетного изменения корзины"""
 
-            self.session.commit()
-            return cart_product
-        except Exception as e:
-            logger.error(f"Failed to add product {product_id} to cart: {str(e)}")
-            raise CartProductAddException(f"Failed to add product {product_id} to cart: {str(e)}")
+    action: Literal["add", "update", "remove"]
+    product_id: int
+    variant_id: str | None = None
+    quantity: int = 1
 
-    def remove_product(self, cart_id: int, product_id: int, variant_id: str | None = None) -> None:
-        try:
-            query = self.session.query(CartProductModel).filter(
-                CartProductModel.cart_id == cart_id, CartProductModel.product_id == product_id
-            )
 
-            if variant_id:
-                query = query.filter(CartProductModel.variant_id == variant_id)
+class CartProductRepository:
+    """Позиции корзины. Изменения выполняются одним запросом (upsert, UPDATE/DELETE ... RETURNING),
+    без чтения позиции перед записью: одновременные добавления одного товара не теряют количество.
+
+    Позиция однозначно определяется (cart_id, product_id, variant_id); уникальный индекс
+    uq_carts_products_cart_id_product_id_variant_id строится по COALESCE(variant_id, ''),
+    чтобы позиции без варианта тоже не дублировались.
+    """
 
-            cart_product = query.first()
+    def __init__(self, session: Session):
+        self.session = session
 
-            if not cart_product:
-                logger.warning(f"Product {product_id} not found in cart {cart_id}")
-                raise CartProductNotFoundException(f"Product {product_id} not found in cart")
+    def add_product(self, cart_id: int, product_id: int, quantity: int, variant_id: str | None = None) -> int:
+        """Добавляет товар или увеличивает количество позиции с тем же вариантом; возвращает ID позиции.
 
-            self.session.delete(cart_product)
+        Без variant_id товар попадает в позицию без варианта, а не в уже добавленную позицию с вариантом;
+        change_quantity и remove_product без variant_id меняют эту же позицию.
+        """
+        dialect = self.session.get_bind().dialect.name
+        try:
+            line_id = self.session.scalar(self.add_statement(dialect, cart_id, product_id, quantity, variant_id))
             self.session.commit()
-            logger.info(f"Removed product {product_id} from cart {cart_id}")
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Failed to add product {product_id} to cart: {str(e)}")
+            raise CartProductAddException(f"Failed to add product {product_id} to cart: {str(e)}")
+        logger.info(f"Added product {product_id} (x{quantity}) to cart {cart_id}")
+        return line_id
 
-        except CartProductNotFoundException:
-            raise
+    def remove_product(self, cart_id: int, product_id: int, variant_id: str | None = None) -> int:
+        """Удаляет позицию; возвращает ID удаленной позиции"""
+        try:
+            line_id = self.session.scalar(self.remove_statement(cart_id, product_id, variant_id))
+            self.session.commit()
         except Exception as e:
+            self.session.rollback()
             logger.error(f"Failed to remove product {product_id} from cart: {str(e)}")
             raise CartProductRemoveException(f"Failed to remove product {product_id} from cart: {str(e)}")
 
+        if line_id is None:
+            logger.warning(f"Product {product_id} not found in cart {cart_id}")
+            raise CartProductNotFoundException(f"Product {product_id} not found in cart")
+        logger.info(f"Removed product {product_id} from cart {cart_id}")
+        return line_id
+
     def get_products_in_cart(self, cart_id: int) -> list[CartProductModel]:
         try:
             products = self.session.query(CartProductModel).filter(CartProductModel.cart_id == cart_id).all()
@@ -78,30 +90,175 @@ class CartProductRepository:
             logger.error(f"Failed to get products from cart {cart_id}: {str(e)}")
             raise CartProductNotFoundException(f"Failed to get products from cart {cart_id}: {str(e)}")
 
-    def change_quantity(
-        self, cart_id: int, product_id: int, quantity: int, variant_id: str | None = None
-    ) -> CartProductModel:
+    def change_quantity(self, cart_id: int, product_id: int, quantity: int, variant_id: str | None = None) -> int:
+        """Устанавливает количество позиции; возвращает ID позиции"""
         try:
-            query = self.session.query(CartProductModel).filter(
-                CartProductModel.cart_id == cart_id, CartProductModel.product_id == product_id
-            )
-
-            if variant_id:
-                query = query.filter(CartProductModel.variant_id == variant_id)
-
-            cart_product = query.first()
+            line_id = self.session.scalar(self.change_quantity_statement(cart_id, product_id, quantity, variant_id))
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Failed to update quantity for product {product_id} in cart: {str(e)}")
+            raise CartProductUpdateException(f"Failed to update quantity for product {product_id} in cart: {str(e)}")
 
-            if not cart_product:
-                logger.warning(f"Product {product_id} not found in cart {cart_id}")
-                raise CartProductNotFoundException(f"Product {product_id} not found in cart")
+        if line_id is None:
+            logger.warning(f"Product {product_id} not found in cart {cart_id}")
+            raise CartProductNotFoundException(f"Product {product_id} not found in cart")
+        logger.info(f"Updated quantity for product {product_id} in cart {cart_id}")
+        return line_id
 
-            cart_product.quantity = quantity
+    def apply_operations(self, cart_id: int, operations: list[CartOperation]) -> None:
+        """Применяет операции по порядку в одной транзакции; при ошибке корзина не меняется"""
+        dialect = self.session.get_bind().dialect.name
+        try:
+            for statement, operation in self.operations_statements(dialect, cart_id, operations):
+                if not self.session.scalars(statement).all() and operation is not None:
+                    raise CartProductNotFoundException(f"Product {operation.product_id} not found in cart")
             self.session.commit()
-            logger.info(f"Updated quantity for product {product_id} in cart {cart_id}")
-            return cart_product
-
         except CartProductNotFoundException:
+            self.session.rollback()
             raise
         except Exception as e:
-            logger.error(f"Failed to update quantity for product {product_id} in cart: {str(e)}")
-            raise CartProductUpdateException(f"Failed to update quantity for product {product_id} in cart: {str(e)}")
+            self.session.rollback()
+            logger.error(f"Failed to apply cart operations to cart {cart_id}: {str(e)}")
+            raise CartProductUpdateException(f"Failed to apply cart operations: {str(e)}")
+        logger.info(f"Applied {len(operations)} cart operations to cart {cart_id}")
+
+    def get_line(self, line_id: int) -> CartProductModel | None:
+        """Позиция с продуктом и вариантами для сериализации"""
+        return self.session.scalar(self.line_statement(line_id))
+
+    def get_totals(self, cart_id: int) -> CartTotals:
+        return CartTotals(*self.session.execute(self.totals_statement(cart_id)).one())
+
+    @classmethod
+    def add_statement(
+        cls, dialect: str, cart_id: int, product_id: int, quantity: int, variant_id: str | None
+    ) -> Insert:
+        """INSERT ... ON CONFLICT DO UPDATE SET quantity = least(quantity + :quantity, 100) RETURNING id"""
+        return cls.add_lines_statement(dialect, cart_id, [CartOperation("add", product_id, variant_id, quantity)])
+
+    @staticmethod
+    def add_lines_statement(dialect: str, cart_id: int, lines: Iterable[CartOperation]) -> Insert:
+        """Многострочный upsert: позиции с одинаковым товаром и вариантом заранее объединяются,
+        так как ON CONFLICT не может обновить одну строку дважды за запрос"""
+        merged: dict[tuple[int, str], CartOperation] = {}
+        for line in lines:
+            key = (line.product_id, line.variant_id or "")
+            previous = merged.get(key)
+            merged[key] = previous._replace(quantity=previous.quantity + line.quantity) if previous else line
+
+        if dialect == "postgresql":
+            insert, least = postgresql.insert, func.least
+        elif dialect == "sqlite":
+            insert, least = sqlite.insert, func.min  # в SQLite min с несколькими аргументами — скалярная функция
+        else:
+            raise CartProductAddException(f"Upsert не поддерживается для {dialect}")
+
+        table = CartProductModel.__table__
+        now = datetime.utcnow()
+        statement = insert(table).values(
+            [
+                {
+                    "cart_id": cart_id,
+                    "product_id": line.product_id,
+                    "variant_id": line.variant_id,
+                    "quantity": min(line.quantity, MAX_LINE_QUANTITY),
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for line in merged.values()
+            ]
+        )
+        return statement.on_conflict_do_update(
+            index_elements=[
+                table.c.cart_id,
+                table.c.product_id,
+                func.coalesce(table.c.variant_id, literal_column("''")),
+            ],
+            set_={
+                "quantity": least(table.c.quantity + statement.excluded.quantity, MAX_LINE_QUANTITY),
+                "updated_at": now,
+            },
+        ).returning(table.c.id)
+
+    @classmethod
+    def change_quantity_statement(cls, cart_id: int, product_id: int, quantity: int, variant_id: str | None) -> Update:
+        return (
+            update(CartProductModel)
+            .where(cls._line_condition(cart_id, product_id, variant_id))
+            .values(quantity=quantity, updated_at=datetime.utcnow())
+            .returning(CartProductModel.id)
+        )
+
+    @classmethod
+    def remove_statement(cls, cart_id: int, product_id: int, variant_id: str | None) -> Delete:
+        return (
+            delete(CartProductModel)
+            .where(cls._line_condition(cart_id, product_id, variant_id))
+            .returning(CartProductModel.id)
+        )
+
+    @classmethod
+    def operations_statements(
+        cls, dialect: str, cart_id: int, operations: Iterable[CartOperation]
+    ) -> Iterator[tuple[Executable, CartOperation | None]]:
+        """Запросы пакета операций с сохранением порядка.
+
+        Подряд идущие добавления выполняются одним многострочным upsert; update и remove — отдельными
+        UPDATE/DELETE ... RETURNING, вместе с ними возвращается операция, чтобы сообщить об отсутствующей позиции.
+        """
+        for action, group in groupby(operations, key=lambda operation: operation.action):
+            if action == "add":
+                yield cls.add_lines_statement(dialect, cart_id, group), None
+                continue
+            for operation in group:
+                if action == "update":
+                    statement = cls.change_quantity_statement(
+                        cart_id, operation.product_id, operation.quantity, operation.variant_id
+                    )
+                else:
+                    statement = cls.remove_statement(cart_id, operation.product_id, operation.variant_id)
+                yield statement, operation
+
+    @staticmethod
+    def _line_condition(cart_id: int, product_id: int, variant_id: str | None):
+        """Позиция по тому же ключу, что и upsert в add_lines_statement: без variant_id — позиция без варианта"""
+        return (
+            (CartProductModel.cart_id == cart_id)
+            & (CartProductModel.product_id == product_id)
+            & (func.coalesce(CartProductModel.variant_id, literal_column("''")) == (variant_id or ""))
+        )
+
+    @staticmethod
+    def line_statement(line_id: int) -> Select:
+        return (
+            select(CartProductModel)
+            .where(CartProductModel.id == line_id)
+            .options(joinedload(CartProductModel.product_rel).selectinload(ProductModel.variants_rel))
+        )
+
+    @staticmethod
+    def totals_statement(cart_id: int) -> Select:
+        """Число позиций и стоимость корзины одним агрегатом.
+
+        Цена — как в CartProductService: выбранный вариант, иначе первый вариант продукта, иначе 0.
+        """
+        selected = ProductVariantModel.__table__.alias("selected")
+        first_price = (
+            select(ProductVariantModel.price)
+            .where(ProductVariantModel.product_id == CartProductModel.product_id)
+            .order_by(ProductVariantModel.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        price = func.coalesce(selected.c.price, first_price, 0)
+        return (
+            select(func.count(CartProductModel.id), func.coalesce(func.sum(price * CartProductModel.quantity), 0))
+            .select_from(CartProductModel)
+            .outerjoin(
+                selected,
+                (selected.c.product_id == CartProductModel.product_id)
+                & (selected.c.variant_id == CartProductModel.variant_id),
+            )
+            .where(CartProductModel.cart_id == cart_id)
+        )
@@ -1,8 +1,42 @@
-from sqlalchemy.orm import Session, joinedload
+from datetime import datetime
+from decimal import Decimal
+from typing import NamedTuple
 
+from sqlalchemy import Select, func, insert, select
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from src.application.logger import logger
+from src.exceptions.order_exceptions import MixedCurrencyOrderException
+from src.exceptions.pagination_exceptions import InvalidCursorException
 from src.models import OrderModel, OrderProductModel
 
 
+class OrderLine(NamedTuple):
+    """Позиция оформляемого заказа с ценой, зафиксированной на момент оформления"""
+
+    product_id: int
+    quantity: int = 1
+    variant_id: str | None = None
+    title: str | None = None
+    unit_price: Decimal = Decimal(0)
+    currency_code: str = "USD"
+
+    @property
+    def line_total(self) -> Decimal:
+        return self.unit_price * self.quantity
+
+
+class OrderSummary(NamedTuple):
+    """Строка истории заказов: поля заказа и число позиций, без самих позиций"""
+
+    id: int
+    created_at: datetime | None
+    payment: bool
+    total_amount: Decimal
+    currency_code: str
+    item_count: int
+
+
 class OrderRepository:
     def __init__(self, order_model: OrderModel, session: Session):
         self.order_model = order_model
@@ -28,29 +62,111 @@ class OrderRepository:
         self.session.refresh(order)
         return order
 
+    def create_order_with_products(
+        self,
+        user_id: int,
+        lines: list[OrderLine],
+        email: str | None = None,
+        shipping_address: dict | None = None,
+        payment_method: str | None = None,
+    ) -> OrderModel:
+        """Создает заказ вместе с позициями в одной транзакции.
+
+        Позиции вставляются одним INSERT ... RETURNING на все строки; при ошибке не остается ни заказа,
+        ни части позиций. Цены позиций и сумма заказа сохраняются вместе с ними.
+        Все позиции должны быть в одной валюте (иначе MixedCurrencyOrderException).
+        Возвращает заказ с загруженными позициями.
+        """
+        currency_codes = {line.currency_code for line in lines}
+        if len(currency_codes) > 1:
+            raise MixedCurrencyOrderException(currency_codes)
+
+        order = self.order_model(
+            user_id=user_id,
+            payment=False,
+            email=email,
+            shipping_address=shipping_address,
+            payment_method=payment_method,
+            total_amount=sum((line.line_total for line in lines), Decimal(0)),
+            currency_code=lines[0].currency_code if lines else "USD",
+        )
+        try:
+            self.session.add(order)
+            self.session.flush()
+            order_product_ids = self.session.scalars(
+                insert(OrderProductModel.__table__).returning(OrderProductModel.id),
+                [
+                    {
+                        "order_id": order.id,
+                        "product_id": line.product_id,
+                        "quantity": line.quantity,
+                        "variant_id": line.variant_id,
+                        "title": line.title,
+                        "unit_price": line.unit_price,
+                        "currency_code": line.currency_code,
+                        "line_total": line.line_total,
+                    }
+                    for line in lines
+                ],
+            ).all()
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        logger.debug(f"В заказ {order.id} добавлены позиции {order_product_ids}")
+        return self.get_order(order.id)
+
     def get_order(self, order_id: int) -> OrderModel | None:
-        """Получает заказ по ID с продуктами."""
+        """Получает заказ по ID с позициями (цены и названия сохранены в позициях, продукты не загружаются)."""
         return (
             self.session.query(self.order_model)
             .options(
-                joinedload(self.order_model.order_products).joinedload(OrderProductModel.product),
+                selectinload(self.order_model.order_products),
                 joinedload(self.order_model.user),
             )
             .filter(self.order_model.id == order_id)
             .first()
         )
 
-    def get_user_orders(self, user_id: int) -> list[OrderModel]:
-        """Получает все заказы пользователя с продуктами."""
-        return (
-            self.session.query(self.order_model)
-            .options(
-                joinedload(self.order_model.order_products).joinedload(OrderProductModel.product),
-                joinedload(self.order_model.user),
-            )
-            .filter(self.order_model.user_id == user_id)
-            .all()
+    def get_user_order_summaries(
+        self, user_id: int, count: int = 20, after: dict | None = None
+    ) -> tuple[list[OrderSummary], bool]:
+        """Страница истории заказов пользователя, от новых к старым; второй элемент — есть ли следующая"""
+        rows = self.session.execute(self.summaries_statement(user_id, count, after)).all()
+        return [OrderSummary(*row) for row in rows[:count]], len(rows) > count
+
+    @staticmethod
+    def summaries_statement(user_id: int, count: int = 20, after: dict | None = None) -> Select:
+        """Keyset-запрос истории заказов по индексу (user_id, id); число позиций считается в SQL"""
+        item_count = (
+            select(func.count(OrderProductModel.id))
+            .where(OrderProductModel.order_id == OrderModel.id)
+            .correlate(OrderModel)
+            .scalar_subquery()
         )
+        statement = select(
+            OrderModel.id,
+            OrderModel.created_at,
+            OrderModel.payment,
+            OrderModel.total_amount,
+            OrderModel.currency_code,
+            item_count,
+        ).where(OrderModel.user_id == user_id)
+        if after is not None:
+            statement = statement.where(OrderModel.id < OrderRepository._cursor_key(after))
+        # Лишняя запись показывает, есть ли следующая страница
+        return statement.order_by(OrderModel.id.desc()).limit(count + 1)
+
+    @staticmethod
+    def cursor_values(summary: OrderSummary) -> dict:
+        return {"id": summary.id}
+
+    @staticmethod
+    def _cursor_key(after: dict) -> int:
+        order_id = after.get("id")
+        if not isinstance(order_id, int):
+            raise InvalidCursorException(str(after))
+        return order_id
 
     def complete_order(self, order_id: int) -> OrderModel | None:
         """Завершает заказ (помечает как оплаченный)."""
@@ -1,11 +1,109 @@
+from collections.abc import Iterator
 from datetime import datetime
-
-from sqlalchemy import Float
+from decimal import Decimal, InvalidOperation
+from typing import NamedTuple
+
+import json
+
+from sqlalchemy import (
+    Boolean,
+    ColumnElement,
+    CompoundSelect,
+    Float,
+    Row,
+    Select,
+    String,
+    and_,
+    bindparam,
+    case,
+    cast,
+    func,
+    literal,
+    null,
+    or_,
+    select,
+    true,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
 
 from src.application.logger import logger
+from src.application.utils.cache import PRODUCT_CACHE
+from src.application.utils.pagination import encode_cursor, page_info
+from src.application.utils.product_index import PRODUCT_INDEX, highlight, product_text, tokenize
+from src.exceptions.pagination_exceptions import InvalidCursorException
 from src.exceptions.product_exceptions import NotFoundProductException
-from src.models import ProductModel
+from src.models import CategoryModel, ProductModel, ProductVariantModel
+from src.models.product import normalize_money, normalize_price_range
+
+# Версия формата ProductModel.document: увеличивается при изменении ProductAdapter.render_document,
+# после чего документы пересобираются командой src.commands.rebuild_product_documents
+DOCUMENT_VERSION = 1
+
+# Конфигурация полнотекстового поиска: без стемминга, как и запасной поиск по PRODUCT_INDEX.
+# Должна совпадать с выражением колонки ProductModel.search_vector (SEARCH_VECTOR_EXPRESSION)
+SEARCH_CONFIG = "simple"
+TITLE_HEADLINE_OPTIONS = "HighlightAll=true, StartSel=<mark>, StopSel=</mark>"
+DESCRIPTION_HEADLINE_OPTIONS = "MaxWords=35, MinWords=15, StartSel=<mark>, StopSel=</mark>"
+
+
+# Верхние границы корзин фасета цены (по min_price); последняя корзина — все, что дороже
+PRICE_FACET_BUCKETS = (25, 50, 100, 250, 500)
+
+
+class FacetValue(NamedTuple):
+    """Значение фасета и количество продуктов с ним при остальных выбранных фильтрах."""
+
+    value: str
+    label: str | None
+    count: int
+
+
+class JsonContainsAll(FunctionElement):
+    """JSON-массив column содержит все значения из JSON-массива values.
+
+    На PostgreSQL компилируется в CAST(column AS JSONB) @> values (GIN-индекс ix_products_tags),
+    на остальных СУБД — в проверку через json_each.
+    """
+
+    type = Boolean()
+    name = "json_contains_all"
+    inherit_cache = True
+
+
+@compiles(JsonContainsAll, "postgresql")
+def _json_contains_all_postgresql(element, compiler, **kw):
+    column, values = element.clauses
+    return f"CAST({compiler.process(column, **kw)} AS JSONB) @> CAST({compiler.process(values, **kw)} AS JSONB)"
+
+
+@compiles(JsonContainsAll)
+def _json_contains_all_default(element, compiler, **kw):
+    column, values = element.clauses
+    return (
+        f"NOT EXISTS (SELECT 1 FROM json_each({compiler.process(values, **kw)}) AS wanted "
+        f"WHERE wanted.value NOT IN (SELECT value FROM json_each({compiler.process(column, **kw)})))"
+    )
+
+
+class SearchHit(NamedTuple):
+    """Найденный продукт, его релевантность и фрагменты с выделенными словами запроса."""
+
+    product: ProductModel
+    rank: float
+    highlights: dict[str, str]
+
+
+def _price_bucket_label(lower: int, upper: int | None) -> str:
+    return f"{lower}-{upper}" if upper is not None else f"{lower}+"
+
+
+def _price_bucket_lower_bound(label: str) -> int:
+    return int(label.split("-")[0].rstrip("+"))
 
 
 class ProductRepository:
@@ -18,9 +116,363 @@ class ProductRepository:
             raise NotFoundProductException(f"Product with ID={product_id} not found")
         return product
 
-    def get_all(self, page: int = 1, count: int = 10) -> list[ProductModel]:
-        offset = (page - 1) * count
-        return self.session.query(ProductModel).offset(offset).limit(count).all()
+    def get_updated_at(self, product_id: int) -> datetime | None:
+        """Время изменения продукта без загрузки всей строки"""
+        row = self.session.query(ProductModel.updated_at).filter(ProductModel.id == product_id).first()
+        if row is None:
+            raise NotFoundProductException(f"Product with ID={product_id} not found")
+        return row.updated_at
+
+    def get_document_row(self, product_id: int) -> Row:
+        """Сохраненный document продукта с полями, которые подставляются в карточку при чтении"""
+        row = self.session.execute(self.document_statement(product_id)).first()
+        if row is None:
+            raise NotFoundProductException(f"Product with ID={product_id} not found")
+        return row
+
+    @staticmethod
+    def document_statement(product_id: int) -> Select:
+        return select(
+            ProductModel.id,
+            ProductModel.document,
+            ProductModel.document_version,
+            ProductModel.updated_at,
+            ProductModel.rating_sum,
+            ProductModel.rating_count,
+        ).where(ProductModel.id == product_id)
+
+    def get_page(
+        self,
+        count: int = 10,
+        page: int = 1,
+        after: dict | None = None,
+        category_id: int | None = None,
+        sort: str = "id",
+        min_price: float | None = None,
+        max_price: float | None = None,
+        size: str | None = None,
+        color: str | None = None,
+        in_stock: bool = False,
+        tags: list[str] | None = None,
+    ) -> tuple[list[ProductModel], bool]:
+        """Страница продуктов и признак наличия следующей страницы (параметры описаны в page_statement)"""
+        statement = self.page_statement(
+            count,
+            page,
+            after,
+            category_id,
+            sort,
+            min_price,
+            max_price,
+            size=size,
+            color=color,
+            in_stock=in_stock,
+            tags=tags,
+        )
+        products = self.session.scalars(statement).all()
+        return list(products[:count]), len(products) > count
+
+    @classmethod
+    def page_statement(
+        cls,
+        count: int = 10,
+        page: int = 1,
+        after: dict | None = None,
+        category_id: int | None = None,
+        sort: str = "id",
+        min_price: float | None = None,
+        max_price: float | None = None,
+        size: str | None = None,
+        color: str | None = None,
+        in_stock: bool = False,
+        tags: list[str] | None = None,
+    ) -> Select:
+        """Запрос страницы продуктов с одной лишней строкой для определения наличия следующей страницы.
+
+        sort: "id", "price_asc" или "price_desc" (по min_price, индекс ix_products_min_price_id).
+        Фильтры описаны в filter_conditions.
+        Если передан курсор after (значения из cursor_values), используется keyset-пагинация по ключу сортировки,
+        иначе — OFFSET по номеру страницы (для совместимости).
+        """
+        conditions = cls.filter_conditions(category_id, tags, min_price, max_price, size, color, in_stock)
+        statement = select(ProductModel).where(*conditions.values())
+
+        sort_columns = [ProductModel.id] if sort == "id" else [ProductModel.min_price, ProductModel.id]
+        descending = sort == "price_desc"
+        statement = statement.order_by(*(column.desc() if descending else column for column in sort_columns))
+
+        if after is not None:
+            sort_key = tuple_(*sort_columns)
+            after_key = tuple_(*cls._cursor_key(after, sort))
+            statement = statement.where(sort_key < after_key if descending else sort_key > after_key)
+        else:
+            statement = statement.offset((page - 1) * count)
+
+        return statement.limit(count + 1)
+
+    @classmethod
+    def filter_conditions(
+        cls,
+        category_id: int | None = None,
+        tags: list[str] | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        size: str | None = None,
+        color: str | None = None,
+        in_stock: bool = False,
+    ) -> dict[str, ColumnElement]:
+        """Условия фильтров каталога по измерениям фасетов (только для переданных фильтров).
+
+        tags оставляют продукты со всеми указанными тегами.
+        min_price/max_price оставляют продукты, диапазон цен которых пересекается с заданным.
+        size/color/in_stock оставляют продукты, у которых есть вариант со всеми указанными свойствами
+        (фильтр по индексированной таблице product_variants).
+        """
+        conditions = {}
+        if category_id is not None:
+            conditions["category"] = ProductModel.category_id == category_id
+        if tags:
+            conditions["tags"] = JsonContainsAll(ProductModel.tags, json.dumps(tags))
+        if min_price is not None or max_price is not None:
+            conditions["price"] = and_(
+                ProductModel.max_price >= min_price if min_price is not None else true(),
+                ProductModel.min_price <= max_price if max_price is not None else true(),
+            )
+        if size is not None or color is not None or in_stock:
+            conditions["variant"] = ProductModel.id.in_(cls.variant_filter(size, color, in_stock))
+        return conditions
+
+    def get_facets(
+        self,
+        category_id: int | None = None,
+        tags: list[str] | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        size: str | None = None,
+        color: str | None = None,
+        in_stock: bool = False,
+    ) -> dict[str, list[FacetValue]]:
+        """Фасеты каталога одним агрегирующим запросом (параметры описаны в facets_statement)"""
+        statement = self.facets_statement(category_id, tags, min_price, max_price, size, color, in_stock)
+        facets: dict[str, list[FacetValue]] = {"category": [], "tag": [], "size": [], "color": [], "price": []}
+        for facet, value, label, count in self.session.execute(statement):
+            facets[facet].append(FacetValue(value, label, count))
+        for facet, values in facets.items():
+            if facet == "price":
+                values.sort(key=lambda item: _price_bucket_lower_bound(item.value))
+            else:
+                values.sort(key=lambda item: (-item.count, item.value))
+        return facets
+
+    def facets_statement(
+        self,
+        category_id: int | None = None,
+        tags: list[str] | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        size: str | None = None,
+        color: str | None = None,
+        in_stock: bool = False,
+    ) -> CompoundSelect:
+        """Количество продуктов по категориям, тегам, размерам, цветам и корзинам цены (UNION ALL агрегатов).
+
+        Каждый фасет считается с учетом всех выбранных фильтров, кроме фильтра по нему самому,
+        чтобы в боковой панели были видны альтернативы выбранному значению.
+        Строки результата: (фасет, значение, подпись или NULL, количество).
+        """
+        conditions = self.filter_conditions(category_id, tags, min_price, max_price, size, color, in_stock)
+
+        def others(*excluded: str) -> list[ColumnElement]:
+            return [condition for dimension, condition in conditions.items() if dimension not in excluded]
+
+        def variant_conditions(*excluded: str) -> list[ColumnElement]:
+            variant_filters = {
+                "size": ProductVariantModel.size == size if size is not None else None,
+                "color": ProductVariantModel.color == color if color is not None else None,
+                "in_stock": ProductVariantModel.available_for_sale.is_(True) if in_stock else None,
+            }
+            return [
+                condition
+                for dimension, condition in variant_filters.items()
+                if condition is not None and dimension not in excluded
+            ]
+
+        categories = (
+            select(
+                literal("category"),
+                cast(ProductModel.category_id, String),
+                CategoryModel.name,
+                func.count(),
+            )
+            .join(CategoryModel, CategoryModel.id == ProductModel.category_id)
+            .where(*others("category"))
+            .group_by(ProductModel.category_id, CategoryModel.name)
+        )
+
+        tag_values = self._json_array_values(ProductModel.tags)
+        tag_counts = (
+            select(literal("tag"), tag_values.c.value, null(), func.count(ProductModel.id.distinct()))
+            .select_from(ProductModel)
+            .join(tag_values, true())
+            .where(*others("tags"))
+            .group_by(tag_values.c.value)
+        )
+
+        def option_counts(option: str):
+            column = getattr(ProductVariantModel, option)
+            return (
+                select(literal(option), column, null(), func.count(ProductVariantModel.product_id.distinct()))
+                .join(ProductModel, ProductModel.id == ProductVariantModel.product_id)
+                .where(column.is_not(None), *others("variant"), *variant_conditions(option))
+                .group_by(column)
+            )
+
+        bucket = case(
+            *(
+                (ProductModel.min_price < upper, _price_bucket_label(lower, upper))
+                for lower, upper in zip((0, *PRICE_FACET_BUCKETS), PRICE_FACET_BUCKETS, strict=False)
+            ),
+            else_=_price_bucket_label(PRICE_FACET_BUCKETS[-1], None),
+        )
+        prices = select(literal("price"), bucket, null(), func.count()).where(*others("price")).group_by(bucket)
+
+        return union_all(categories, tag_counts, option_counts("size"), option_counts("color"), prices)
+
+    def _json_array_values(self, column):
+        """Табличная функция, разворачивающая JSON-массив в колонку value"""
+        if self.session.get_bind().dialect.name == "postgresql":
+            return func.json_array_elements_text(column).table_valued("value")
+        return func.json_each(column).table_valued("value")
+
+    @staticmethod
+    def variant_filter(size: str | None = None, color: str | None = None, in_stock: bool = False) -> Select:
+        """ID продуктов с вариантом заданного размера, цвета и (при in_stock) доступным для продажи"""
+        statement = select(ProductVariantModel.product_id)
+        if size is not None:
+            statement = statement.where(ProductVariantModel.size == size)
+        if color is not None:
+            statement = statement.where(ProductVariantModel.color == color)
+        if in_stock:
+            statement = statement.where(ProductVariantModel.available_for_sale.is_(True))
+        return statement
+
+    @staticmethod
+    def cursor_values(product: ProductModel, sort: str = "id") -> dict:
+        """Значения ключа сортировки продукта для курсора следующей страницы"""
+        if sort == "id":
+            return {"id": product.id}
+        return {"price": str(product.min_price), "id": product.id}
+
+    @staticmethod
+    def _cursor_key(after: dict, sort: str) -> list:
+        product_id = after.get("id")
+        if not isinstance(product_id, int):
+            raise InvalidCursorException(str(after))
+        if sort == "id":
+            return [product_id]
+        try:
+            return [Decimal(after["price"]), product_id]
+        except (KeyError, TypeError, InvalidOperation) as e:
+            raise InvalidCursorException(str(after)) from e
+
+    def get_by_category(
+        self, category_id: int, page: int = 1, count: int = 10, after: dict | None = None, sort: str = "id"
+    ) -> tuple[list[ProductModel], bool]:
+        """Страница категории по индексам (category_id, id) и (category_id, min_price, id)"""
+        return self.get_page(count=count, page=page, after=after, category_id=category_id, sort=sort)
+
+    def get_many(self, product_ids: list[int]) -> list[ProductModel]:
+        """Возвращает продукты в порядке переданных ID, пропуская отсутствующие"""
+        if not product_ids:
+            return []
+        products = {
+            product.id: product
+            for product in self.session.query(ProductModel).filter(ProductModel.id.in_(product_ids)).all()
+        }
+        return [products[product_id] for product_id in product_ids if product_id in products]
+
+    def search(self, query: str, count: int = 10, after: dict | None = None) -> tuple[list[SearchHit], bool]:
+        """Полнотекстовый поиск по названию, описанию и тегам по убыванию релевантности.
+
+        Все слова запроса должны встречаться в продукте (websearch_to_tsquery: поддерживаются "фразы", or и -слово).
+        На PostgreSQL ищет по генерируемой колонке search_vector с GIN-индексом, на других СУБД — по PRODUCT_INDEX.
+        Курсор after — значения из search_cursor_values (keyset по релевантности и ID).
+        """
+        after_key = self._search_cursor_key(after) if after is not None else None
+        if self.session.get_bind().dialect.name == "postgresql":
+            hits = self._search_postgres(query, count + 1, after_key)
+        else:
+            hits = self._search_index(query, count + 1, after_key)
+        return hits[:count], len(hits) > count
+
+    @staticmethod
+    def search_cursor_values(hit: SearchHit) -> dict:
+        return {"rank": hit.rank, "id": hit.product.id}
+
+    @staticmethod
+    def _search_cursor_key(after: dict) -> tuple[float, int]:
+        rank, product_id = after.get("rank"), after.get("id")
+        if not isinstance(product_id, int) or not isinstance(rank, (int, float)):
+            raise InvalidCursorException(str(after))
+        return float(rank), product_id
+
+    def _search_postgres(self, query: str, limit: int, after_key: tuple[float, int] | None) -> list[SearchHit]:
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        rank = func.ts_rank(ProductModel.search_vector, tsquery, type_=Float)
+        statement = select(
+            ProductModel,
+            rank,
+            func.ts_headline(SEARCH_CONFIG, ProductModel.title, tsquery, TITLE_HEADLINE_OPTIONS),
+            func.ts_headline(
+                SEARCH_CONFIG, func.coalesce(ProductModel.description, ""), tsquery, DESCRIPTION_HEADLINE_OPTIONS
+            ),
+        ).where(ProductModel.search_vector.op("@@")(tsquery))
+        if after_key is not None:
+            after_rank, after_id = after_key
+            statement = statement.where(or_(rank < after_rank, and_(rank == after_rank, ProductModel.id > after_id)))
+        statement = statement.order_by(rank.desc(), ProductModel.id).limit(limit)
+        return [
+            SearchHit(product, product_rank, {"title": title, "description": description})
+            for product, product_rank, title, description in self.session.execute(statement)
+        ]
+
+    def _search_index(self, query: str, limit: int, after_key: tuple[float, int] | None) -> list[SearchHit]:
+        if not PRODUCT_INDEX.is_built:
+            PRODUCT_INDEX.build(self.get_index_documents())
+        matches = PRODUCT_INDEX.match(query)
+        if after_key is not None:
+            after_rank, after_id = after_key
+            matches = [
+                (product_id, score)
+                for product_id, score in matches
+                if score < after_rank or (score == after_rank and product_id > after_id)
+            ]
+        matches = matches[:limit]
+        products = {product.id: product for product in self.get_many([product_id for product_id, _ in matches])}
+        terms = tokenize(query)
+        return [
+            SearchHit(
+                products[product_id],
+                score,
+                {
+                    "title": highlight(products[product_id].title, terms),
+                    "description": highlight(products[product_id].description, terms),
+                },
+            )
+            for product_id, score in matches
+            if product_id in products
+        ]
+
+    def iter_batches(self, batch_size: int = 500) -> Iterator[list[ProductModel]]:
+        """Весь каталог по ID пачками через серверный курсор (yield_per), без OFFSET и загрузки в память целиком"""
+        statement = select(ProductModel).order_by(ProductModel.id).execution_options(yield_per=batch_size)
+        for products in self.session.scalars(statement).partitions():
+            yield list(products)
+
+    def get_index_documents(self) -> list[tuple[int, str]]:
+        """Тексты всех продуктов для построения индекса рекомендаций (без загрузки полных моделей)"""
+        rows = self.session.query(ProductModel.id, ProductModel.title, ProductModel.description, ProductModel.tags)
+        return [(product_id, product_text(title, description, tags)) for product_id, title, description, tags in rows]
 
     def get_all_prod(self, count: int = 100, exclude_id: int | None = None) -> list[ProductModel]:
         query = self.session.query(ProductModel)
@@ -58,7 +510,7 @@ class ProductRepository:
                     "minVariantPrice": {"amount": str(price), "currencyCode": "USD"},
                     "maxVariantPrice": {"amount": str(price), "currencyCode": "USD"},
                 },
-                variants=adapter._build_variants(options or {}, price),
+                variants=adapter.build_variants(options or {}, price),
                 featured_image=featured_image,
                 images=[{"url": img, "altText": title} for img in images] if images else [],
                 available_for_sale=available_for_sale,
@@ -66,10 +518,12 @@ class ProductRepository:
                 tags=kwargs.get("tags", []),
                 category_id=category_id,
             )
+            self._render_document(product)
 
             self.session.add(product)
             self.session.commit()
             self.session.refresh(product)
+            self._on_product_saved(product)
             logger.info(f"Создан новый продукт: {title} (ID: {product.id})")
             return product
         except Exception as e:
@@ -89,36 +543,65 @@ class ProductRepository:
                         "minVariantPrice": {"amount": str(value), "currencyCode": "USD"},
                         "maxVariantPrice": {"amount": str(value), "currencyCode": "USD"},
                     }
+            self._render_document(product)
 
             self.session.commit()
             self.session.refresh(product)
+            self._on_product_saved(product)
             logger.info(f"Обновлен продукт ID {product_id}: {product.title}")
             return product
         except Exception as e:
             logger.error(f"Ошибка при обновлении продукта {product_id}: {str(e)}")
             raise
 
-    def get_products_by_category(self, category_id: int) -> list[ProductModel]:
-        return self.session.query(ProductModel).filter_by(category_id=category_id).all()
-
-    def get_products_by_price_ascending(self) -> list[ProductModel]:
-        return (
-            self.session.query(ProductModel)
-            .order_by(ProductModel.price_range["minVariantPrice"]["amount"].astext.cast(Float).asc())
-            .all()
-        )
-
     def delete(self, product_id: int) -> None:
         try:
             product = self.get(product_id)
             product_title = product.title  # Сохраняем название до удаления
             self.session.delete(product)
             self.session.commit()
+            self._on_product_deleted(product_id)
             logger.info(f"Удален продукт: {product_title} (ID: {product_id})")
         except Exception as e:
             logger.error(f"Ошибка при удалении продукта {product_id}: {str(e)}")
             raise
 
+    @staticmethod
+    def _render_document(product: ProductModel) -> None:
+        """Сохраняет готовую карточку продукта вместе с записью, чтобы чтение обходилось без преобразований"""
+        product.document = ProductAdapter.render_document(product)
+        product.document_version = DOCUMENT_VERSION
+
+    def save_documents(self, products: list[ProductModel]) -> None:
+        """Пересобирает document продуктов, не меняя updated_at (для команды rebuild_product_documents)"""
+        products_table = ProductModel.__table__
+        statement = (
+            update(products_table)
+            .where(products_table.c.id == bindparam("product_id"))
+            .values(
+                document=bindparam("document"),
+                document_version=DOCUMENT_VERSION,
+                updated_at=products_table.c.updated_at,
+            )
+        )
+        self.session.execute(
+            statement,
+            [{"product_id": product.id, "document": ProductAdapter.render_document(product)} for product in products],
+        )
+        self.session.commit()
+        for product in products:
+            PRODUCT_CACHE.invalidate(product.id)
+
+    def _on_product_saved(self, product: ProductModel) -> None:
+        """Обновляет производные структуры процесса после сохранения продукта"""
+        PRODUCT_INDEX.add(product.id, product_text(product.title, product.description, product.tags))
+        PRODUCT_CACHE.invalidate(product.id)
+
+    def _on_product_deleted(self, product_id: int) -> None:
+        """Удаляет продукт из производных структур процесса"""
+        PRODUCT_INDEX.remove(product_id)
+        PRODUCT_CACHE.invalidate(product_id)
+
 
 class ProductAdapter:
     """Форматирует ответ в GraphQL-подобный формат"""
@@ -128,15 +611,51 @@ class ProductAdapter:
         self.review_repo = review_repo
 
     def get_one_product(self, product_id):
-        product = self.product_repository.get(product_id)
-        review = self.review_repo.calculate_rating(product.id)
-        return self._to_graphql_format(product=product, rating=review)
+        cached = PRODUCT_CACHE.get(product_id)
+        if cached is not None:
+            return cached
+
+        # Готовый document читается одним запросом без загрузки модели и ее преобразования
+        payload = self.card_from_row(self.product_repository.get_document_row(product_id))
+        if payload is None:
+            payload = self.to_graphql_list([self.product_repository.get(product_id)])[0]
+        PRODUCT_CACHE.set(product_id, payload)
+        return payload
+
+    def get_product_updated_at(self, product_id: int) -> datetime | None:
+        """Время изменения продукта: из кэша карточек, а при промахе — легким запросом к БД"""
+        cached = PRODUCT_CACHE.get(product_id)
+        if cached is not None:
+            return datetime.fromisoformat(cached["updatedAt"])
+        return self.product_repository.get_updated_at(product_id)
+
+    def to_connection(self, products: list[ProductModel], has_next_page: bool, sort: str = "id") -> dict:
+        """GraphQL-подобная страница: edges с курсорами (по ключу сортировки sort) и pageInfo"""
+        edges = [
+            {"node": node, "cursor": encode_cursor(self.product_repository.cursor_values(product, sort))}
+            for product, node in zip(products, self.to_graphql_list(products), strict=True)
+        ]
+        return {"edges": edges, "pageInfo": page_info(has_next_page, edges[-1]["cursor"] if edges else None)}
+
+    def to_search_connection(self, hits: list[SearchHit], has_next_page: bool) -> dict:
+        """Страница результатов поиска: edges с карточками, релевантностью и выделенными фрагментами"""
+        edges = [
+            {
+                "node": node,
+                "cursor": encode_cursor(self.product_repository.search_cursor_values(hit)),
+                "rank": hit.rank,
+                "highlights": hit.highlights,
+            }
+            for hit, node in zip(hits, self.to_graphql_list([hit.product for hit in hits]), strict=True)
+        ]
+        return {"edges": edges, "pageInfo": page_info(has_next_page, edges[-1]["cursor"] if edges else None)}
 
-    def get_products(self, page: int = 1, count: int = 10) -> dict:
-        products = self.product_repository.get_all(page, count)
-        return {"edges": [{"node": self._to_graphql_format(product)} for product in products]}
+    def to_graphql_list(self, products: list[ProductModel]) -> list[dict]:
+        """Форматирует список продуктов с рейтингом из сохраненной сводки оценок"""
+        return [self._to_graphql_format(product, rating=product.average_rating) for product in products]
 
-    def _build_variants(self, options: dict[str, list[str]], price: float) -> list[dict]:
+    @staticmethod
+    def build_variants(options: dict[str, list[str]], price: float) -> list[dict]:
         """Создает варианты на основе опций"""
         variants = []
         if "Size" in options and "Color" in options:
@@ -154,90 +673,72 @@ class ProductAdapter:
 
     def _convert_price_range(self, price_range):
         """Convert snake_case price_range from database to camelCase for schema."""
-        if not price_range:
-            return {
-                "maxVariantPrice": {"amount": "0.00", "currencyCode": "USD"},
-                "minVariantPrice": {"amount": "0.00", "currencyCode": "USD"},
-            }
-
-        # Convert snake_case to camelCase
-        converted = {}
-        if "min_variant_price" in price_range:
-            converted["minVariantPrice"] = self._convert_price_to_money_schema(price_range["min_variant_price"])
-        if "max_variant_price" in price_range:
-            converted["maxVariantPrice"] = self._convert_price_to_money_schema(price_range["max_variant_price"])
-
-        # If the price_range is already in camelCase (fallback)
-        if "minVariantPrice" in price_range:
-            converted["minVariantPrice"] = self._convert_price_to_money_schema(price_range["minVariantPrice"])
-        if "maxVariantPrice" in price_range:
-            converted["maxVariantPrice"] = self._convert_price_to_money_schema(price_range["maxVariantPrice"])
-
-        # Ensure we have both fields
-        if "minVariantPrice" not in converted:
-            converted["minVariantPrice"] = {"amount": "0.00", "currencyCode": "USD"}
-        if "maxVariantPrice" not in converted:
-            converted["maxVariantPrice"] = {"amount": "0.00", "currencyCode": "USD"}
-
-        return converted
+        return normalize_price_range(price_range)
 
     def _convert_price_to_money_schema(self, price):
         """Convert price to MoneySchema format."""
-        if isinstance(price, dict):
-            # If it's already a dict, ensure it has the right structure
-            if "amount" in price and "currencyCode" in price:
-                return price
-            if "amount" in price and "currency_code" in price:
-                return {"amount": str(price["amount"]), "currencyCode": price["currency_code"]}
-            return {"amount": "0.00", "currencyCode": "USD"}
-        if isinstance(price, (int, float, str)):
-            # If it's a simple value, wrap it in MoneySchema format
-            return {"amount": str(price), "currencyCode": "USD"}
-        return {"amount": "0.00", "currencyCode": "USD"}
+        return normalize_money(price)
 
     def _to_graphql_format(self, product: ProductModel, rating: float = 0.0) -> dict:
-        # Извлекаем уникальные опции из вариантов
-        options = self._extract_options_from_variants(product.variants)
+        """Карточка продукта: сохраненный document, а если он отсутствует или устарел — отрисованный заново"""
+        document = product.document if product.document_version == DOCUMENT_VERSION else None
+        return self.product_card(product.id, document or self.render_document(product), product.updated_at, rating)
+
+    @classmethod
+    def card_from_row(cls, row) -> dict | None:
+        """Карточка из строки ProductRepository.document_statement или None, если document нужно отрисовать"""
+        if row.document is None or row.document_version != DOCUMENT_VERSION:
+            return None
+        rating = row.rating_sum / row.rating_count if row.rating_count else 0.0
+        return cls.product_card(row.id, row.document, row.updated_at, rating)
+
+    @staticmethod
+    def product_card(product_id: int, document: dict, updated_at: datetime | None, rating: float) -> dict:
+        """Карточка в формате ProductResponseSchema из document и полей, которые меняются без его пересборки"""
+        return {
+            "id": f"product-{product_id}",
+            **document,
+            "updatedAt": updated_at.isoformat() if updated_at else datetime.now().isoformat(),
+            "rating": rating,
+        }
 
+    @classmethod
+    def render_document(cls, product) -> dict:
+        """Неизменная между записями часть карточки продукта (все, кроме id, updatedAt и rating).
+
+        Принимает ProductModel или объект с теми же атрибутами (строку импорта).
+        price_range и variants нормализуются при записи (ProductModel), поэтому берутся как есть;
+        ответ можно отдавать без повторной валидации response_model (см. json_response).
+        """
+        title = product.title
+        featured_image = product.featured_image
+        variants = product.variants or []
         return {
-            "id": f"product-{product.id}",
             "handle": product.handle,
             "availableForSale": product.available_for_sale,
-            "title": product.title,
+            "title": title,
             "description": product.description,
             "descriptionHtml": product.description_html or f"<p>{product.description}</p>",
             "options": [
                 {"id": f"option-{i + 1}", "name": name, "values": values}
-                for i, (name, values) in enumerate(options.items())
+                for i, (name, values) in enumerate(cls._extract_options_from_variants(variants).items())
             ],
-            "priceRange": self._convert_price_range(product.price_range),
-            "variants": {
-                "edges": [
-                    {
-                        "node": {
-                            "id": variant.get("id", f"variant-{i}"),
-                            "availableForSale": variant.get("availableForSale", True),
-                            "selectedOptions": variant.get("selectedOptions", []),
-                            "price": self._convert_price_to_money_schema(variant.get("price", "0.00")),
-                        }
-                    }
-                    for i, variant in enumerate(product.variants or [])
-                ]
-            },
+            "priceRange": product.price_range or normalize_price_range(None),
+            "variants": {"edges": [{"node": variant} for variant in variants]},
             "featuredImage": {
-                "url": product.featured_image.get("url") if product.featured_image else "",
-                "altText": product.featured_image.get("altText", product.title)
-                if product.featured_image
-                else product.title,
-                "width": product.featured_image.get("width", 800) if product.featured_image else 800,
-                "height": product.featured_image.get("height", 800) if product.featured_image else 800,
-            },
+                "url": featured_image.get("url", ""),
+                "altText": featured_image.get("altText", title),
+                "width": featured_image.get("width", 800),
+                "height": featured_image.get("height", 800),
+            }
+            if featured_image
+            else {"url": "", "altText": title, "width": 800, "height": 800},
             "images": {
                 "edges": [
                     {
                         "node": {
                             "url": img.get("url", ""),
-                            "altText": img.get("altText", product.title),
+                            "altText": img.get("altText", title),
                             "width": img.get("width", 800),
                             "height": img.get("height", 800),
                         }
@@ -245,25 +746,19 @@ class ProductAdapter:
                     for img in product.images or []
                 ]
             },
-            "seo": product.seo or {"title": product.title, "description": product.description},
+            "seo": product.seo or {"title": title, "description": product.description},
             "tags": product.tags or [],
-            "updatedAt": product.updated_at.isoformat() if product.updated_at else datetime.now().isoformat(),
-            "rating": rating,
         }
 
-    def _extract_options_from_variants(self, variants: list[dict]) -> dict[str, list[str]]:
-        """Извлекает уникальные опции из списка вариантов"""
-        options = {}
-
+    @staticmethod
+    def _extract_options_from_variants(variants: list[dict]) -> dict[str, list[str]]:
+        """Извлекает уникальные опции из списка вариантов в порядке появления"""
+        options: dict[str, list[str]] = {}
+        seen: set[tuple[str, str]] = set()
         for variant in variants or []:
             for option in variant.get("selectedOptions", []):
-                name = option["name"]
-                value = option["value"]
-
-                if name not in options:
-                    options[name] = []
-
-                if value not in options[name]:
-                    options[name].append(value)
-
+                key = (option["name"], option["value"])
+                if key not in seen:
+                    seen.add(key)
+                    options.setdefault(key[0], []).append(key[1])
         return options
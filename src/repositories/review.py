@@ -1,6 +1,18 @@
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from sqlalchemy import Select, Update, func, select, update
 from sqlalchemy.orm import Session
 
-from src.models import ReviewModel
+from src.application.utils.cache import PRODUCT_CACHE
+from src.models import ProductModel, ReviewModel
+
+
+class ProductRating(NamedTuple):
+    """Средняя оценка продукта и количество оценок."""
+
+    average: float = 0.0
+    count: int = 0
 
 
 class ReviewRepository:
@@ -12,7 +24,9 @@ class ReviewRepository:
     def create_review(self, user_id: int, product_id: int, rating: int) -> ReviewModel:
         review = ReviewModel(user_id=user_id, product_id=product_id, rating=rating)
         self.session.add(review)
+        self._apply_rating_delta(product_id, rating, 1)
         self.session.commit()
+        PRODUCT_CACHE.invalidate(product_id)
         self.session.refresh(review)
         return review
 
@@ -40,8 +54,10 @@ class ReviewRepository:
     def update_review(self, review_id: int, rating: int) -> ReviewModel | None:
         review = self.get_review_by_id(review_id)
         if review:
+            self._apply_rating_delta(review.product_id, rating - review.rating, 0)
             review.rating = rating
             self.session.commit()
+            PRODUCT_CACHE.invalidate(review.product_id)
             self.session.refresh(review)
         return review
 
@@ -49,14 +65,65 @@ class ReviewRepository:
     def delete_review(self, review_id: int) -> bool:
         review = self.get_review_by_id(review_id)
         if review:
+            product_id = review.product_id
+            self._apply_rating_delta(product_id, -review.rating, -1)
             self.session.delete(review)
             self.session.commit()
+            PRODUCT_CACHE.invalidate(product_id)
             return True
         return False
 
     # Получение средний оценки продукта
     def calculate_rating(self, product_id: int) -> float:
-        reviews = self.get_reviews_by_product_id(product_id)
-        if reviews:
-            return sum(review.rating for review in reviews) / len(reviews)
-        return 0.0
+        return self.get_ratings([product_id])[product_id].average
+
+    # Средние оценки и количество оценок для набора продуктов из сводки оценок в таблице products
+    def get_ratings(self, product_ids: Iterable[int]) -> dict[int, ProductRating]:
+        ids = set(product_ids)
+        if not ids:
+            return {}
+        return self.ratings_from_rows(ids, self.session.execute(self.ratings_statement(ids)))
+
+    # Пересчитывает сводку оценок всех продуктов по таблице reviews (для заполнения существующих данных)
+    def rebuild_rating_summary(self) -> int:
+        rating_sum = (
+            select(func.coalesce(func.sum(ReviewModel.rating), 0))
+            .where(ReviewModel.product_id == ProductModel.id)
+            .scalar_subquery()
+        )
+        rating_count = (
+            select(func.count(ReviewModel.id)).where(ReviewModel.product_id == ProductModel.id).scalar_subquery()
+        )
+        result = self.session.execute(update(ProductModel).values(rating_sum=rating_sum, rating_count=rating_count))
+        self.session.commit()
+        PRODUCT_CACHE.clear()
+        return result.rowcount
+
+    # Изменяет сводку оценок продукта в текущей транзакции, без чтения всех отзывов
+    def _apply_rating_delta(self, product_id: int, rating_delta: int, count_delta: int) -> None:
+        self.session.execute(self.rating_delta_statement(product_id, rating_delta, count_delta))
+
+    @staticmethod
+    def rating_delta_statement(product_id: int, rating_delta: int, count_delta: int) -> Update:
+        return (
+            update(ProductModel)
+            .where(ProductModel.id == product_id)
+            .values(
+                rating_sum=ProductModel.rating_sum + rating_delta,
+                rating_count=ProductModel.rating_count + count_delta,
+            )
+        )
+
+    @staticmethod
+    def ratings_statement(product_ids: Iterable[int]) -> Select:
+        return select(ProductModel.id, ProductModel.rating_sum, ProductModel.rating_count).where(
+            ProductModel.id.in_(product_ids)
+        )
+
+    @staticmethod
+    def ratings_from_rows(product_ids: Iterable[int], rows) -> dict[int, ProductRating]:
+        ratings = {
+            product_id: ProductRating(rating_sum / rating_count if rating_count else 0.0, rating_count)
+            for product_id, rating_sum, rating_count in rows
+        }
+        return {product_id: ratings.get(product_id, ProductRating()) for product_id in product_ids}
@@ -1,6 +1,7 @@
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from src.exceptions.user_exceptions import NotFoundUserException
 from src.models import UserModel
 
 
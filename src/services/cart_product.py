@@ -1,14 +1,28 @@
 import logging
-from typing import Any
+from typing import Any, NamedTuple
 
-from src.exceptions.carts import CartProductPriceException
 from src.models.cart_product import CartProductModel
+from src.models.product import ProductModel
+from src.models.product_variant import ProductVariantModel
 from src.repositories.cart import CartRepository
 from src.repositories.cart_product import CartProductRepository
 
 logger = logging.getLogger(__name__)
 
 
+class CartSummary(NamedTuple):
+    items: list[dict[str, Any]]
+    total_items: int
+    total_price: float
+
+
+class CartLineSummary(NamedTuple):
+    line_id: int
+    item: dict[str, Any] | None
+    total_items: int
+    total_price: float
+
+
 class CartProductService:
     def __init__(
         self,
@@ -18,73 +32,61 @@ class CartProductService:
         self.cart_repository = cart_repository
         self.cart_product_repo = cart_product_repository
 
-    def get_total_items(self, cart_id: int) -> int:
-        cart = self.cart_repository.get_cart(cart_id)
-        return len(cart.cart_product_rel)
+    def get_cart_summary(self, cart_id: int) -> CartSummary:
+        """Загружает корзину с позициями и продуктами и собирает ответ за один проход"""
+        cart = self.cart_repository.get_cart_with_products(cart_id)
+        return self.summarize(cart.cart_product_rel)
 
-    def get_total_price(self, cart_id: int) -> float:
+    def summarize(self, cart_products: list[CartProductModel]) -> CartSummary:
+        """Сериализует уже загруженные позиции корзины и считает их стоимость за один проход"""
+        items = []
         total_price = 0.0
-        cart = self.cart_repository.get_cart(cart_id)
-
-        for item in cart.cart_product_rel:
-            product = item.product_rel
+        for cart_product in cart_products:
+            item, line_total = self._serialize_line(cart_product)
+            items.append(item)
+            total_price += line_total
+        return CartSummary(items, len(cart_products), total_price)
 
-            if not product or not product.variants:
-                logger.warning(f"Товар отсутствует или не содержит вариантов (product_id={item.product_id})")
-                continue
+    def get_line_summary(self, cart_id: int, line_id: int) -> CartLineSummary:
+        """Измененная позиция и итоги корзины без загрузки остальных позиций (итоги считаются в SQL)"""
+        line = self.cart_product_repo.get_line(line_id)
+        return self.line_summary(line_id, line, self.cart_product_repo.get_totals(cart_id))
 
-            matched_variant = self._find_variant(product.variants, item.variant_id)
-
-            if not matched_variant:
-                logger.warning(
-                    f"Не найден вариант товара (product_id={item.product_id}, variant_id={item.variant_id})"
-                )
-                continue
-
-            try:
-                price = float(matched_variant["price"]["amount"])
-                total_price += price * item.quantity
-            except (KeyError, ValueError, TypeError) as e:
-                logger.warning(
-                    f"Ошибка при вычислении цены (product_id={item.product_id}, variant_id={item.variant_id}): {e}"
-                )
-                continue
-
-        return total_price
+    def line_summary(self, line_id: int, line: CartProductModel | None, totals) -> CartLineSummary:
+        item = self.serialize_cart_item(line) if line is not None else None
+        return CartLineSummary(line_id, item or None, totals.total_items, float(totals.total_price))
 
     def serialize_cart_item(self, cart_product: CartProductModel) -> dict[str, Any]:
+        return self._serialize_line(cart_product)[0]
+
+    def _serialize_line(self, cart_product: CartProductModel) -> tuple[dict[str, Any], float]:
+        """Позиция корзины в формате ответа и ее стоимость (0, если цену определить нельзя)"""
         product = cart_product.product_rel
 
-        if not product or not product.variants:
+        if not product or not product.variants_rel:
             logger.warning(f"Не удалось сериализовать товар — отсутствует product или variants (cart_product_id={cart_product.id})")
-            return {}
+            return {}, 0.0
 
-        variant = self._find_variant(product.variants, cart_product.variant_id)
+        variant = self._find_variant(product, cart_product.variant_id)
 
         if not variant:
             logger.warning(f"Не найден вариант при сериализации (product_id={product.id}, variant_id={cart_product.variant_id})")
-            return {}
-
-        try:
-            price = float(variant["price"]["amount"])
-        except (KeyError, ValueError, TypeError) as e:
-            logger.warning(f"Ошибка при чтении цены из варианта: {e}")
-            raise CartProductPriceException(f"Некорректная цена в варианте товара: {e}")
+            return {}, 0.0
 
-        total_price = f"{price * cart_product.quantity:.2f}"
+        line_total = float(variant.price) * cart_product.quantity
 
         return {
             "id": f"line-{cart_product.id}",
             "quantity": cart_product.quantity,
             "cost": {
                 "totalAmount": {
-                    "amount": total_price,
-                    "currencyCode": variant["price"].get("currencyCode", "USD")
+                    "amount": f"{line_total:.2f}",
+                    "currencyCode": variant.currency_code
                 }
             },
             "merchandise": {
-                "id": variant["id"],
-                "title": " / ".join(opt["value"] for opt in variant.get("selectedOptions", [])),
+                "id": variant.variant_id,
+                "title": variant.title,
                 "product": {
                     "id": f"product-{product.id}",
                     "title": product.title,
@@ -95,13 +97,13 @@ class CartProductService:
                         if product.featured_image else product.title,
                     },
                 },
-                "selectedOptions": variant.get("selectedOptions", []),
+                "selectedOptions": variant.selected_options or [],
             },
-        }
+        }, line_total
 
-    def _find_variant(self, variants: list[dict], variant_id: str | None) -> dict | None:
+    def _find_variant(self, product: ProductModel, variant_id: str | None) -> ProductVariantModel | None:
         if variant_id:
-            for v in variants:
-                if v["id"] == variant_id:
-                    return v
-        return variants[0] if variants else None
+            variant = product.variants_by_id.get(variant_id)
+            if variant is not None:
+                return variant
+        return product.variants_rel[0] if product.variants_rel else None
@@ -1,8 +1,8 @@
 from src.application.logger import logger
 from src.exceptions.order_exceptions import CartIsEmpty, OrderNotFoundException
-from src.models import OrderModel
+from src.models import CartProductModel, OrderModel
 from src.repositories.cart import CartRepository
-from src.repositories.order import OrderRepository
+from src.repositories.order import OrderLine, OrderRepository, OrderSummary
 from src.repositories.order_product import OrderProductRepository
 
 
@@ -25,27 +25,49 @@ class OrderService:
         payment_method: str | None = None,
     ) -> OrderModel:
         logger.info(f"Создание заказа для пользователя {user_id}")
-        cart = self.cart_repository.get_by_user_id(user_id)
+        cart = self.cart_repository.get_by_user_id_with_products(user_id)
 
         if not cart or len(cart.cart_product_rel) == 0:
             logger.warning(f"Корзина пользователя {user_id} пуста — заказ не создан")
             raise CartIsEmpty()
 
-        order = self.order_repository.create_order(
-            user_id=user_id, email=email, shipping_address=shipping_address, payment_method=payment_method
+        # Заказ и все позиции пишутся одной транзакцией: без промежуточных commit на каждую позицию
+        order = self.order_repository.create_order_with_products(
+            user_id=user_id,
+            lines=[self._order_line(cart_product) for cart_product in cart.cart_product_rel],
+            email=email,
+            shipping_address=shipping_address,
+            payment_method=payment_method,
         )
-        logger.info(f"Создан заказ с ID {order.id} для пользователя {user_id}")
-
-        for product in cart.cart_product_rel:
-            self.order_product.add_product_to_order(
-                order_id=order.id,
-                product_id=product.product_id,
-                quantity=product.quantity,
-            )
-            logger.debug(f"Добавлен продукт {product.product_id} (x{product.quantity}) в заказ {order.id}")
+        logger.info(f"Создан заказ с ID {order.id} для пользователя {user_id} ({len(order.order_products)} позиций)")
 
         return order
 
+    @staticmethod
+    def _order_line(cart_product: CartProductModel) -> OrderLine:
+        """Позиция заказа из позиции корзины по текущей цене выбранного варианта (как в CartProductService)"""
+        product = cart_product.product_rel
+        variant = product.variants_by_id.get(cart_product.variant_id) if cart_product.variant_id else None
+        if variant is None and product.variants_rel:
+            variant = product.variants_rel[0]
+        if variant is None:
+            logger.warning(f"У продукта {product.id} нет вариантов, в заказ попадает минимальная цена продукта")
+            return OrderLine(
+                cart_product.product_id,
+                cart_product.quantity,
+                cart_product.variant_id,
+                product.title,
+                product.min_price,
+            )
+        return OrderLine(
+            product_id=cart_product.product_id,
+            quantity=cart_product.quantity,
+            variant_id=variant.variant_id,
+            title=product.title,
+            unit_price=variant.price,
+            currency_code=variant.currency_code,
+        )
+
     def get_order_by_id(self, order_id: int) -> OrderModel:
         logger.info(f"Получение заказа с ID {order_id}")
         order = self.order_repository.get_order(order_id)
@@ -56,6 +78,8 @@ class OrderService:
 
         return order
 
-    def get_user_orders(self, user_id: int) -> list[OrderModel]:
-        logger.info(f"Получение всех заказов пользователя {user_id}")
-        return self.order_repository.get_user_orders(user_id)
+    def get_order_history(
+        self, user_id: int, count: int = 20, after: dict | None = None
+    ) -> tuple[list[OrderSummary], bool]:
+        logger.info(f"Получение истории заказов пользователя {user_id}")
+        return self.order_repository.get_user_order_summaries(user_id, count, after)
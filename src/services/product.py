@@ -1,5 +1,10 @@
+from src.application.logger import logger
+from src.application.utils.product_index import PRODUCT_INDEX, product_text
 from src.exceptions.product_exceptions import NotFoundProductException, RecommendationException
+from src.models import ProductModel
 from src.repositories import ProductAdapter, ProductRepository, ReviewRepository
+from src.repositories.product import DOCUMENT_VERSION
+from src.services.recommendation_matrix import RelatedProducts, get_related_products
 
 
 class ProductService:
@@ -8,7 +13,44 @@ class ProductService:
         self.review_repository = review_repository
         self.adapter = ProductAdapter(product_repository, review_repository)
 
-    def get_products_recommendation(self, product_id: int) -> list[dict]:
+    def build_recommendation_index(self) -> None:
+        """Строит индекс рекомендаций по всему каталогу"""
+        PRODUCT_INDEX.build(self.product_repository.get_index_documents())
+        logger.info(f"Индекс рекомендаций построен: {len(PRODUCT_INDEX)} продуктов")
+
+    def build_related_products(self, top_n: int = 10, block_size: int = 128) -> RelatedProducts:
+        """Считает похожие продукты для всего каталога пакетным умножением TF-IDF матриц"""
+        related = RelatedProducts.build(self.product_repository.get_index_documents(), top_n, block_size)
+        logger.info(f"Похожие продукты посчитаны для {len(related)} продуктов")
+        return related
+
+    def rebuild_documents(self, batch_size: int = 500, force: bool = False) -> int:
+        """Пересобирает сохраненные карточки продуктов пачками по ID; без force — только отсутствующие и устаревшие"""
+        rebuilt = 0
+        after = None
+        while True:
+            products, has_next_page = self.product_repository.get_page(count=batch_size, after=after)
+            stale = [product for product in products if force or product.document_version != DOCUMENT_VERSION]
+            if stale:
+                self.product_repository.save_documents(stale)
+                rebuilt += len(stale)
+            if not has_next_page:
+                return rebuilt
+            after = self.product_repository.cursor_values(products[-1])
+
+    def get_products_recommendation(
+        self, product_id: int, count: int = 5, recommended: list[ProductModel] | None = None
+    ) -> list[dict]:
+        """Рекомендации в формате GraphQL; recommended — уже загруженные get_recommended_products продукты"""
+        if recommended is None:
+            recommended = self.get_recommended_products(product_id, count)
+        try:
+            return self.adapter.to_graphql_list(recommended)
+        except Exception:
+            raise RecommendationException(product_id)
+
+    def get_recommended_products(self, product_id: int, count: int = 5) -> list[ProductModel]:
+        """Рекомендованные продукты без сериализации (например, для проверки ETag)"""
         try:
             current_product = self.product_repository.get(product_id)
             if current_product is None:
@@ -17,29 +59,18 @@ class ProductService:
             raise NotFoundProductException(product_id)
 
         try:
-            all_products = self.product_repository.get_all_prod(count=100)
+            return self.product_repository.get_many(self._recommended_ids(current_product, count))
         except Exception:
             raise RecommendationException(product_id)
 
-        current_words = set(current_product.description.lower().split())
-        scored_products = []
-
-        for product in all_products:
-            if product.id == product_id:
-                continue  # исключаем сам продукт
-
-            words = set(product.description.lower().split())
-            common_words = current_words & words
-            score = len(common_words)
-
-            if score > 0:
-                scored_products.append((product, score))
-
-        scored_products.sort(key=lambda x: x[1], reverse=True)
-
-        try:
-            recommended = [self.adapter._to_graphql_format(p) for p, _ in scored_products[:5]]
-        except Exception:
-            raise RecommendationException(product_id)
+    def _recommended_ids(self, product, count: int) -> list[int]:
+        """ID рекомендаций: из заранее посчитанной матрицы, а для новых продуктов — из индекса BM25"""
+        related = get_related_products()
+        recommended_ids = related.get(product.id, count) if related is not None else None
+        if recommended_ids is not None:
+            return recommended_ids
 
-        return recommended
+        if not PRODUCT_INDEX.is_built:
+            self.build_recommendation_index()
+        text = product_text(product.title, product.description, product.tags)
+        return [recommended_id for recommended_id, _ in PRODUCT_INDEX.similar(product.id, text, limit=count)]
@@ -0,0 +1,92 @@
+import csv
+import io
+from collections.abc import Iterator
+
+import orjson
+from sqlalchemy.orm import sessionmaker
+
+from src.application.logger import logger
+from src.models import ProductModel
+from src.repositories.product import ProductAdapter, ProductRepository
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+# Колонки CSV совпадают с форматом импорта (src.services.product_import), лишние колонки импорт игнорирует
+CSV_COLUMNS = (
+    "id",
+    "handle",
+    "title",
+    "description",
+    "price",
+    "max_price",
+    "currency_code",
+    "category_id",
+    "sizes",
+    "colors",
+    "tags",
+    "image_url",
+    "images",
+    "available_for_sale",
+    "rating",
+    "updated_at",
+)
+
+
+class ProductExporter:
+    """Потоковая выгрузка всего каталога в NDJSON или CSV.
+
+    Продукты читаются пачками через серверный курсор (yield_per) и сериализуются ProductAdapter;
+    identity map сессии хранит слабые ссылки, поэтому выгруженные пачки освобождаются и память
+    не зависит от размера каталога. Сессия открывается самим генератором:
+    зависимости FastAPI с yield закрываются до того, как StreamingResponse начнет отдавать тело.
+    """
+
+    def __init__(self, session_factory: sessionmaker, batch_size: int = 500):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+
+    def stream(self, file_format: str) -> Iterator[str | bytes]:
+        exported = 0
+        with self.session_factory() as session:
+            repository = ProductRepository(session)
+            adapter = ProductAdapter(repository, None)
+            if file_format == "csv":
+                yield _csv_chunk([CSV_COLUMNS])
+            for products in repository.iter_batches(self.batch_size):
+                nodes = adapter.to_graphql_list(products)
+                if file_format == "csv":
+                    yield _csv_chunk(_csv_row(product, node) for product, node in zip(products, nodes, strict=True))
+                else:
+                    yield b"".join(orjson.dumps(node) + b"\n" for node in nodes)
+                exported += len(products)
+        logger.info(f"Выгрузка каталога ({file_format}) завершена: {exported} продуктов")
+
+
+def _csv_chunk(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def _csv_row(product: ProductModel, node: dict) -> tuple:
+    options = {option["name"]: option["values"] for option in node["options"]}
+    price_range = node["priceRange"]
+    return (
+        product.id,
+        node["handle"],
+        node["title"],
+        node["description"] or "",
+        price_range["minVariantPrice"]["amount"],
+        price_range["maxVariantPrice"]["amount"],
+        price_range["minVariantPrice"]["currencyCode"],
+        product.category_id,
+        "|".join(options.get("Size", [])),
+        "|".join(options.get("Color", [])),
+        "|".join(node["tags"]),
+        node["featuredImage"]["url"],
+        "|".join(image["node"]["url"] for image in node["images"]["edges"]),
+        str(node["availableForSale"]).lower(),
+        node["rating"],
+        node["updatedAt"],
+    )
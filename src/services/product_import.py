@@ -0,0 +1,303 @@
+import csv
+import json
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from types import SimpleNamespace
+from typing import IO
+
+from sqlalchemy import delete, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from src.application.logger import logger
+from src.application.utils.cache import PRODUCT_CACHE
+from src.application.utils.product_index import PRODUCT_INDEX, product_text
+from src.exceptions.product_exceptions import ProductImportException, ProductImportRowException
+from src.models import ProductModel, ProductVariantModel
+from src.repositories.product import DOCUMENT_VERSION, ProductAdapter
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+# Колонки products, которые перезаписываются при повторном импорте продукта с тем же handle
+UPSERT_COLUMNS = (
+    "title",
+    "description",
+    "description_html",
+    "price_range",
+    "min_price",
+    "max_price",
+    "variants",
+    "featured_image",
+    "images",
+    "available_for_sale",
+    "seo",
+    "tags",
+    "category_id",
+    "document",
+    "document_version",
+    "updated_at",
+)
+
+
+@dataclass
+class ImportReport:
+    processed: int = 0
+    imported: int = 0
+    errors: list[dict] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    def add_error(self, line: int, message: str) -> None:
+        self.errors.append({"line": line, "error": message})
+
+    def as_dict(self, max_errors: int = 100) -> dict:
+        return {
+            "processed": self.processed,
+            "imported": self.imported,
+            "failed": len(self.errors),
+            "elapsed": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "errors": self.errors[:max_errors],
+        }
+
+
+def detect_format(filename: str) -> str:
+    extension = filename.rsplit(".", 1)[-1].lower()
+    if extension == "ndjson":
+        return "jsonl"
+    if extension not in IMPORT_FORMATS:
+        raise ProductImportException(f"Неподдерживаемый формат файла: {filename} (ожидается .csv или .jsonl)")
+    return extension
+
+
+def read_records(stream: IO[str], file_format: str) -> Iterator[tuple[int, dict | ProductImportRowException]]:
+    """Построчно читает CSV (с заголовком) или JSONL, не загружая файл целиком.
+
+    Возвращает пары (номер строки, запись); строки, которые не удалось разобрать, возвращаются как исключение.
+    """
+    if file_format == "csv":
+        return _read_csv(stream)
+    if file_format == "jsonl":
+        return _read_jsonl(stream)
+    raise ProductImportException(f"Неподдерживаемый формат: {file_format}")
+
+
+def _read_csv(stream: IO[str]) -> Iterator[tuple[int, dict]]:
+    reader = csv.DictReader(stream)
+    for record in reader:
+        yield reader.line_num, record
+
+
+def _read_jsonl(stream: IO[str]) -> Iterator[tuple[int, dict | ProductImportRowException]]:
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, ProductImportRowException(f"некорректный JSON: {e}")
+            continue
+        if not isinstance(record, dict):
+            yield line_number, ProductImportRowException("ожидается JSON-объект")
+            continue
+        yield line_number, record
+
+
+class ProductImporter:
+    """Пакетный импорт продуктов с upsert по handle.
+
+    Записи приводятся к строкам products той же логикой, что и ProductRepository.create
+    (варианты — ProductAdapter.build_variants), и вставляются пачками по batch_size одним INSERT ... ON CONFLICT.
+    Ошибки в отдельных записях попадают в отчет и не прерывают импорт.
+    """
+
+    def __init__(self, session: Session, adapter: ProductAdapter, batch_size: int = 1000):
+        self.session = session
+        self.adapter = adapter
+        self.batch_size = batch_size
+
+    def run(self, records: Iterable[tuple[int, dict | ProductImportRowException]]) -> ImportReport:
+        report = ImportReport()
+        started = time.perf_counter()
+        records = iter(records)
+        while batch := list(islice(records, self.batch_size)):
+            rows = []
+            for line, record in batch:
+                report.processed += 1
+                try:
+                    if isinstance(record, ProductImportRowException):
+                        raise record
+                    rows.append((line, self.build_row(record)))
+                except ProductImportRowException as e:
+                    report.add_error(line, str(e))
+            self._import_batch(rows, report)
+            logger.info(f"Импорт продуктов: обработано {report.processed}, импортировано {report.imported}")
+
+        report.elapsed = time.perf_counter() - started
+        logger.info(
+            f"Импорт продуктов завершен: {report.imported}/{report.processed} за {report.elapsed:.1f} с "
+            f"({report.rows_per_second:.0f} строк/с), ошибок: {len(report.errors)}"
+        )
+        return report
+
+    def build_row(self, record: dict) -> dict:
+        """Строка таблицы products из записи импорта"""
+        title = _text(record.get("title"))
+        if not title:
+            raise ProductImportRowException("не указано название (title)")
+        price = _price(record.get("price"))
+        try:
+            category_id = int(record.get("category_id"))
+        except (TypeError, ValueError):
+            raise ProductImportRowException(f"некорректный category_id: {record.get('category_id')!r}")
+
+        description = _text(record.get("description"))
+        image_url = _text(record.get("image_url"))
+        images = _list(record.get("images"))
+        now = datetime.utcnow()
+        price_money = {"amount": str(price), "currencyCode": "USD"}
+        row = {
+            "title": title,
+            "description": description,
+            "description_html": f"<p>{description}</p>",
+            "handle": _text(record.get("handle")) or title.lower().replace(" ", "-"),
+            "price_range": {"minVariantPrice": price_money, "maxVariantPrice": price_money},
+            "min_price": price,
+            "max_price": price,
+            "variants": self.adapter.build_variants(_options(record), float(price)),
+            "options": [],
+            "featured_image": {"url": image_url, "altText": title, "width": 800, "height": 800} if image_url else None,
+            "images": [{"url": url, "altText": title} for url in images],
+            "available_for_sale": _bool(record.get("available_for_sale", True)),
+            "seo": {"title": title, "description": description},
+            "tags": _list(record.get("tags")),
+            "category_id": category_id,
+            "created_at": now,
+            "updated_at": now,
+        }
+        row["document"] = ProductAdapter.render_document(SimpleNamespace(**row))
+        row["document_version"] = DOCUMENT_VERSION
+        return row
+
+    def _import_batch(self, rows: list[tuple[int, dict]], report: ImportReport) -> None:
+        # В одной пачке handle должен встречаться один раз (ON CONFLICT не обновляет строку дважды)
+        unique_rows: dict[str, tuple[int, dict]] = {}
+        for line, row in rows:
+            if row["handle"] in unique_rows:
+                report.add_error(unique_rows[row["handle"]][0], f"handle {row['handle']!r} повторяется в строке {line}")
+            unique_rows[row["handle"]] = (line, row)
+        if not unique_rows:
+            return
+        try:
+            imported = self._upsert([row for _, row in unique_rows.values()])
+            self.session.commit()
+        except Exception as e:
+            # Пачка целиком не прошла (например, неизвестная категория): повторяем построчно, чтобы найти виновных
+            self.session.rollback()
+            logger.warning(f"Пачка импорта отклонена ({e.__class__.__name__}), повтор по одной строке")
+            for line, row in unique_rows.values():
+                try:
+                    imported = self._upsert([row])
+                    self.session.commit()
+                except Exception as row_error:
+                    self.session.rollback()
+                    report.add_error(line, str(getattr(row_error, "orig", row_error)).strip())
+                else:
+                    self._on_imported(imported)
+                    report.imported += 1
+        else:
+            self._on_imported(imported)
+            report.imported += len(unique_rows)
+
+    def _upsert(self, rows: list[dict]) -> list[tuple[int, dict]]:
+        """Вставляет или обновляет продукты и их варианты; возвращает пары (product_id, строка)"""
+        # Один скомпилированный (и кэшируемый) INSERT ... ON CONFLICT, выполняемый для всей пачки:
+        # SQLAlchemy объединяет параметры в многострочные VALUES и собирает RETURNING со всех строк
+        products = ProductModel.__table__
+        statement = self._insert(products)
+        statement = statement.on_conflict_do_update(
+            index_elements=[products.c.handle],
+            set_={column: statement.excluded[column] for column in UPSERT_COLUMNS},
+        ).returning(products.c.id, products.c.handle)
+        product_ids = {handle: product_id for product_id, handle in self.session.execute(statement, rows)}
+
+        # Варианты пересобираем целиком: Core INSERT не вызывает синхронизацию ProductModel.variants
+        self.session.execute(
+            delete(ProductVariantModel).where(ProductVariantModel.product_id.in_(product_ids.values()))
+        )
+        now = datetime.utcnow()
+        variant_rows = [
+            {
+                **ProductVariantModel.columns_from_variant(variant),
+                "product_id": product_ids[row["handle"]],
+                "created_at": now,
+                "updated_at": now,
+            }
+            for row in rows
+            for variant in row["variants"]
+        ]
+        if variant_rows:
+            self.session.execute(insert(ProductVariantModel.__table__), variant_rows)
+
+        return [(product_ids[row["handle"]], row) for row in rows]
+
+    @staticmethod
+    def _on_imported(imported: list[tuple[int, dict]]) -> None:
+        """Обновляет индекс рекомендаций и кэш карточек после фиксации пачки (как _on_product_saved)"""
+        for product_id, row in imported:
+            PRODUCT_INDEX.add(product_id, product_text(row["title"], row["description"], row["tags"]))
+            PRODUCT_CACHE.invalidate(product_id)
+
+    def _insert(self, table):
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "postgresql":
+            return postgresql.insert(table)
+        if dialect == "sqlite":
+            return sqlite.insert(table)
+        raise ProductImportException(f"Upsert не поддерживается для {dialect}")
+
+
+def _text(value) -> str:
+    return str(value).strip() if value is not None else ""
+
+
+def _price(value) -> Decimal:
+    try:
+        price = Decimal(str(value).strip())
+    except (InvalidOperation, AttributeError):
+        raise ProductImportRowException(f"некорректная цена: {value!r}")
+    if not price.is_finite() or price < 0:
+        raise ProductImportRowException(f"некорректная цена: {value!r}")
+    return price.quantize(Decimal("0.01"))
+
+
+def _list(value) -> list[str]:
+    """Список из JSON-массива или строки со значениями через "|" (формат CSV)"""
+    if value is None or value == "":
+        return []
+    if isinstance(value, list):
+        return [str(item) for item in value]
+    return [item.strip() for item in str(value).split("|") if item.strip()]
+
+
+def _bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    if value is None or str(value).strip() == "":
+        return True
+    return str(value).strip().lower() not in ("0", "false", "no")
+
+
+def _options(record: dict) -> dict[str, list[str]]:
+    """Опции из поля options (JSONL) или колонок sizes/colors (CSV)"""
+    options = record.get("options")
+    if isinstance(options, dict):
+        return {name: _list(values) for name, values in options.items()}
+    return {"Size": _list(record.get("sizes")), "Color": _list(record.get("colors"))}
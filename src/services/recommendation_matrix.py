@@ -0,0 +1,132 @@
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+
+from src.application.utils.product_index import tokenize
+
+
+def build_tfidf_matrix(documents: Iterable[tuple[int, str]]) -> tuple[np.ndarray, sparse.csr_matrix]:
+    """Строит разреженную TF-IDF матрицу (строки нормированы по L2) по парам (product_id, текст).
+
+    Возвращает отсортированный массив ID продуктов и матрицу, строки которой соответствуют этим ID.
+    """
+    documents = sorted(documents)
+    product_ids = np.fromiter((product_id for product_id, _ in documents), dtype=np.int32, count=len(documents))
+
+    vocabulary: dict[str, int] = {}
+    indptr = [0]
+    indices: list[int] = []
+    data: list[float] = []
+    for _, text in documents:
+        counts: dict[int, int] = {}
+        for token in tokenize(text):
+            column = vocabulary.setdefault(token, len(vocabulary))
+            counts[column] = counts.get(column, 0) + 1
+        indices.extend(counts.keys())
+        data.extend(counts.values())
+        indptr.append(len(indices))
+
+    matrix = sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(documents), len(vocabulary)),
+    )
+
+    # Сглаженный idf и сублинейный tf, как в классическом TF-IDF
+    document_frequency = np.bincount(matrix.indices, minlength=len(vocabulary))
+    idf = np.log((1 + len(documents)) / (1 + document_frequency)).astype(np.float32) + 1
+    matrix.data = (1 + np.log(matrix.data)) * idf[matrix.indices]
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return product_ids, sparse.diags(1 / norms).dot(matrix).tocsr().astype(np.float32)
+
+
+def compute_neighbours(
+    matrix: sparse.csr_matrix, top_n: int = 10, block_size: int = 128
+) -> tuple[np.ndarray, np.ndarray]:
+    """Находит top_n ближайших по косинусу строк для каждой строки матрицы.
+
+    Сходство считается блоками строк одним разреженным умножением на транспонированную матрицу,
+    поэтому память ограничена размером block_size x число продуктов.
+    Возвращает индексы соседей (int32, -1 для пустых мест) и их оценки (float32).
+    """
+    rows = matrix.shape[0]
+    top_n = max(min(top_n, rows - 1), 0)
+    neighbours = np.full((rows, top_n), -1, dtype=np.int32)
+    scores = np.zeros((rows, top_n), dtype=np.float32)
+    if top_n == 0:
+        return neighbours, scores
+
+    transposed = matrix.T.tocsr()
+    for start in range(0, rows, block_size):
+        end = min(start + block_size, rows)
+        similarity = (matrix[start:end] @ transposed).toarray()
+        similarity[np.arange(end - start), np.arange(start, end)] = -1  # исключаем сам продукт
+
+        candidates = np.argpartition(-similarity, top_n - 1, axis=1)[:, :top_n]
+        candidate_scores = np.take_along_axis(similarity, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1)
+        block_neighbours = np.take_along_axis(candidates, order, axis=1)
+        block_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+        block_neighbours[block_scores <= 0] = -1
+        neighbours[start:end] = block_neighbours
+        scores[start:end] = np.maximum(block_scores, 0)
+
+    return neighbours, scores
+
+
+class RelatedProducts:
+    """Заранее посчитанные похожие продукты в компактных массивах int32/float32."""
+
+    def __init__(self, product_ids: np.ndarray, neighbours: np.ndarray, scores: np.ndarray):
+        self.product_ids = product_ids
+        self.neighbours = neighbours
+        self.scores = scores
+
+    @classmethod
+    def build(cls, documents: Iterable[tuple[int, str]], top_n: int = 10, block_size: int = 128) -> "RelatedProducts":
+        product_ids, matrix = build_tfidf_matrix(documents)
+        neighbour_rows, scores = compute_neighbours(matrix, top_n, block_size)
+        neighbours = np.where(neighbour_rows >= 0, product_ids[neighbour_rows], -1).astype(np.int32)
+        return cls(product_ids, neighbours, scores)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "RelatedProducts":
+        with np.load(path) as arrays:
+            return cls(arrays["product_ids"], arrays["neighbours"], arrays["scores"])
+
+    def save(self, path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as file:
+            np.savez(file, product_ids=self.product_ids, neighbours=self.neighbours, scores=self.scores)
+
+    def __len__(self) -> int:
+        return len(self.product_ids)
+
+    def get(self, product_id: int, limit: int = 5) -> list[int] | None:
+        """ID похожих продуктов или None, если продукта не было в каталоге при построении"""
+        row = int(np.searchsorted(self.product_ids, product_id))
+        if row >= len(self.product_ids) or self.product_ids[row] != product_id:
+            return None
+        return [int(neighbour) for neighbour in self.neighbours[row, :limit] if neighbour >= 0]
+
+
+# Похожие продукты, загруженные текущим процессом; None — рекомендации строятся по индексу BM25
+_related_products: RelatedProducts | None = None
+
+
+def get_related_products() -> RelatedProducts | None:
+    return _related_products
+
+
+def load_related_products(path: str | Path) -> bool:
+    """Загружает посчитанные заранее похожие продукты, если файл существует"""
+    global _related_products
+    if not Path(path).exists():
+        return False
+    _related_products = RelatedProducts.load(path)
+    return True
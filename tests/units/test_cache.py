@@ -0,0 +1,32 @@
+from src.application.utils.cache import LocalLRUCache, ProductCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LocalLRUCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_expired_entries_are_misses():
+    cache = LocalLRUCache(maxsize=2, ttl=-1)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_product_cache_invalidate():
+    cache = ProductCache(LocalLRUCache())
+    cache.set(1, {"id": "product-1"})
+    cache.invalidate(1)
+
+    assert cache.get(1) is None
@@ -0,0 +1,156 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.exceptions.carts import CartProductNotFoundException
+from src.models import CartModel, CartProductModel, CategoryModel, ProductModel, UserModel
+from src.models.base import Base
+from src.repositories import CartOperation, CartProductRepository
+from src.repositories.cart import CartRepository
+from src.repositories.cart_product import MAX_LINE_QUANTITY
+from src.services.cart_product import CartProductService
+
+
+def make_product(product_id: int, prices: dict[str, str]) -> ProductModel:
+    variants = [
+        {
+            "id": variant_id,
+            "price": {"amount": amount, "currencyCode": "USD"},
+            "selectedOptions": [{"name": "Size", "value": variant_id}],
+        }
+        for variant_id, amount in prices.items()
+    ]
+    return ProductModel(
+        id=product_id, title=f"p{product_id}", handle=f"p{product_id}", category_id=1, variants=variants
+    )
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine, autoflush=False)() as session:
+        session.add_all([CategoryModel(id=1, name="Shirts"), UserModel(id=1, name="user", email="u@x", password="-")])
+        session.add_all([make_product(1, {"S": "10.00", "M": "12.50"}), make_product(2, {"S": "4.00"})])
+        session.add(CartModel(id=1, user_id=1))
+        session.commit()
+        yield session
+
+
+def test_add_product_merges_quantity_into_existing_line(session):
+    repository = CartProductRepository(session)
+
+    first = repository.add_product(cart_id=1, product_id=1, quantity=2, variant_id="M")
+    second = repository.add_product(cart_id=1, product_id=1, quantity=3, variant_id="M")
+    without_variant = repository.add_product(cart_id=1, product_id=2, quantity=1)
+    repository.add_product(cart_id=1, product_id=2, quantity=1)
+
+    assert first == second
+    lines = session.query(CartProductModel).order_by(CartProductModel.id).all()
+    assert [(line.id, line.variant_id, line.quantity) for line in lines] == [
+        (first, "M", 5),
+        (without_variant, None, 2),
+    ]
+
+
+def test_add_without_variant_does_not_merge_into_variant_line(session):
+    repository = CartProductRepository(session)
+    variant_line = repository.add_product(cart_id=1, product_id=1, quantity=2, variant_id="M")
+
+    plain_line = repository.add_product(cart_id=1, product_id=1, quantity=1)
+
+    assert plain_line != variant_line
+    lines = session.query(CartProductModel).order_by(CartProductModel.id).all()
+    assert [(line.id, line.variant_id, line.quantity) for line in lines] == [
+        (variant_line, "M", 2),
+        (plain_line, None, 1),
+    ]
+
+
+def test_change_and_remove_without_variant_target_the_added_line(session):
+    repository = CartProductRepository(session)
+    variant_line = repository.add_product(cart_id=1, product_id=1, quantity=2, variant_id="M")
+    plain_line = repository.add_product(cart_id=1, product_id=1, quantity=1)
+
+    assert repository.change_quantity(cart_id=1, product_id=1, quantity=4) == plain_line
+    assert repository.remove_product(cart_id=1, product_id=1) == plain_line
+    lines = session.query(CartProductModel).all()
+    assert [(line.id, line.variant_id, line.quantity) for line in lines] == [(variant_line, "M", 2)]
+    with pytest.raises(CartProductNotFoundException):
+        repository.remove_product(cart_id=1, product_id=1)
+
+
+def test_added_quantity_is_capped(session):
+    repository = CartProductRepository(session)
+    line_id = repository.add_product(cart_id=1, product_id=1, quantity=60, variant_id="M")
+    repository.add_product(cart_id=1, product_id=1, quantity=60, variant_id="M")
+    repository.apply_operations(1, [CartOperation("add", 2, quantity=100), CartOperation("add", 2, quantity=100)])
+
+    lines = session.query(CartProductModel).order_by(CartProductModel.id).all()
+    assert [(line.id, line.quantity) for line in lines] == [
+        (line_id, MAX_LINE_QUANTITY),
+        (lines[1].id, MAX_LINE_QUANTITY),
+    ]
+
+
+def test_totals_match_cart_summary(session):
+    repository = CartProductRepository(session)
+    repository.add_product(cart_id=1, product_id=1, quantity=2, variant_id="M")
+    repository.add_product(cart_id=1, product_id=2, quantity=3)
+    service = CartProductService(CartRepository(CartModel, session), repository)
+
+    totals = repository.get_totals(1)
+    _, total_items, total_price = service.get_cart_summary(1)
+
+    assert (totals.total_items, float(totals.total_price)) == (total_items, total_price) == (2, 37.0)
+
+
+def test_change_and_remove_return_line_id(session):
+    repository = CartProductRepository(session)
+    line_id = repository.add_product(cart_id=1, product_id=2, quantity=1)
+
+    assert repository.change_quantity(cart_id=1, product_id=2, quantity=7) == line_id
+    assert repository.get_line(line_id).quantity == 7
+    assert repository.remove_product(cart_id=1, product_id=2) == line_id
+    with pytest.raises(CartProductNotFoundException):
+        repository.change_quantity(cart_id=1, product_id=2, quantity=1)
+
+
+def test_consecutive_adds_are_applied_in_one_statement(session):
+    repository = CartProductRepository(session)
+    repository.add_product(cart_id=1, product_id=1, quantity=1, variant_id="S")
+    statements = []
+    event.listen(session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2].split()[0]))
+
+    repository.apply_operations(
+        1,
+        [
+            CartOperation("add", 1, "S", 2),
+            CartOperation("add", 1, "M", 1),
+            CartOperation("add", 1, "S", 3),
+            CartOperation("add", 2),
+            CartOperation("update", 1, "M", 4),
+        ],
+    )
+
+    assert statements == ["INSERT", "UPDATE"]
+    lines = session.query(CartProductModel).order_by(CartProductModel.id).all()
+    assert [(line.product_id, line.variant_id, line.quantity) for line in lines] == [
+        (1, "S", 6),
+        (1, "M", 4),
+        (2, None, 1),
+    ]
+
+
+def test_failed_operation_rolls_back_whole_batch(session):
+    repository = CartProductRepository(session)
+    repository.add_product(cart_id=1, product_id=1, quantity=1, variant_id="S")
+
+    with pytest.raises(CartProductNotFoundException):
+        repository.apply_operations(
+            1, [CartOperation("add", 2, quantity=5), CartOperation("remove", 1, "S"), CartOperation("remove", 1, "S")]
+        )
+
+    lines = session.query(CartProductModel).all()
+    assert [(line.product_id, line.variant_id, line.quantity) for line in lines] == [(1, "S", 1)]
@@ -0,0 +1,70 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+from src.models import ProductModel
+from src.services.cart_product import CartProductService
+
+
+def make_product(product_id: int, prices: dict[str, str]):
+    variants = [
+        {
+            "id": variant_id,
+            "price": {"amount": amount, "currencyCode": "USD"},
+            "selectedOptions": [{"name": "Size", "value": variant_id}],
+        }
+        for variant_id, amount in prices.items()
+    ]
+    return ProductModel(id=product_id, title=f"p{product_id}", handle=f"p{product_id}", variants=variants)
+
+
+def make_line(line_id: int, product, quantity: int, variant_id: str | None = None):
+    return SimpleNamespace(id=line_id, product_id=product.id if product else None, product_rel=product,
+                           quantity=quantity, variant_id=variant_id)
+
+
+def test_summarize_counts_and_prices_lines_in_one_pass():
+    service = CartProductService(cart_repository=None, cart_product_repository=None)
+    shirt = make_product(1, {"S": "10.00", "M": "12.50"})
+    lines = [make_line(1, shirt, 2, "M"), make_line(2, shirt, 1), make_line(3, None, 5)]
+
+    summary = service.summarize(lines)
+
+    assert summary.total_items == 3
+    assert summary.total_price == 35.0
+    assert summary.items[0]["cost"]["totalAmount"]["amount"] == "25.00"
+    assert summary.items[0]["merchandise"]["id"] == "M"
+    assert summary.items[1]["merchandise"]["id"] == "S"
+    assert summary.items[2] == {}
+    assert summary.total_price == sum(float(item["cost"]["totalAmount"]["amount"]) for item in summary.items if item)
+
+
+def test_variants_by_id_is_cached_until_variants_change():
+    product = make_product(1, {"S": "10.00", "M": "12.50"})
+
+    assert product.variants_by_id is product.variants_by_id
+    assert product.variants_by_id["M"].price == Decimal("12.50")
+
+    product.variants = [{"id": "L", "price": {"amount": "15.00"}}]
+    assert list(product.variants_by_id) == ["L"]
+
+
+def test_variant_rows_follow_variants_json():
+    product = make_product(1, {"S": "10.00", "M": "12.50"})
+    row_m = product.variants_by_id["M"]
+
+    product.variants = [
+        {"id": "M", "price": {"amount": "11.00", "currencyCode": "EUR"}, "availableForSale": False,
+         "selectedOptions": [{"name": "Size", "value": "M"}, {"name": "Color", "value": "Blue"}]},
+    ]
+
+    assert product.variants_rel == [row_m]
+    assert (row_m.price, row_m.currency_code, row_m.available_for_sale) == (Decimal("11.00"), "EUR", False)
+    assert (row_m.size, row_m.color) == ("M", "Blue")
+    assert row_m.to_dict()["price"] == {"amount": "11.00", "currencyCode": "EUR"}
+
+
+def test_unknown_variant_falls_back_to_first():
+    service = CartProductService(cart_repository=None, cart_product_repository=None)
+    product = make_product(1, {"S": "10.00", "M": "12.50"})
+
+    assert service.summarize([make_line(1, product, 1, "XL")]).total_price == 10.0
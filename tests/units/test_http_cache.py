@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from fastapi import Request
+
+from src.application.utils.http_cache import cache_headers, is_not_modified, make_etag
+
+UPDATED_AT = datetime(2025, 1, 2, 3, 4, 5, 678000)
+
+
+def make_request(**headers) -> Request:
+    raw_headers = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw_headers})
+
+
+def test_if_none_match():
+    etag = make_etag("product", 1, UPDATED_AT.isoformat())
+
+    assert is_not_modified(make_request(if_none_match=etag), etag)
+    assert is_not_modified(make_request(if_none_match=f'"other", W/{etag}'), etag)
+    assert not is_not_modified(make_request(if_none_match='"other"'), etag)
+    assert not is_not_modified(make_request(), etag)
+
+
+def test_if_modified_since():
+    etag = make_etag("product", 1)
+    last_modified = cache_headers(etag, UPDATED_AT)["Last-Modified"]
+
+    assert is_not_modified(make_request(if_modified_since=last_modified), etag, UPDATED_AT)
+    assert not is_not_modified(
+        make_request(if_modified_since=last_modified), etag, UPDATED_AT.replace(year=2026)
+    )
+    # If-None-Match имеет приоритет над If-Modified-Since
+    assert not is_not_modified(make_request(if_none_match='"other"', if_modified_since=last_modified), etag, UPDATED_AT)
@@ -0,0 +1,108 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.application.sсhemas import OrderSchema
+from src.exceptions.order_exceptions import MixedCurrencyOrderException
+from src.exceptions.pagination_exceptions import InvalidCursorException
+from src.models import CategoryModel, OrderModel, ProductModel, UserModel
+from src.models.base import Base
+from src.repositories import OrderLine, OrderRepository
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine, autoflush=False)() as session:
+        session.add_all([CategoryModel(id=1, name="Shirts"), UserModel(id=1, name="user", email="u@x", password="-")])
+        session.add_all([ProductModel(id=i, title=f"Product {i}", description="", category_id=1) for i in (1, 2, 3)])
+        session.commit()
+        yield session
+
+
+def test_order_lines_are_inserted_in_one_statement(session):
+    statements = []
+    event.listen(session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    order = OrderRepository(OrderModel, session).create_order_with_products(
+        user_id=1,
+        lines=[
+            OrderLine(1, 2, "variant-M", "Product 1", Decimal("10.50")),
+            OrderLine(2, title="Product 2", unit_price=Decimal("3.00")),
+            OrderLine(3, 5, title="Product 3", unit_price=Decimal("1.25")),
+        ],
+        email="u@x",
+    )
+
+    assert [statement.split()[0] for statement in statements].count("INSERT") == 2
+    assert sorted((line.product_id, line.quantity, line.line_total) for line in order.order_products) == [
+        (1, 2, Decimal("21.00")),
+        (2, 1, Decimal("3.00")),
+        (3, 5, Decimal("6.25")),
+    ]
+    assert order.total_amount == Decimal("30.25")
+
+
+def test_order_reads_prices_stored_at_checkout(session):
+    order = OrderRepository(OrderModel, session).create_order_with_products(
+        user_id=1, lines=[OrderLine(1, 2, title="Product 1", unit_price=Decimal("10.50"))]
+    )
+    session.get(ProductModel, 1).title = "Renamed"
+    session.commit()
+    session.expire_all()
+
+    schema = OrderSchema.from_orm(OrderRepository(OrderModel, session).get_order(order.id))
+
+    assert schema.total_amount == 21.0
+    assert schema.items[0]["title"] == "Product 1"
+    assert schema.items[0]["price"] == 10.5
+
+
+def test_failed_line_rolls_back_whole_order(session):
+    with pytest.raises(IntegrityError):
+        OrderRepository(OrderModel, session).create_order_with_products(
+            user_id=1, lines=[OrderLine(1), OrderLine(None)]
+        )
+
+    assert session.query(OrderModel).count() == 0
+
+
+def test_mixed_currency_lines_are_rejected(session):
+    with pytest.raises(MixedCurrencyOrderException):
+        OrderRepository(OrderModel, session).create_order_with_products(
+            user_id=1,
+            lines=[
+                OrderLine(1, unit_price=Decimal("10.00")),
+                OrderLine(2, unit_price=Decimal("900.00"), currency_code="JPY"),
+            ],
+        )
+
+    assert session.query(OrderModel).count() == 0
+
+
+def test_order_history_is_keyset_paginated_summary(session):
+    repository = OrderRepository(OrderModel, session)
+    for lines in range(1, 4):
+        repository.create_order_with_products(user_id=1, lines=[OrderLine(1, unit_price=Decimal("2.00"))] * lines)
+    statements = []
+    event.listen(session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    first_page, has_next_page = repository.get_user_order_summaries(1, count=2)
+    after = OrderRepository.cursor_values(first_page[-1])
+    second_page, has_more = repository.get_user_order_summaries(1, count=2, after=after)
+
+    assert len(statements) == 2
+    assert [(order.id, order.item_count, order.total_amount) for order in first_page] == [
+        (3, 3, Decimal("6.00")),
+        (2, 2, Decimal("4.00")),
+    ]
+    assert has_next_page
+    assert [order.id for order in second_page] == [1]
+    assert not has_more
+    with pytest.raises(InvalidCursorException):
+        repository.get_user_order_summaries(1, after={"id": "1"})
@@ -0,0 +1,16 @@
+import pytest
+
+from src.application.utils.pagination import decode_cursor, encode_cursor
+from src.exceptions.pagination_exceptions import InvalidCursorException
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor({"price": "10.50", "id": 42})
+    assert decode_cursor(cursor) == {"price": "10.50", "id": 42}
+    assert decode_cursor(None) is None
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "WzFd"])
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(cursor)
@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from src.application.utils.pool_metrics import PoolMetrics
+
+
+def make_engine(metrics: PoolMetrics):
+    engine = create_engine(
+        "sqlite://", poolclass=metrics.pool_class(QueuePool), pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    metrics.instrument(engine)
+    return engine
+
+
+def test_counts_checkouts_and_waits():
+    metrics = PoolMetrics("test")
+    engine = make_engine(metrics)
+
+    for _ in range(3):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            assert metrics.stats()["checked_out"] == 1
+
+    stats = metrics.stats()
+    assert stats["connects"] == 1
+    assert stats["checkouts"] == 3
+    assert stats["checkins"] == 3
+    assert stats["checked_out"] == 0
+    assert stats["wait_ms"]["count"] == 3
+    assert sum(stats["wait_ms"]["buckets"].values()) == 3
+
+
+def test_records_checkout_timeout():
+    metrics = PoolMetrics("test")
+    engine = make_engine(metrics)
+
+    with engine.connect(), pytest.raises(PoolTimeoutError):
+        engine.connect()
+
+    stats = metrics.stats()
+    assert stats["timeouts"] == 1
+    assert stats["wait_ms"]["max"] >= 50
+
+
+def test_instrumented_pool_survives_dispose():
+    metrics = PoolMetrics("test")
+    engine = make_engine(metrics)
+    engine.dispose()
+
+    with engine.connect():
+        pass
+
+    assert type(engine.pool).__name__ == "InstrumentedQueuePool"
+    assert metrics.stats()["wait_ms"]["count"] == 1
@@ -0,0 +1,67 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.application.utils.cache import PRODUCT_CACHE
+from src.models import CategoryModel, ProductModel, ReviewModel
+from src.models.base import Base
+from src.repositories import ProductAdapter, ProductRepository, ReviewRepository
+from src.services.product import ProductService
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add(CategoryModel(id=1, name="Shirts"))
+        session.commit()
+        yield session
+    PRODUCT_CACHE.clear()
+
+
+def create_product(session, title: str = "Shirt") -> ProductModel:
+    repository = ProductRepository(session)
+    adapter = ProductAdapter(repository, ReviewRepository(session, ReviewModel))
+    return repository.create(
+        adapter, title=title, price=10.0, description="Cotton", category_id=1, options={"Size": ["S"], "Color": ["Red"]}
+    )
+
+
+def test_document_is_stored_on_write_and_read_without_loading_model(session):
+    product = create_product(session)
+    expected = ProductAdapter(None, None)._to_graphql_format(product, rating=0.0)
+    session.expunge_all()
+    PRODUCT_CACHE.clear()
+
+    statements = []
+    event.listen(session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    adapter = ProductAdapter(ProductRepository(session), None)
+
+    assert adapter.get_one_product(product.id) == expected
+    assert len(statements) == 1 and "products.variants" not in statements[0]
+
+
+def test_update_rerenders_document(session):
+    product = create_product(session)
+    ProductRepository(session).update(product.id, title="Linen shirt")
+
+    assert product.document["title"] == "Linen shirt"
+    assert product.document["seo"]["title"] == "Shirt"
+
+
+def test_rebuild_renders_stale_documents_only(session):
+    create_product(session, "Fresh")
+    stale = create_product(session, "Stale")
+    stale.document, stale.document_version = None, None
+    session.commit()
+    updated_at = stale.updated_at
+
+    service = ProductService(ProductRepository(session), ReviewRepository(session, ReviewModel))
+
+    assert service.rebuild_documents(batch_size=1) == 1
+    session.refresh(stale)
+    assert stale.document == ProductAdapter.render_document(stale)
+    assert stale.updated_at == updated_at
+    assert service.rebuild_documents(force=True) == 2
@@ -0,0 +1,56 @@
+import csv
+import io
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.models import CategoryModel, ProductModel
+from src.models.base import Base
+from src.repositories import ProductAdapter
+from src.services.product_export import CSV_COLUMNS, ProductExporter
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    adapter = ProductAdapter(None, None)
+    with factory() as session:
+        session.add(CategoryModel(id=1, name="Shirts"))
+        for i in range(5):
+            price = {"amount": str(10 + i), "currencyCode": "USD"}
+            session.add(
+                ProductModel(
+                    title=f"Shirt {i}",
+                    handle=f"shirt-{i}",
+                    category_id=1,
+                    price_range={"minVariantPrice": price, "maxVariantPrice": price},
+                    variants=adapter.build_variants({"Size": ["S", "M"], "Color": ["Red"]}, 10 + i),
+                    tags=["cotton"],
+                )
+            )
+        session.commit()
+    return factory
+
+
+def test_ndjson_export_streams_every_product_in_batches(session_factory):
+    chunks = list(ProductExporter(session_factory, batch_size=2).stream("ndjson"))
+    products = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+
+    assert len(chunks) == 3
+    assert [product["handle"] for product in products] == [f"shirt-{i}" for i in range(5)]
+    assert products[0]["variants"]["edges"][0]["node"]["id"] == "variant-S-Red"
+
+
+def test_csv_export_uses_import_columns(session_factory):
+    body = "".join(ProductExporter(session_factory, batch_size=2).stream("csv"))
+    rows = list(csv.DictReader(io.StringIO(body)))
+
+    assert tuple(rows[0]) == CSV_COLUMNS
+    assert len(rows) == 5
+    assert rows[1]["price"] == "11"
+    assert (rows[1]["sizes"], rows[1]["colors"], rows[1]["tags"]) == ("S|M", "Red", "cotton")
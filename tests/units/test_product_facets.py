@@ -0,0 +1,81 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.models import CategoryModel, ReviewModel
+from src.models.base import Base
+from src.repositories import ProductAdapter, ProductRepository, ReviewRepository
+
+
+@pytest.fixture
+def repository():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add_all([CategoryModel(id=1, name="Shirts"), CategoryModel(id=2, name="Coats")])
+        session.commit()
+        repository = ProductRepository(session)
+        adapter = ProductAdapter(repository, ReviewRepository(session, ReviewModel))
+        for title, price, category_id, tags, options in [
+            ("Red shirt", 10.0, 1, ["cotton", "summer"], {"Size": ["S", "M"], "Color": ["Red"]}),
+            ("Blue shirt", 30.0, 1, ["cotton"], {"Size": ["M"], "Color": ["Blue"]}),
+            ("Wool coat", 300.0, 2, ["wool"], {"Size": ["L"], "Color": ["Red"]}),
+        ]:
+            repository.create(
+                adapter, title=title, price=price, description="", category_id=category_id, tags=tags, options=options
+            )
+        yield repository
+
+
+def counts(facet) -> dict:
+    return {value.value: value.count for value in facet}
+
+
+def test_facets_are_counted_in_one_query(repository):
+    statements = []
+    event.listen(repository.session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    facets = repository.get_facets()
+
+    assert len(statements) == 1
+    assert [(value.value, value.label, value.count) for value in facets["category"]] == [
+        ("1", "Shirts", 2),
+        ("2", "Coats", 1),
+    ]
+    assert counts(facets["tag"]) == {"cotton": 2, "summer": 1, "wool": 1}
+    assert counts(facets["size"]) == {"M": 2, "S": 1, "L": 1}
+    assert [value.value for value in facets["price"]] == ["0-25", "25-50", "250-500"]
+
+
+def test_facet_ignores_only_its_own_filter(repository):
+    facets = repository.get_facets(tags=["cotton"], color="Red")
+
+    # размеры считаются среди красных вариантов хлопковых продуктов
+    assert counts(facets["size"]) == {"S": 1, "M": 1}
+    # цвета — среди хлопковых продуктов без учета выбранного цвета
+    assert counts(facets["color"]) == {"Red": 1, "Blue": 1}
+    # теги — среди продуктов с красным вариантом без учета выбранных тегов
+    assert counts(facets["tag"]) == {"cotton": 1, "summer": 1, "wool": 1}
+
+
+def test_page_filters_by_all_tags(repository):
+    products, _ = repository.get_page(tags=["cotton", "summer"])
+    assert [product.title for product in products] == ["Red shirt"]
+    products, _ = repository.get_page(tags=["cotton"], min_price=20)
+    assert [product.title for product in products] == ["Blue shirt"]
+
+
+@pytest.mark.parametrize(
+    ("sort", "index"), [("id", "ix_products_category_id_id"), ("price_asc", "ix_products_category_id_min_price_id")]
+)
+def test_category_page_uses_index(repository, sort, index):
+    statement = repository.page_statement(10, category_id=1, sort=sort)
+    compiled = statement.compile(repository.session.get_bind())
+    parameters = tuple(compiled.params[name] for name in compiled.positiontup)
+    plan = repository.session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", parameters).all()
+
+    assert any(index in row.detail for row in plan)
+    assert not any("TEMP B-TREE" in row.detail for row in plan)
+    products, _ = repository.get_by_category(1, sort="price_desc")
+    assert [product.title for product in products] == ["Blue shirt", "Red shirt"]
@@ -0,0 +1,67 @@
+import io
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from src.models import CategoryModel, ProductModel
+from src.models.base import Base
+from src.repositories import ProductAdapter
+from src.services.product_import import ProductImporter, detect_format, read_records
+
+CSV_FEED = """handle,title,description,price,category_id,sizes,colors,tags
+shirt,Shirt,Cotton shirt,10.50,1,S|M,Red,cotton|summer
+broken,Broken,,not-a-price,1,,,
+,No handle,,3,1,,,
+shirt,Shirt v2,Cotton shirt,12,1,S,Red,
+"""
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(CategoryModel(id=1, name="Shirts"))
+        session.commit()
+        yield session
+
+
+def make_importer(session: Session, batch_size: int = 2) -> ProductImporter:
+    return ProductImporter(session, ProductAdapter(None, None), batch_size=batch_size)
+
+
+def test_detect_format():
+    assert detect_format("feed.CSV") == "csv"
+    assert detect_format("feed.ndjson") == "jsonl"
+
+
+def test_read_jsonl_reports_bad_lines():
+    records = list(read_records(io.StringIO('{"title": "a"}\n\nnot json\n[1]\n'), "jsonl"))
+
+    assert [line for line, _ in records] == [1, 3, 4]
+    assert records[0][1] == {"title": "a"}
+    assert all(isinstance(record, Exception) for _, record in records[1:])
+
+
+def test_import_upserts_by_handle_and_reports_row_errors(session):
+    report = make_importer(session).run(read_records(io.StringIO(CSV_FEED), "csv"))
+
+    assert report.processed == 4
+    assert report.imported == 3
+    assert [error["line"] for error in report.errors] == [3]
+
+    products = {product.handle: product for product in session.scalars(select(ProductModel))}
+    assert set(products) == {"shirt", "no-handle"}
+    shirt = products["shirt"]
+    assert shirt.title == "Shirt v2"
+    assert float(shirt.min_price) == 12.0
+    assert [variant.variant_id for variant in shirt.variants_rel] == ["variant-S-Red"]
+
+
+def test_duplicate_handles_in_one_batch_keep_last_row(session):
+    report = make_importer(session, batch_size=10).run(read_records(io.StringIO(CSV_FEED), "csv"))
+
+    assert report.imported == 2
+    assert {error["line"] for error in report.errors} == {2, 3}
+    assert session.scalar(select(ProductModel.title).where(ProductModel.handle == "shirt")) == "Shirt v2"
@@ -0,0 +1,56 @@
+from src.application.utils.product_index import ProductIndex, highlight, tokenize
+
+
+def build_index() -> ProductIndex:
+    index = ProductIndex()
+    index.build(
+        [
+            (1, "Red cotton shirt"),
+            (2, "Blue cotton pants"),
+            (3, "Red wool coat"),
+            (4, "Green silk scarf"),
+        ]
+    )
+    return index
+
+
+def test_tokenize():
+    assert tokenize("Red, cotton-Shirt!") == ["red", "cotton", "shirt"]
+    assert tokenize(None) == []
+
+
+def test_similar_ranks_by_shared_terms():
+    index = build_index()
+    ranked = [product_id for product_id, _ in index.similar(1, limit=5)]
+    # продукт без общих токенов и сам продукт не попадают в рекомендации
+    assert ranked[0] in (2, 3)
+    assert set(ranked) == {2, 3}
+
+
+def test_add_and_remove_update_postings():
+    index = build_index()
+    index.add(5, "Red cotton shirt with pocket")
+    assert [product_id for product_id, _ in index.similar(1, limit=1)] == [5]
+
+    index.remove(5)
+    assert 5 not in index
+    assert all(product_id != 5 for product_id, _ in index.search("pocket shirt"))
+
+
+def test_similar_uses_text_for_unindexed_product():
+    index = build_index()
+    assert [product_id for product_id, _ in index.similar(99, "silk", limit=5)] == [4]
+
+
+def test_match_requires_every_query_term():
+    index = build_index()
+    index.add(5, "Red cotton shirt, red collar")
+
+    assert sorted(product_id for product_id, _ in index.match("RED cotton")) == [1, 5]
+    assert index.match("red silk") == []
+    assert index.match("!!!") == []
+
+
+def test_highlight_marks_query_terms():
+    assert highlight("Red cotton-shirt", ["red", "shirt"]) == "<mark>Red</mark> cotton-<mark>shirt</mark>"
+    assert highlight(None, ["red"]) == ""
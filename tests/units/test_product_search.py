@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.application.utils.product_index import PRODUCT_INDEX
+from src.exceptions.pagination_exceptions import InvalidCursorException
+from src.models import CategoryModel, ProductModel, ReviewModel
+from src.models.base import Base
+from src.repositories import ProductAdapter, ProductRepository, ReviewRepository
+
+
+@pytest.fixture
+def repository():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    PRODUCT_INDEX.build([])
+    with sessionmaker(bind=engine)() as session:
+        session.add(CategoryModel(id=1, name="Shirts"))
+        session.commit()
+        repository = ProductRepository(session)
+        adapter = ProductAdapter(repository, ReviewRepository(session, ReviewModel))
+        for title, description in [
+            ("Red shirt", "Cotton shirt"),
+            ("Blue shirt", "Red cotton stripes"),
+            ("Red coat", "Wool"),
+            ("Red cotton shirt", "Red cotton"),
+        ]:
+            repository.create(adapter, title=title, price=10.0, description=description, category_id=1)
+        yield repository
+    PRODUCT_INDEX.build([])
+
+
+def test_search_ranks_and_highlights_matches(repository):
+    hits, has_next_page = repository.search("red cotton", count=10)
+
+    assert [hit.product.title for hit in hits] == ["Red cotton shirt", "Red shirt", "Blue shirt"]
+    assert not has_next_page
+    assert hits[0].rank >= hits[1].rank >= hits[2].rank
+    assert hits[1].highlights == {"title": "<mark>Red</mark> shirt", "description": "<mark>Cotton</mark> shirt"}
+
+
+def test_search_keyset_pagination(repository):
+    first, has_next_page = repository.search("red", count=2)
+    second, _ = repository.search("red", count=2, after=repository.search_cursor_values(first[-1]))
+
+    assert has_next_page
+    assert len(first) + len(second) == 4
+    assert not {hit.product.id for hit in first} & {hit.product.id for hit in second}
+    with pytest.raises(InvalidCursorException):
+        repository.search("red", after={"id": 1})
+
+
+def test_search_vector_and_gin_indexes_are_created_with_tables():
+    """create_all (create_tables в main.py) создает то же, что миграции d8b1e6c2f059 и e4c9a3b7d216"""
+    products = ProductModel.__table__
+    dialect = postgresql.dialect()
+    ddl = str(CreateTable(products).compile(dialect=dialect))
+    indexes = {index.name: str(CreateIndex(index).compile(dialect=dialect)) for index in products.indexes}
+
+    assert "search_vector TSVECTOR GENERATED ALWAYS AS (setweight(to_tsvector('simple'" in ddl
+    assert (
+        indexes["ix_products_search_vector"]
+        == "CREATE INDEX ix_products_search_vector ON products USING gin (search_vector)"
+    )
+    assert indexes["ix_products_tags"] == (
+        "CREATE INDEX ix_products_tags ON products USING gin ((CAST(tags AS JSONB)) jsonb_path_ops)"
+    )
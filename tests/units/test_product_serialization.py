@@ -0,0 +1,78 @@
+from datetime import datetime
+
+import orjson
+from fastapi import Response
+
+from src.application.sсhemas import ProductResponseSchema
+from src.application.utils.json_response import json_response
+from src.models import ProductModel
+from src.models.product import normalize_money, normalize_price_range
+from src.repositories.product import ProductAdapter
+
+
+def test_normalize_money_accepts_legacy_formats():
+    assert normalize_money({"amount": 10.5, "currency_code": "EUR"}) == {"amount": "10.5", "currencyCode": "EUR"}
+    assert normalize_money(12) == {"amount": "12", "currencyCode": "USD"}
+    assert normalize_money({"amount": "50"}) == {"amount": "50", "currencyCode": "USD"}
+    assert normalize_money({"value": 1}) == {"amount": "0.00", "currencyCode": "USD"}
+    assert normalize_price_range({"min_variant_price": {"amount": "5", "currency_code": "USD"}}) == {
+        "minVariantPrice": {"amount": "5", "currencyCode": "USD"},
+        "maxVariantPrice": {"amount": "0.00", "currencyCode": "USD"},
+    }
+
+
+def test_product_prices_are_normalized_on_write():
+    product = ProductModel(
+        title="Shirt",
+        price_range={"min_variant_price": 10, "max_variant_price": {"amount": 20, "currency_code": "USD"}},
+        variants=[{"id": "variant-M", "price": 10, "selectedOptions": [], "extra": True}],
+    )
+
+    assert product.price_range["maxVariantPrice"] == {"amount": "20", "currencyCode": "USD"}
+    assert product.variants == [
+        {"id": "variant-M", "availableForSale": True, "selectedOptions": [], "price": {"amount": "10", "currencyCode": "USD"}}
+    ]
+    assert float(product.min_price) == 10
+
+
+def test_price_without_currency_keeps_amount():
+    product = ProductModel(
+        title="Shirt", price_range={"minVariantPrice": {"amount": "50"}, "maxVariantPrice": {"amount": "70"}}
+    )
+
+    assert product.price_range["minVariantPrice"] == {"amount": "50", "currencyCode": "USD"}
+    assert (float(product.min_price), float(product.max_price)) == (50, 70)
+
+
+def test_graphql_format_matches_response_schema():
+    adapter = ProductAdapter(None, None)
+    product = ProductModel(
+        title="Shirt",
+        description="Cotton",
+        handle="shirt",
+        price_range={"minVariantPrice": {"amount": "10.0", "currencyCode": "USD"}},
+        variants=adapter.build_variants({"Size": ["S", "M"], "Color": ["Red", "Blue"]}, 10.0),
+        available_for_sale=True,
+    )
+    product.id = 1
+    product.updated_at = datetime(2026, 1, 1)
+
+    payload = adapter._to_graphql_format(product, rating=4.5)
+
+    assert ProductResponseSchema.model_validate(payload).model_dump(mode="json") == orjson.loads(orjson.dumps(payload))
+    assert [(option["name"], option["values"]) for option in payload["options"]] == [
+        ("Size", ["S", "M"]),
+        ("Color", ["Red", "Blue"]),
+    ]
+
+
+def test_json_response_keeps_validation_headers():
+    response = Response()
+    del response.headers["content-length"]
+    response.headers["ETag"] = '"abc"'
+
+    result = json_response({"id": 1}, response)
+
+    assert result.body == b'{"id":1}'
+    assert result.headers["etag"] == '"abc"'
+    assert result.headers["content-length"] == "8"
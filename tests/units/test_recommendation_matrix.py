@@ -0,0 +1,28 @@
+from src.services.recommendation_matrix import RelatedProducts
+
+DOCUMENTS = [
+    (10, "Red cotton shirt"),
+    (20, "Blue cotton pants"),
+    (30, "Red wool coat"),
+    (40, "Green silk scarf"),
+]
+
+
+def test_related_products_are_ranked_by_similarity():
+    related = RelatedProducts.build(DOCUMENTS, top_n=3)
+
+    assert related.get(10, limit=3) == [30, 20] or related.get(10, limit=3) == [20, 30]
+    # у продукта без общих слов нет похожих
+    assert related.get(40) == []
+    assert related.get(99) is None
+
+
+def test_related_products_round_trip(tmp_path):
+    related = RelatedProducts.build(DOCUMENTS, top_n=2)
+    path = tmp_path / "recommendations.npz"
+    related.save(path)
+
+    loaded = RelatedProducts.load(path)
+    assert loaded.neighbours.dtype.name == "int32"
+    assert loaded.scores.dtype.name == "float32"
+    assert loaded.get(20) == related.get(20)